@@ -7,11 +7,15 @@ Autor: MiniMax Agent
 Fecha: 2025-09-28
 """
 
-import yfinance as yf
-import pandas as pd
 from datetime import datetime, timedelta
 import math
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+from cache_datos_mercado import CacheDatosMercado, obtener_cache_compartida
+from diario_calculos import DiarioCalculos
+from metricas import contar, medido, medir
+from perfilado import MODOS as MODOS_PERFIL, configurar as configurar_perfil, perfilado
+from proveedores_datos import ProveedorDatosMercado, ProveedorYFinance, TIMEOUT_DEFAULT
+from resiliencia import ProveedorResiliente
 
 class AgenteIronCondorSPX:
     """
@@ -19,7 +23,17 @@ class AgenteIronCondorSPX:
     basado en Implied Volatility y parámetros configurables.
     """
     
-    def __init__(self):
+    def __init__(self, proveedor: Optional[ProveedorDatosMercado] = None,
+                 cache: Optional[CacheDatosMercado] = None, usar_cache: bool = True,
+                 diario: Optional[DiarioCalculos] = None):
+        """
+        Args:
+            proveedor: Fuente de cotizaciones (por defecto Yahoo Finance en vivo, con
+                       reintentos y cortacircuitos)
+            cache: Cache de cotizaciones (por defecto el cache compartido en disco)
+            usar_cache: False para descargar siempre datos frescos
+            diario: Diario donde registrar cada cálculo completo (opcional)
+        """
         self.spx_ticker = "^GSPC"  # S&P 500 Index
         self.vix_ticker = "^VIX"   # VIX para Implied Volatility
         self.alas_permitidas = [10, 15, 20, 25]
@@ -30,38 +44,200 @@ class AgenteIronCondorSPX:
             'anual': 1          # Año completo
         }
         self.periodo_default = 'diario'  # Período por defecto más conservador
+        self.tickers_extra = []  # Ej: ['^VIX9D', '^VIX3M', '^VIX1D']
+        self.timeout_segundos = TIMEOUT_DEFAULT  # Plazo máximo por descarga
+        self.cadena_opciones = None  # CadenaOpciones para ajustar a strikes listados
+        self.oi_minimo = 0           # Open interest mínimo de los strikes listados
+        self.proveedor = proveedor or ProveedorResiliente(ProveedorYFinance(),
+                                                          requeridos=[self.spx_ticker, self.vix_ticker])
+        self.diario = diario
         
-    def obtener_datos_mercado(self, fecha_objetivo: Optional[str] = None) -> Dict:
+        # Último snapshot válido: respaldo si la fuente falla (marcado con su antigüedad)
+        self.antiguedad_maxima_respaldo = 15 * 60  # Segundos (0 = sin respaldo)
+        self._ultimo_snapshot = None
+        
+        # Solo los proveedores en vivo usan el cache compartido
+        if not self.proveedor.usar_cache:
+            self.cache = None
+        else:
+            self.cache = cache if cache is not None else (obtener_cache_compartida() if usar_cache else None)
+        
+    @perfilado('obtener_datos_mercado')
+    def obtener_datos_mercado(self, fecha_objetivo: Optional[str] = None,
+                              tickers_extra: Optional[List[str]] = None) -> Dict:
         """
-        Obtiene datos actuales del SPX y VIX
+        Obtiene datos actuales del SPX y VIX (y tickers adicionales) en una sola ronda
         
         Args:
             fecha_objetivo: Fecha en formato 'YYYY-MM-DD' (hasta 7 días en el futuro)
+            tickers_extra: Tickers adicionales (ej: ['^VIX9D', '^VIX3M'])
             
         Returns:
             Dict con valores de SPX y VIX
         """
+        tickers = self._tickers_solicitados(tickers_extra)
         try:
-            # Obtener datos de SPX
-            spx = yf.Ticker(self.spx_ticker)
-            spx_data = spx.history(period="5d")
-            spx_actual = round(spx_data['Close'].iloc[-1], 2)
-            
-            # Obtener datos de VIX
-            vix = yf.Ticker(self.vix_ticker)
-            vix_data = vix.history(period="5d")
-            vix_actual = round(vix_data['Close'].iloc[-1], 2)
-            
-            return {
-                'spx_valor': spx_actual,
-                'vix_valor': vix_actual,
-                'fecha_datos': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'fecha_objetivo': fecha_objetivo or 'Actual'
-            }
-            
+            return self._armar_snapshot(tickers, self._obtener_cierres(tickers), fecha_objetivo)
+        except Exception as e:
+            return self._fallo_datos_mercado(fecha_objetivo, e)
+    
+    async def obtener_datos_mercado_async(self, fecha_objetivo: Optional[str] = None,
+                                          tickers_extra: Optional[List[str]] = None) -> Dict:
+        """
+        Versión asyncio de obtener_datos_mercado: todas las descargas del snapshot
+        se esperan en el event loop, respetando timeout_segundos. Cancelar la tarea
+        cancela las descargas pendientes.
+        """
+        tickers = self._tickers_solicitados(tickers_extra)
+        try:
+            return self._armar_snapshot(tickers, await self._obtener_cierres_async(tickers), fecha_objetivo)
         except Exception as e:
-            print(f"❌ Error obteniendo datos del mercado: {e}")
+            return self._fallo_datos_mercado(fecha_objetivo, e)
+    
+    def _tickers_solicitados(self, tickers_extra: Optional[List[str]]) -> List[str]:
+        if tickers_extra is None:
+            tickers_extra = self.tickers_extra
+        tickers = [self.spx_ticker, self.vix_ticker]
+        return tickers + [t for t in tickers_extra if t not in tickers]
+    
+    def _armar_snapshot(self, tickers: List[str], cotizaciones: Dict[str, Dict],
+                        fecha_objetivo: Optional[str]) -> Dict:
+        """
+        Snapshot del mercado a partir de las cotizaciones (lanza excepción si falta SPX o VIX)
+        """
+        spx = cotizaciones[self.spx_ticker]
+        vix = cotizaciones[self.vix_ticker]
+        for requerido in (spx, vix):
+            if 'error' in requerido:
+                raise RuntimeError(requerido['error'])
+        
+        # La fecha de los datos es la de la cotización más antigua usada
+        guardado = min(spx['guardado'], vix['guardado'])
+        
+        datos = {
+            'spx_valor': spx['valor'],
+            'vix_valor': vix['valor'],
+            'fecha_datos': datetime.fromtimestamp(guardado).strftime('%Y-%m-%d %H:%M:%S'),
+            'fecha_objetivo': fecha_objetivo or 'Actual',
+            'fuente_datos': self.proveedor.descripcion,
+            'desde_cache': spx['desde_cache'] and vix['desde_cache'],
+            'latencias_ms': {t: c['latencia_ms'] for t, c in cotizaciones.items()}
+        }
+        
+        extras = tickers[2:]
+        if extras:
+            datos['extras'] = {t: cotizaciones[t]['valor'] for t in extras if 'valor' in cotizaciones[t]}
+            errores = {t: cotizaciones[t]['error'] for t in extras if 'error' in cotizaciones[t]}
+            if errores:
+                datos['errores_extras'] = errores
+        
+        self._ultimo_snapshot = (datos, guardado)
+        return datos
+    
+    def _fallo_datos_mercado(self, fecha_objetivo: Optional[str], error: Exception) -> Optional[Dict]:
+        respaldo = self._snapshot_respaldo(fecha_objetivo, error)
+        if respaldo is not None:
+            return respaldo
+        print(f"❌ Error obteniendo datos del mercado: {error}")
+        return None
+    
+    def _snapshot_respaldo(self, fecha_objetivo: Optional[str], error: Exception) -> Optional[Dict]:
+        """
+        Último snapshot válido marcado como respaldo, si no supera la antigüedad máxima
+        """
+        if self._ultimo_snapshot is None:
             return None
+        
+        datos, guardado = self._ultimo_snapshot
+        antiguedad = datetime.now().timestamp() - guardado
+        if antiguedad > self.antiguedad_maxima_respaldo:
+            return None
+        
+        contar('iron_condor_respaldos_total')
+        return dict(
+            datos,
+            fecha_objetivo=fecha_objetivo or 'Actual',
+            fuente_datos=f"{datos['fuente_datos']} (último dato válido, hace {antiguedad:.0f}s)",
+            respaldo=True,
+            antiguedad_segundos=round(antiguedad, 1),
+            error_fuente=str(error)
+        )
+    
+    def _obtener_cierres(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Obtiene el último cierre de cada ticker, consultando primero el cache
+        y pidiendo al proveedor los que faltan en una sola solicitud concurrente
+        
+        Returns:
+            Dict {ticker: {'valor', 'guardado' (epoch), 'desde_cache', 'latencia_ms'}}
+            o {ticker: {'error', 'latencia_ms'}} si el ticker no se pudo obtener
+        """
+        resultado, faltantes = self._consultar_cache(tickers)
+        if faltantes:
+            contar('iron_condor_descargas_total', len(faltantes))
+            with medir('iron_condor_fase_segundos', fase='descarga'):
+                cotizaciones = self.proveedor.obtener_cotizaciones(faltantes, timeout=self.timeout_segundos)
+            self._incorporar_descargas(resultado, faltantes, cotizaciones)
+        return resultado
+    
+    async def _obtener_cierres_async(self, tickers: List[str]) -> Dict[str, Dict]:
+        resultado, faltantes = self._consultar_cache(tickers)
+        if faltantes:
+            contar('iron_condor_descargas_total', len(faltantes))
+            with medir('iron_condor_fase_segundos', fase='descarga'):
+                cotizaciones = await self.proveedor.obtener_cotizaciones_async(faltantes, timeout=self.timeout_segundos)
+            self._incorporar_descargas(resultado, faltantes, cotizaciones)
+        return resultado
+    
+    def _consultar_cache(self, tickers: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Returns:
+            (cotizaciones encontradas en el cache, tickers que hay que descargar)
+        """
+        resultado = {}
+        faltantes = []
+        
+        for ticker in tickers:
+            entrada = self.cache.obtener(self._clave_cache(ticker)) if self.cache is not None else None
+            if entrada is not None:
+                entrada.update({'desde_cache': True, 'latencia_ms': 0.0})
+                resultado[ticker] = entrada
+                contar('iron_condor_cache_total', resultado='hit')
+            else:
+                faltantes.append(ticker)
+                if self.cache is not None:
+                    contar('iron_condor_cache_total', resultado='miss')
+        
+        return resultado, faltantes
+    
+    def _incorporar_descargas(self, resultado: Dict[str, Dict], faltantes: List[str],
+                              cotizaciones: Dict[str, Dict]):
+        """
+        Agrega las cotizaciones descargadas al resultado y guarda las válidas en el cache
+        """
+        guardado = datetime.now().timestamp()
+        
+        for ticker in faltantes:
+            cotizacion = cotizaciones[ticker]
+            if 'error' in cotizacion:
+                contar('iron_condor_errores_descarga_total', ticker=ticker)
+                resultado[ticker] = cotizacion
+                continue
+            
+            if self.cache is not None:
+                self.cache.guardar(self._clave_cache(ticker), cotizacion['valor'])
+            resultado[ticker] = {
+                'valor': cotizacion['valor'],
+                'guardado': guardado,
+                'desde_cache': False,
+                'latencia_ms': cotizacion['latencia_ms']
+            }
+    
+    def _clave_cache(self, ticker: str) -> str:
+        """
+        Clave del cache para un ticker, separada por proveedor
+        """
+        return f"{self.proveedor.nombre}:{ticker}"
     
     def validar_fecha(self, fecha_str: str) -> bool:
         """
@@ -164,46 +340,224 @@ class AgenteIronCondorSPX:
             'iv_usado': iv_puntos
         }
     
+    def ajustar_strikes_a_cadena(self, strikes: Dict, fecha_objetivo: Optional[str] = None) -> Dict:
+        """
+        Ajusta los strikes calculados a los listados en self.cadena_opciones
+        
+        Los vendidos se acercan al SPX como en el redondeo a múltiplos de 5 y los
+        comprados se alejan para mantener al menos el ancho del ala.
+        
+        Args:
+            strikes: Resultado de calcular_strikes
+            fecha_objetivo: Fecha objetivo (por defecto el primer vencimiento desde hoy)
+            
+        Returns:
+            Dict de strikes ajustados con el vencimiento usado
+        """
+        cadena = self.cadena_opciones
+        fecha = fecha_objetivo or datetime.now().strftime('%Y-%m-%d')
+        vencimiento = cadena.vencimiento_para(fecha)
+        if vencimiento is None:
+            raise ValueError(f"La cadena no tiene vencimientos desde {fecha}")
+        
+        ala = strikes['ancho_ala']
+        sell_put = cadena.ajustar_strike(strikes['sell_put'], vencimiento, 'superior', 'put', self.oi_minimo)
+        sell_call = cadena.ajustar_strike(strikes['sell_call'], vencimiento, 'inferior', 'call', self.oi_minimo)
+        if sell_put is None or sell_call is None:
+            raise ValueError(f"No hay strikes listados para los strikes vendidos en {vencimiento}")
+        
+        buy_put = cadena.ajustar_strike(sell_put - ala, vencimiento, 'inferior', 'put', self.oi_minimo)
+        buy_call = cadena.ajustar_strike(sell_call + ala, vencimiento, 'superior', 'call', self.oi_minimo)
+        if buy_put is None or buy_call is None:
+            raise ValueError(f"No hay strikes listados para las alas en {vencimiento}")
+        
+        ajustados = dict(strikes)
+        ajustados.update({
+            'sell_put': sell_put,
+            'buy_put': buy_put,
+            'sell_call': sell_call,
+            'buy_call': buy_call,
+            'rango_profit': sell_call - sell_put,
+            'vencimiento': vencimiento,
+            'strikes_teoricos': {k: strikes[k] for k in ('buy_put', 'sell_put', 'sell_call', 'buy_call')}
+        })
+        return ajustados
+    
+    def calcular_strikes_delta(self, spx_valor: float, vix_porcentaje: float, ala: int,
+                               delta_objetivo: float = 0.16, periodo: str = None,
+                               fecha_objetivo: Optional[str] = None) -> Dict:
+        """
+        Calcula los strikes del iron condor eligiendo los vendidos por delta objetivo
+
+        Con self.cadena_opciones usa los strikes listados y sus IV (VIX donde falte);
+        sin cadena usa el VIX como volatilidad y strikes múltiplos de 5.
+
+        Args:
+            spx_valor: Valor del SPX
+            vix_porcentaje: VIX en porcentaje
+            ala: Ancho del ala (10, 15, 20, 25)
+            delta_objetivo: |Delta| de los strikes vendidos (ej: 0.16)
+            periodo: Período temporal (sin cadena define el horizonte)
+            fecha_objetivo: Fecha objetivo (vencimiento de la cadena)
+
+        Returns:
+            Dict con los mismos strikes que calcular_strikes más los deltas obtenidos
+        """
+        from seleccion_delta import seleccionar_por_delta_cadena, seleccionar_por_delta_vix
+
+        if not 0 < delta_objetivo < 1:
+            raise ValueError("Delta objetivo debe estar entre 0 y 1")
+
+        cadena = self.cadena_opciones
+        if cadena is None:
+            seleccion = seleccionar_por_delta_vix(spx_valor, vix_porcentaje, delta_objetivo,
+                                                  periodo=periodo or self.periodo_default,
+                                                  fecha_objetivo=fecha_objetivo)
+            sell_put, sell_call = seleccion['sell_put'], seleccion['sell_call']
+            buy_put, buy_call = sell_put - ala, sell_call + ala
+            vencimiento = None
+        else:
+            fecha = fecha_objetivo or datetime.now().strftime('%Y-%m-%d')
+            vencimiento = cadena.vencimiento_para(fecha)
+            if vencimiento is None:
+                raise ValueError(f"La cadena no tiene vencimientos desde {fecha}")
+
+            seleccion = seleccionar_por_delta_cadena(cadena, spx_valor, delta_objetivo, [vencimiento],
+                                                     vol_respaldo=vix_porcentaje / 100,
+                                                     oi_minimo=self.oi_minimo)[vencimiento]
+            sell_put, sell_call = seleccion['sell_put'], seleccion['sell_call']
+            buy_put = cadena.ajustar_strike(sell_put - ala, vencimiento, 'inferior', 'put', self.oi_minimo)
+            buy_call = cadena.ajustar_strike(sell_call + ala, vencimiento, 'superior', 'call', self.oi_minimo)
+            if buy_put is None or buy_call is None:
+                raise ValueError(f"No hay strikes listados para las alas en {vencimiento}")
+
+        strikes = {
+            'sell_put': sell_put,
+            'buy_put': buy_put,
+            'sell_call': sell_call,
+            'buy_call': buy_call,
+            'ancho_ala': ala,
+            'rango_profit': sell_call - sell_put,
+            'iv_usado': round(max(spx_valor - sell_put, sell_call - spx_valor), 2),
+            'delta_objetivo': delta_objetivo,
+            'delta_put': round(seleccion['delta_put'], 4),
+            'delta_call': round(seleccion['delta_call'], 4)
+        }
+        if vencimiento is not None:
+            strikes['vencimiento'] = vencimiento
+        return strikes
+
+    def calcular_strikes_lote(self, spx_valor, vix_porcentaje, ala, periodo: str = None,
+                              buffer=10) -> Dict:
+        """
+        Versión vectorizada de calcular_iv_puntos + calcular_strikes
+        
+        Args:
+            spx_valor: Valores del SPX (escalar o array)
+            vix_porcentaje: VIX en porcentaje (escalar o array)
+            ala: Ancho del ala (escalar o array)
+            periodo: Período o array de períodos
+            buffer: Buffer de seguridad (escalar o array)
+            
+        Returns:
+            Dict de columnas NumPy (strikes, rango de profit, simetría, IV)
+        """
+        from motor_vectorizado import calcular_strikes_lote
+        
+        return calcular_strikes_lote(
+            spx_valor, vix_porcentaje, ala,
+            periodo=self.periodo_default if periodo is None else periodo,
+            buffer=buffer,
+            periodos_disponibles=self.periodos_disponibles
+        )
+    
+    @medido('iron_condor_fase_segundos', fase='total')
+    @perfilado('ejecutar_calculo_completo')
     def ejecutar_calculo_completo(self, fecha_objetivo: Optional[str] = None, 
-                                 ala: int = 25, periodo: str = None, buffer: int = 10) -> Dict:
+                                 ala: int = 25, periodo: str = None, buffer: int = 10,
+                                 datos_mercado: Optional[Dict] = None,
+                                 delta_objetivo: Optional[float] = None) -> Dict:
         """
         Ejecuta el cálculo completo del iron condor
         
         Args:
             fecha_objetivo: Fecha objetivo (opcional)
             ala: Ancho del ala (10, 15, 20, 25)
+            datos_mercado: Snapshot ya obtenido (evita volver a descargar datos)
+            delta_objetivo: Si se indica, los strikes vendidos se eligen por delta
             
         Returns:
             Dict con todos los resultados
         """
-        # Validaciones
-        if ala not in self.alas_permitidas:
-            raise ValueError(f"Ala debe ser uno de: {self.alas_permitidas}")
-        
-        if fecha_objetivo and not self.validar_fecha(fecha_objetivo):
-            raise ValueError("Fecha debe estar entre hoy y 7 días en el futuro")
+        self._validar_parametros(ala, fecha_objetivo)
         
         # Obtener datos del mercado
-        datos_mercado = self.obtener_datos_mercado(fecha_objetivo)
+        if datos_mercado is None:
+            with medir('iron_condor_fase_segundos', fase='datos_mercado'):
+                datos_mercado = self.obtener_datos_mercado(fecha_objetivo)
+        
+        return self._calcular_con_datos(datos_mercado, fecha_objetivo, ala, periodo, buffer, delta_objetivo)
+    
+    async def ejecutar_calculo_completo_async(self, fecha_objetivo: Optional[str] = None,
+                                              ala: int = 25, periodo: str = None, buffer: int = 10,
+                                              datos_mercado: Optional[Dict] = None,
+                                              delta_objetivo: Optional[float] = None) -> Dict:
+        """
+        Versión asyncio de ejecutar_calculo_completo: solo la obtención de datos es
+        asíncrona; el cálculo (sin E/S) se hace con la misma ruta síncrona.
+        El perfilado no admite corrutinas: aquí solo se perfila el cálculo ('calculo')
+        """
+        # Mismo alcance de 'total' que la versión síncrona: incluye la descarga
+        with medir('iron_condor_fase_segundos', fase='total'):
+            self._validar_parametros(ala, fecha_objetivo)
+            
+            if datos_mercado is None:
+                with medir('iron_condor_fase_segundos', fase='datos_mercado'):
+                    datos_mercado = await self.obtener_datos_mercado_async(fecha_objetivo)
+            
+            return self._calcular_con_datos(datos_mercado, fecha_objetivo, ala, periodo, buffer, delta_objetivo)
+    
+    @perfilado('calculo')
+    def _calcular_con_datos(self, datos_mercado: Optional[Dict], fecha_objetivo: Optional[str], ala: int,
+                            periodo: Optional[str], buffer: int, delta_objetivo: Optional[float]) -> Dict:
+        """
+        Cálculo completo sobre un snapshot ya obtenido (común a las versiones síncrona y asyncio)
+        """
         if not datos_mercado:
             raise Exception("No se pudieron obtener datos del mercado")
         
         # Calcular IV en puntos con ajuste temporal correcto
-        iv_resultado = self.calcular_iv_puntos(
-            datos_mercado['spx_valor'], 
-            datos_mercado['vix_valor'],
-            periodo=periodo,
-            buffer=buffer
-        )
+        with medir('iron_condor_fase_segundos', fase='iv_puntos'):
+            iv_resultado = self.calcular_iv_puntos(
+                datos_mercado['spx_valor'], 
+                datos_mercado['vix_valor'],
+                periodo=periodo,
+                buffer=buffer
+            )
         
         iv_puntos = iv_resultado['iv_final']
         
-        # Calcular strikes
-        strikes = self.calcular_strikes(
-            datos_mercado['spx_valor'], 
-            iv_puntos, 
-            ala
-        )
+        # Calcular strikes (por delta objetivo o por movimiento esperado)
+        with medir('iron_condor_fase_segundos', fase='strikes'):
+            if delta_objetivo is not None:
+                strikes = self.calcular_strikes_delta(
+                    datos_mercado['spx_valor'],
+                    datos_mercado['vix_valor'],
+                    ala,
+                    delta_objetivo=delta_objetivo,
+                    periodo=iv_resultado['periodo_usado'],
+                    fecha_objetivo=fecha_objetivo
+                )
+            else:
+                strikes = self.calcular_strikes(
+                    datos_mercado['spx_valor'], 
+                    iv_puntos, 
+                    ala
+                )
+                
+                # Ajustar a strikes realmente listados si hay una cadena cargada
+                if self.cadena_opciones is not None:
+                    strikes = self.ajustar_strikes_a_cadena(strikes, fecha_objetivo)
         
         # Agregar información del IV al resultado de strikes
         strikes.update({
@@ -221,14 +575,124 @@ class AgenteIronCondorSPX:
                 'iv_anualizado': iv_resultado['iv_anual'],
                 'iv_ajustado_tiempo': iv_resultado['iv_periodo'],
                 'buffer_agregado': iv_resultado['buffer_aplicado'],
-                'factor_tiempo': iv_resultado['factor_tiempo']
+                'factor_tiempo': iv_resultado['factor_tiempo'],
+                'delta_objetivo': delta_objetivo
             },
             'strikes': strikes,
             'resumen_estrategia': self._generar_resumen_estrategia(datos_mercado, strikes)
         }
         
+        # Valoración Black-Scholes (crédito, riesgo y griegas)
+        with medir('iron_condor_fase_segundos', fase='valoracion'):
+            resultado['valoracion'] = self.valorar_condor(resultado)
+        
+        # Registro en el historial (solo encola: no bloquea al llamador)
+        if self.diario is not None:
+            self.diario.registrar(resultado)
+        
         return resultado
     
+    def _validar_parametros(self, ala: int, fecha_objetivo: Optional[str]):
+        if ala not in self.alas_permitidas:
+            raise ValueError(f"Ala debe ser uno de: {self.alas_permitidas}")
+        
+        if fecha_objetivo and not self.validar_fecha(fecha_objetivo):
+            raise ValueError("Fecha debe estar entre hoy y 7 días en el futuro")
+    
+    def valorar_condor(self, resultado: Dict, vol: Optional[float] = None) -> Optional[Dict]:
+        """
+        Valora con Black-Scholes el iron condor de un resultado
+        
+        Args:
+            resultado: Resultado de ejecutar_calculo_completo
+            vol: Volatilidad implícita en decimal (por defecto VIX / 100)
+            
+        Returns:
+            Dict con crédito neto, riesgo máximo, breakevens y griegas
+            (None si NumPy no está disponible)
+        """
+        try:
+            from valoracion_black_scholes import valorar_resultado
+        except ImportError:
+            return None
+        
+        return valorar_resultado(resultado, vol=vol)
+    
+    def barrido_parametros(self, alas: Optional[List[int]] = None, periodos: Optional[List[str]] = None,
+                           buffers: Optional[List[int]] = None, fecha_objetivo: Optional[str] = None,
+                           datos_mercado: Optional[Dict] = None) -> List[Dict]:
+        """
+        Evalúa toda la combinación alas × períodos × buffers sobre un único snapshot
+        del mercado (una sola descarga de datos)
+        
+        Args:
+            alas: Anchos de ala (por defecto alas_permitidas)
+            periodos: Períodos (por defecto todos los disponibles)
+            buffers: Buffers en puntos (por defecto 0 a 50 de 5 en 5)
+            fecha_objetivo: Fecha objetivo (opcional)
+            datos_mercado: Snapshot ya obtenido (opcional)
+            
+        Returns:
+            Lista de filas (una por combinación), lista para pd.DataFrame; con
+            self.cadena_opciones los strikes se ajustan a los listados
+        """
+        import numpy as np
+        
+        alas = list(self.alas_permitidas if alas is None else alas)
+        periodos = list(self.periodos_disponibles if periodos is None else periodos)
+        buffers = list(range(0, 51, 5) if buffers is None else buffers)
+        
+        invalidas = [a for a in alas if a not in self.alas_permitidas]
+        if invalidas:
+            raise ValueError(f"Ala debe ser uno de: {self.alas_permitidas}")
+        
+        if fecha_objetivo and not self.validar_fecha(fecha_objetivo):
+            raise ValueError("Fecha debe estar entre hoy y 7 días en el futuro")
+        
+        if datos_mercado is None:
+            datos_mercado = self.obtener_datos_mercado(fecha_objetivo)
+        if not datos_mercado:
+            raise Exception("No se pudieron obtener datos del mercado")
+        
+        # Malla completa en un solo cálculo vectorizado
+        malla_ala, malla_periodo, malla_buffer = np.meshgrid(
+            np.array(alas), np.array(periodos), np.array(buffers), indexing='ij'
+        )
+        columnas = self.calcular_strikes_lote(
+            datos_mercado['spx_valor'], datos_mercado['vix_valor'],
+            malla_ala.ravel(), malla_periodo.ravel(), malla_buffer.ravel()
+        )
+        
+        filas = [
+            {
+                'ala': int(columnas['ancho_ala'][i]),
+                'periodo': str(malla_periodo.ravel()[i]),
+                'buffer': int(columnas['buffer_aplicado'][i]),
+                'spx_valor': datos_mercado['spx_valor'],
+                'vix_valor': datos_mercado['vix_valor'],
+                'iv_final': float(columnas['iv_final'][i]),
+                'buy_put': int(columnas['buy_put'][i]),
+                'sell_put': int(columnas['sell_put'][i]),
+                'sell_call': int(columnas['sell_call'][i]),
+                'buy_call': int(columnas['buy_call'][i]),
+                'rango_profit': int(columnas['rango_profit'][i]),
+                'simetria': float(columnas['simetria'][i]),
+                'fecha_datos': datos_mercado['fecha_datos']
+            }
+            for i in range(malla_ala.size)
+        ]
+        
+        # Mismo ajuste a strikes listados que ejecutar_calculo_completo
+        if self.cadena_opciones is not None:
+            spx_valor = datos_mercado['spx_valor']
+            for fila in filas:
+                ajustados = self.ajustar_strikes_a_cadena(dict(fila, ancho_ala=fila['ala']), fecha_objetivo)
+                for clave in ('buy_put', 'sell_put', 'sell_call', 'buy_call', 'rango_profit', 'vencimiento'):
+                    fila[clave] = ajustados[clave]
+                fila['simetria'] = abs((spx_valor - fila['sell_put']) - (fila['sell_call'] - spx_valor))
+        
+        return filas
+    
     def _generar_resumen_estrategia(self, datos_mercado: Dict, strikes: Dict) -> Dict:
         """
         Genera un resumen de la estrategia calculada
@@ -262,6 +726,9 @@ class AgenteIronCondorSPX:
         print(f"   📈 SPX: ${datos['spx_valor']:,.2f}")
         print(f"   📉 VIX: {datos['vix_valor']:.2f}%")
         print(f"   📅 Fecha: {datos['fecha_datos']}")
+        if datos.get('respaldo'):
+            print(f"   ⚠️ Respaldo: fuente no disponible ({datos['error_fuente']}), "
+                  f"dato de hace {datos['antiguedad_segundos']:.0f}s")
         print(f"   🎯 Objetivo: {datos['fecha_objetivo']}")
         
         # Parámetros
@@ -282,7 +749,10 @@ class AgenteIronCondorSPX:
         print(f"   📈 Sell Put: ${strikes['sell_put']:,}")
         print(f"   📈 Sell Call: ${strikes['sell_call']:,}")
         print(f"   📉 Buy Call: ${strikes['buy_call']:,}")
-        
+        if 'delta_objetivo' in strikes:
+            print(f"   Δ Delta objetivo {strikes['delta_objetivo']:.2f}: "
+                  f"put {strikes['delta_put']:.3f} | call {strikes['delta_call']:.3f}")
+
         # Resumen estrategia
         resumen = resultado['resumen_estrategia']
         print(f"\n🎲 ANÁLISIS DE LA ESTRATEGIA:")
@@ -292,6 +762,16 @@ class AgenteIronCondorSPX:
         print(f"   ⬆️ Distancia a Sell Call: {resumen['distancia_spx_sell_call']:.1f} puntos")
         print(f"   ⚖️ Simetría: {resumen['simetria']:.1f} puntos")
         
+        # Valoración
+        valoracion = resultado.get('valoracion')
+        if valoracion:
+            print("\n💵 VALORACIÓN BLACK-SCHOLES:")
+            print(f"   💰 Crédito neto: {valoracion['credito_neto']:.2f} puntos")
+            print(f"   🚨 Riesgo máximo: {valoracion['riesgo_maximo']:.2f} puntos")
+            print(f"   ↔️ Breakevens: {valoracion['breakeven_inferior']:,.2f} - {valoracion['breakeven_superior']:,.2f}")
+            print(f"   Δ Delta: {valoracion['delta']:+.4f} | Γ Gamma: {valoracion['gamma']:+.4f}")
+            print(f"   Θ Theta: {valoracion['theta']:+.2f}/día | ν Vega: {valoracion['vega']:+.2f}/punto vol")
+        
         print("\n" + "="*80)
         print("✅ CÁLCULO COMPLETADO EXITOSAMENTE")
         print("="*80)
@@ -300,16 +780,58 @@ class AgenteIronCondorSPX:
 def main():
     """
     Función principal para demostración
+    
+    Con --spx y --vix calcula sin descargar datos (arranque rápido, sin yfinance).
     """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Agente Iron Condor SPX")
+    parser.add_argument('--ala', type=int, default=25)
+    parser.add_argument('--periodo', choices=['diario', 'semanal', 'mensual', 'anual'])
+    parser.add_argument('--buffer', type=int, default=10)
+    parser.add_argument('--spx', type=float, help="Valor del SPX (sin descargar datos)")
+    parser.add_argument('--vix', type=float, help="VIX en porcentaje (sin descargar datos)")
+    parser.add_argument('--metricas', action='store_true', help="Mostrar tiempos por fase (Prometheus)")
+    parser.add_argument('--perfil', choices=list(MODOS_PERFIL),
+                        help="Perfilar el cálculo (archivos .folded en ~/.iron_condor/perfiles)")
+    args = parser.parse_args()
+    
+    if args.perfil:
+        configurar_perfil(args.perfil)
+    
+    if args.metricas:
+        import metricas
+        metricas.activar()
+    
     agente = AgenteIronCondorSPX()
     
     try:
         print("🚀 Iniciando Agente Iron Condor SPX...")
         
-        # Ejemplo con parámetros por defecto
-        resultado = agente.ejecutar_calculo_completo(ala=25)
+        datos_mercado = None
+        if args.spx is not None and args.vix is not None:
+            datos_mercado = {
+                'spx_valor': args.spx,
+                'vix_valor': args.vix,
+                'fecha_datos': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'fecha_objetivo': 'Actual',
+                'fuente_datos': 'Valores indicados',
+                'desde_cache': False,
+                'latencias_ms': {}
+            }
+        
+        resultado = agente.ejecutar_calculo_completo(
+            ala=args.ala,
+            periodo=args.periodo,
+            buffer=args.buffer,
+            datos_mercado=datos_mercado
+        )
         agente.mostrar_resultado_formateado(resultado)
         
+        if args.metricas:
+            print("\n📈 MÉTRICAS:")
+            print(metricas.exportar_prometheus())
+        
     except Exception as e:
         print(f"❌ Error: {e}")
 
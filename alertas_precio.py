@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Alertas de Precio - Iron Condor SPX
+Motor de alertas alimentado por cotizaciones que avisa cuando el SPX se acerca a
+los strikes vendidos (sell_put / sell_call) de cientos de posiciones abiertas.
+Los niveles se guardan en índices ordenados: cada tick se resuelve con una
+búsqueda binaria más los niveles cruzados, sin recorrer todas las posiciones.
+Las alertas se entregan en lotes a callbacks (ej: un webhook) desde un hilo propio.
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import itertools
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional
+
+from metricas import contar
+
+DISTANCIAS_DEFAULT = (25, 10, 0)  # Puntos al strike vendido que disparan una alerta
+HISTERESIS_DEFAULT = 5.0          # Puntos que el precio debe alejarse para rearmar una alerta
+TAMANO_LOTE = 100                 # Alertas por entrega
+INTERVALO_LOTE = 0.5              # Segundos máximos que una alerta espera a completar su lote
+MAX_COLA = 10_000                 # Alertas pendientes antes de empezar a descartar
+TIMEOUT_WEBHOOK = 5
+
+BAJADA, SUBIDA = 'bajada', 'subida'
+
+_FIN = object()
+
+
+class IndiceNiveles:
+    """
+    Niveles de alerta de una dirección, ordenados para que los cruzados por un
+    precio sean siempre un sufijo de la lista: bajada (precio <= nivel) ordena
+    por nivel y subida (precio >= nivel) por -nivel
+    """
+
+    def __init__(self, direccion: str):
+        self.direccion = direccion
+        self._signo = 1 if direccion == BAJADA else -1
+        self._claves = []  # [(signo * nivel, id)] ascendente
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def agregar(self, nivel: float, ident: int):
+        insort(self._claves, (self._signo * nivel, ident))
+
+    def quitar(self, nivel: float, ident: int) -> bool:
+        clave = (self._signo * nivel, ident)
+        i = bisect_left(self._claves, clave)
+        if i < len(self._claves) and self._claves[i] == clave:
+            del self._claves[i]
+            return True
+        return False
+
+    def extraer_cruzados(self, precio: float) -> List[int]:
+        """
+        Quita y devuelve los ids de los niveles cruzados por el precio: O(log n + cruzados)
+        """
+        i = bisect_left(self._claves, (self._signo * precio,))
+        if i == len(self._claves):
+            return []
+        cruzados = [ident for _, ident in self._claves[i:]]
+        del self._claves[i:]
+        return cruzados
+
+
+class MotorAlertas:
+    """
+    Alertas de cruce de nivel con rearme por histéresis.
+
+    Una alerta de bajada se dispara cuando el precio cae hasta su nivel y queda
+    desarmada hasta que el precio vuelve a subir 'histeresis' puntos por encima
+    (lo mismo, invertido, para las de subida). Las alertas desarmadas esperan su
+    rearme en el índice de la dirección contraria.
+    """
+
+    def __init__(self, histeresis: float = HISTERESIS_DEFAULT, notificadores: Optional[List] = None):
+        """
+        Args:
+            histeresis: Puntos de rearme tras disparar, > 0 (evita alertas repetidas por ruido)
+            notificadores: Objetos con notificar(eventos), ej: NotificadorLotes
+        """
+        if histeresis <= 0:
+            raise ValueError("La histéresis debe ser mayor que 0")
+        self.histeresis = histeresis
+        self.notificadores = list(notificadores or [])
+        self.ultimo_precio = None
+        self.ticks = 0
+        self.disparadas = 0
+        self._indices = {BAJADA: IndiceNiveles(BAJADA), SUBIDA: IndiceNiveles(SUBIDA)}
+        self._alertas = {}        # {id: alerta}
+        self._por_posicion = {}   # {posicion: [ids]}
+        self._ids = itertools.count(1)
+        self._posiciones = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._alertas)
+
+    # --- Alta y baja ---
+
+    def agregar_alerta(self, nivel: float, direccion: str, **datos) -> int:
+        """
+        Alerta genérica: se dispara cuando el precio llega a 'nivel' en 'direccion'
+
+        Args:
+            nivel: Precio del subyacente
+            direccion: 'bajada' (precio <= nivel) o 'subida' (precio >= nivel)
+            datos: Campos adicionales incluidos en cada evento
+
+        Returns:
+            Id de la alerta
+        """
+        if direccion not in self._indices:
+            raise ValueError(f"Dirección debe ser '{BAJADA}' o '{SUBIDA}'")
+
+        with self._lock:
+            ident = next(self._ids)
+            self._alertas[ident] = dict(datos, id=ident, nivel=float(nivel), direccion=direccion, armada=True)
+            self._indices[direccion].agregar(float(nivel), ident)
+            return ident
+
+    def agregar_posicion(self, strikes: Dict, distancias: Iterable[float] = DISTANCIAS_DEFAULT,
+                         posicion: Optional[str] = None) -> str:
+        """
+        Alertas de acercamiento a los strikes vendidos de un iron condor
+
+        Args:
+            strikes: Resultado de calcular_strikes o de ejecutar_calculo_completo
+            distancias: Puntos al strike vendido que disparan una alerta (0 = al tocarlo)
+            posicion: Identificador de la posición (por defecto 'pos-N')
+
+        Returns:
+            Identificador de la posición
+        """
+        strikes = strikes.get('strikes', strikes)
+        if posicion is None:
+            posicion = f"pos-{next(self._posiciones)}"
+
+        ids = []
+        for distancia in distancias:
+            ids.append(self.agregar_alerta(strikes['sell_put'] + distancia, BAJADA, posicion=posicion,
+                                           lado='put', strike=strikes['sell_put'], distancia=distancia))
+            ids.append(self.agregar_alerta(strikes['sell_call'] - distancia, SUBIDA, posicion=posicion,
+                                           lado='call', strike=strikes['sell_call'], distancia=distancia))
+
+        with self._lock:
+            self._por_posicion.setdefault(posicion, []).extend(ids)
+        return posicion
+
+    def quitar_alerta(self, ident: int) -> bool:
+        with self._lock:
+            return self._quitar(ident)
+
+    def quitar_posicion(self, posicion: str) -> int:
+        """
+        Quita todas las alertas de una posición (ej: al cerrarla)
+
+        Returns:
+            Cantidad de alertas quitadas
+        """
+        with self._lock:
+            return sum(self._quitar(ident) for ident in self._por_posicion.pop(posicion, []))
+
+    def _quitar(self, ident: int) -> bool:
+        alerta = self._alertas.pop(ident, None)
+        if alerta is None:
+            return False
+        if alerta['armada']:
+            self._indices[alerta['direccion']].quitar(alerta['nivel'], ident)
+        else:
+            self._indices[_contraria(alerta['direccion'])].quitar(self._nivel_rearme(alerta), ident)
+        return True
+
+    def _nivel_rearme(self, alerta: Dict) -> float:
+        if alerta['direccion'] == BAJADA:
+            return alerta['nivel'] + self.histeresis
+        return alerta['nivel'] - self.histeresis
+
+    # --- Cotizaciones ---
+
+    def actualizar(self, precio: float, momento: Optional[float] = None) -> List[Dict]:
+        """
+        Procesa una cotización: dispara las alertas cruzadas, rearma las que
+        se alejaron lo suficiente y entrega los eventos a los notificadores
+
+        Returns:
+            Eventos disparados por este tick
+        """
+        momento = time.time() if momento is None else momento
+        eventos = []
+
+        with self._lock:
+            self.ticks += 1
+            self.ultimo_precio = precio
+            for direccion, indice in self._indices.items():
+                for ident in indice.extraer_cruzados(precio):
+                    alerta = self._alertas[ident]
+                    if alerta['armada']:
+                        # Disparo: queda esperando el rearme en el índice contrario
+                        alerta['armada'] = False
+                        self._indices[_contraria(direccion)].agregar(self._nivel_rearme(alerta), ident)
+                        eventos.append(dict(alerta, precio=precio, momento=momento))
+                    else:
+                        alerta['armada'] = True
+                        self._indices[alerta['direccion']].agregar(alerta['nivel'], ident)
+            self.disparadas += len(eventos)
+
+        if eventos:
+            for evento in eventos:
+                del evento['armada']
+                contar('iron_condor_alertas_total', lado=evento.get('lado', evento['direccion']))
+            for notificador in self.notificadores:
+                notificador.notificar(eventos)
+        return eventos
+
+    def alimentar(self, agente, intervalo: float = 1.0, ticks: Optional[int] = None,
+                  detener: Optional[threading.Event] = None):
+        """
+        Consulta el SPX al agente cada 'intervalo' segundos y procesa cada cotización
+
+        Args:
+            agente: AgenteIronCondorSPX (usa su proveedor y cache)
+            ticks: Cantidad de consultas (None = hasta que se active 'detener')
+            detener: Evento para terminar el bucle desde otro hilo
+        """
+        detener = detener or threading.Event()
+        for _ in (range(ticks) if ticks is not None else itertools.count()):
+            datos = agente.obtener_datos_mercado()
+            if datos:
+                self.actualizar(datos['spx_valor'])
+            if detener.wait(intervalo):
+                break
+
+
+def _contraria(direccion: str) -> str:
+    return SUBIDA if direccion == BAJADA else BAJADA
+
+
+class NotificadorLotes:
+    """
+    Entrega las alertas en lotes a callback(lote) desde un hilo propio.
+
+    notificar() solo encola (nunca bloquea al motor); el lote se entrega al
+    juntar 'tamano_lote' alertas o al pasar 'intervalo' segundos desde la primera.
+    """
+
+    def __init__(self, callback: Callable[[List[Dict]], None], tamano_lote: int = TAMANO_LOTE,
+                 intervalo: float = INTERVALO_LOTE, max_cola: int = MAX_COLA):
+        self.callback = callback
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.entregadas = 0
+        self.lotes = 0
+        self.descartadas = 0
+        self.errores = 0
+        self._cola = queue.Queue(maxsize=max_cola)
+        self._hilo = None
+        self._lock_hilo = threading.Lock()
+
+    def notificar(self, eventos: List[Dict]):
+        self._iniciar()
+        for evento in eventos:
+            try:
+                self._cola.put_nowait(evento)
+            except queue.Full:
+                self.descartadas += 1
+
+    def _iniciar(self):
+        if self._hilo is not None:
+            return
+        with self._lock_hilo:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._entregar, name='alertas-precio', daemon=True)
+                self._hilo.start()
+
+    def _entregar(self):
+        """
+        Bucle del hilo: junta un lote y lo entrega al callback
+        """
+        terminar = False
+        while not terminar:
+            lote = [self._cola.get()]
+            limite = time.monotonic() + self.intervalo
+            while lote[-1] is not _FIN and len(lote) < self.tamano_lote:
+                try:
+                    lote.append(self._cola.get(timeout=max(limite - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            if lote[-1] is _FIN:
+                terminar = True
+            alertas = [evento for evento in lote if evento is not _FIN]
+            try:
+                if alertas:
+                    self.callback(alertas)
+                    self.entregadas += len(alertas)
+                    self.lotes += 1
+            except Exception as e:
+                self.errores += 1
+                print(f"⚠️ No se pudieron entregar {len(alertas)} alertas: {e}")
+            finally:
+                for _ in lote:
+                    self._cola.task_done()
+
+    def vaciar(self):
+        """
+        Espera a que todas las alertas encoladas se hayan entregado
+        """
+        if self._hilo is not None:
+            self._cola.join()
+
+    def cerrar(self):
+        """
+        Entrega lo pendiente y detiene el hilo
+        """
+        with self._lock_hilo:
+            if self._hilo is not None:
+                self._cola.put(_FIN)
+                self._hilo.join()
+                self._hilo = None
+
+
+class NotificadorWebhook(NotificadorLotes):
+    """
+    Envía cada lote como POST JSON: {"alertas": [...]}
+    """
+
+    def __init__(self, url: str, timeout: float = TIMEOUT_WEBHOOK, **kwargs):
+        super().__init__(self._enviar, **kwargs)
+        self.url = url
+        self.timeout = timeout
+
+    def _enviar(self, lote: List[Dict]):
+        from urllib.request import Request, urlopen
+
+        solicitud = Request(self.url, data=json.dumps({'alertas': lote}).encode('utf-8'),
+                            headers={'Content-Type': 'application/json'}, method='POST')
+        with urlopen(solicitud, timeout=self.timeout) as respuesta:
+            respuesta.read()
+
+
+class ReceptorWebhook:
+    """
+    Servidor HTTP local que hace de destino del webhook y guarda los lotes recibidos
+    """
+
+    def __init__(self):
+        self.lotes = []
+        self._servidor = None
+
+    @property
+    def alertas(self) -> int:
+        return sum(len(lote) for lote in self.lotes)
+
+    def iniciar(self, host: str = '127.0.0.1', puerto: int = 0) -> str:
+        """
+        Levanta el servidor en segundo plano y devuelve su URL
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        receptor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_POST(self):
+                cuerpo = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                receptor.lotes.append(json.loads(cuerpo)['alertas'])
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer((host, puerto), Manejador)
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, name='receptor-webhook', daemon=True).start()
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}/alertas"
+
+    def detener(self):
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+
+def main():
+    """
+    Demostración: posiciones calculadas sobre un SPX simulado y un webhook local
+    """
+    from agente_iron_condor_final import AgenteIronCondorSPX
+
+    parser = argparse.ArgumentParser(description="Motor de alertas de precio sobre strikes vendidos")
+    parser.add_argument('--posiciones', type=int, default=500)
+    parser.add_argument('--ticks', type=int, default=20_000)
+    parser.add_argument('--spx', type=float, default=5800.0, help="Precio inicial del recorrido simulado")
+    parser.add_argument('--semilla', type=int, default=7)
+    parser.add_argument('--webhook', help="URL destino (por defecto un receptor local)")
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    agente = AgenteIronCondorSPX(usar_cache=False)
+    receptor = None
+    url = args.webhook
+    if url is None:
+        receptor = ReceptorWebhook()
+        url = receptor.iniciar()
+    notificador = NotificadorWebhook(url)
+    motor = MotorAlertas(notificadores=[notificador])
+
+    try:
+        for _ in range(args.posiciones):
+            spx = args.spx * (1 + azar.uniform(-0.02, 0.02))
+            iv_puntos = agente.calcular_iv_puntos(spx, azar.uniform(12, 30))['iv_final']
+            motor.agregar_posicion(agente.calcular_strikes(spx, iv_puntos, azar.choice(agente.alas_permitidas)))
+
+        precio = args.spx
+        inicio = time.perf_counter()
+        for _ in range(args.ticks):
+            precio += azar.gauss(0, 1.5)
+            motor.actualizar(round(precio, 2))
+        segundos = time.perf_counter() - inicio
+
+        notificador.cerrar()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        if receptor is not None:
+            receptor.detener()
+
+    print("\n" + "="*70)
+    print("🔔 MOTOR DE ALERTAS DE PRECIO")
+    print("="*70)
+    print(f"   📋 Posiciones: {args.posiciones:,} ({len(motor):,} alertas)")
+    print(f"   📈 Ticks: {motor.ticks:,} en {segundos:.2f}s ({segundos / motor.ticks * 1e6:.1f} µs por tick)")
+    print(f"   🔔 Alertas disparadas: {motor.disparadas:,}")
+    print(f"   📦 Entregadas: {notificador.entregadas:,} en {notificador.lotes:,} lotes "
+          f"(errores: {notificador.errores}, descartadas: {notificador.descartadas})")
+    if receptor is not None:
+        print(f"   🌐 Recibidas por el webhook local: {receptor.alertas:,}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
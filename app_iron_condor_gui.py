@@ -9,9 +9,15 @@ Fecha: 2025-09-28
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import threading
+import difflib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from agente_iron_condor_final import AgenteIronCondorSPX
+from diario_calculos import obtener_diario_compartido
+
+DEBOUNCE_MS = 300           # Espera tras el último cambio de parámetros antes de recalcular
+REFRESCO_MINIMO_S = 5.0     # Clics dentro de esta ventana reutilizan la descarga en curso/reciente
 
 class IronCondorGUI:
     def __init__(self, root):
@@ -21,7 +27,18 @@ class IronCondorGUI:
         self.root.configure(bg='#f0f0f0')
         
         # Crear el agente
-        self.agente = AgenteIronCondorSPX()
+        self.agente = AgenteIronCondorSPX(diario=obtener_diario_compartido())
+        
+        # Un único hilo de trabajo: las tareas nunca se solapan y las pendientes se cancelan
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='iron-condor')
+        self.tarea = None
+        self.generacion = 0
+        self.recalculo_programado = None
+        
+        # Último snapshot del mercado (se reutiliza al cambiar parámetros)
+        self.datos_mercado = None
+        self.inicio_descarga = None
+        self.lineas_mostradas = []
         
         # Variables
         self.ala_var = tk.StringVar(value="25")
@@ -30,6 +47,11 @@ class IronCondorGUI:
         
         self.setup_ui()
         
+        # Recalcular automáticamente (con debounce) al cambiar cualquier parámetro
+        for variable in (self.ala_var, self.periodo_var, self.buffer_var):
+            variable.trace_add('write', self._programar_recalculo)
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
     def setup_ui(self):
         """Configurar la interfaz de usuario"""
         
@@ -83,7 +105,19 @@ class IronCondorGUI:
             command=self.calcular_iron_condor,
             cursor='hand2'
         )
-        calc_button.pack(pady=10)
+        calc_button.pack(pady=(10, 5))
+        
+        # Botón de comparación de alas
+        compare_button = tk.Button(
+            main_frame,
+            text="🔀 COMPARAR ALAS",
+            font=('Arial', 11, 'bold'),
+            bg='#2980b9',
+            fg='white',
+            command=self.comparar_alas,
+            cursor='hand2'
+        )
+        compare_button.pack(pady=(0, 10))
         
         # Panel de resultados
         self.setup_results_panel(main_frame)
@@ -190,53 +224,174 @@ class IronCondorGUI:
 
 ════════════════════════════════════════════
         """
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(tk.END, mensaje)
+        self._actualizar_texto(mensaje)
         
     def calcular_iron_condor(self):
-        """Ejecutar cálculo en hilo separado"""
+        """Calcular con datos frescos del mercado (en el hilo de trabajo)"""
+        parametros = self._leer_parametros()
+        if parametros is None:
+            return
+        
         self.status_label.config(text="🔄 Calculando... Obteniendo datos del mercado")
+        self._enviar(self._ejecutar_calculo, self._mostrar_resultados, *parametros, True)
         
-        # Deshabilitar botón durante cálculo
-        self.root.update_idletasks()
+    def _programar_recalculo(self, *_):
+        """Reprogramar el recálculo; solo se ejecuta tras DEBOUNCE_MS sin cambios"""
+        if self.recalculo_programado is not None:
+            self.root.after_cancel(self.recalculo_programado)
+        self.recalculo_programado = self.root.after(DEBOUNCE_MS, self._recalcular)
         
-        # Ejecutar en thread para no bloquear UI
-        thread = threading.Thread(target=self._ejecutar_calculo)
-        thread.daemon = True
-        thread.start()
+    def _recalcular(self):
+        """Recalcular con el snapshot ya descargado (sin acceder a la red)"""
+        self.recalculo_programado = None
+        if self.datos_mercado is None:
+            return
         
-    def _ejecutar_calculo(self):
-        """Ejecutar el cálculo real"""
+        parametros = self._leer_parametros()
+        if parametros is None:
+            return
+        
+        self.status_label.config(text="🔄 Recalculando con los datos ya descargados...")
+        self._enviar(self._ejecutar_calculo, self._mostrar_resultados, *parametros, False)
+        
+    def _leer_parametros(self):
+        """Leer los parámetros en el hilo de la interfaz (None si son inválidos)"""
         try:
-            # Obtener parámetros
-            ala = int(self.ala_var.get())
-            periodo = self.periodo_var.get()
-            buffer = int(self.buffer_var.get())
+            return int(self.ala_var.get()), self.periodo_var.get(), int(self.buffer_var.get())
+        except ValueError:
+            self.status_label.config(text="⚠️ Parámetros inválidos: el ala y el buffer deben ser enteros")
+            return None
+        
+    def _enviar(self, funcion, al_terminar, *args):
+        """
+        Enviar una tarea al hilo de trabajo
+        
+        La tarea anterior se cancela si aún no empezó; si ya está en curso, su
+        resultado se descarta al llegar porque pertenece a una generación vieja.
+        """
+        self.generacion += 1
+        generacion = self.generacion
+        if self.tarea is not None:
+            self.tarea.cancel()
+        
+        def ejecutar():
+            try:
+                resultado = funcion(*args)
+            except Exception as e:
+                self.root.after(0, self._entregar, generacion, self._mostrar_error, str(e))
+            else:
+                self.root.after(0, self._entregar, generacion, al_terminar, resultado)
+        
+        self.tarea = self.ejecutor.submit(ejecutar)
+        
+    def _entregar(self, generacion, manejador, valor):
+        """Mostrar el resultado solo si corresponde a la última solicitud"""
+        if generacion == self.generacion:
+            manejador(valor)
             
-            # Ejecutar cálculo
-            resultado = self.agente.ejecutar_calculo_completo(
-                ala=ala,
-                periodo=periodo,
-                buffer=buffer
-            )
+    def _obtener_snapshot(self, refrescar):
+        """Snapshot del mercado: se descarga solo si se pidió y el último es viejo"""
+        reciente = (self.inicio_descarga is not None
+                    and time.monotonic() - self.inicio_descarga < REFRESCO_MINIMO_S)
+        if self.datos_mercado is None or (refrescar and not reciente):
+            self.inicio_descarga = time.monotonic()
+            datos = self.agente.obtener_datos_mercado()
+            if not datos:
+                raise Exception("No se pudieron obtener datos del mercado")
+            self.datos_mercado = datos
+        return self.datos_mercado
+        
+    def _ejecutar_calculo(self, ala, periodo, buffer, refrescar):
+        """Ejecutar el cálculo real (hilo de trabajo)"""
+        return self.agente.ejecutar_calculo_completo(
+            ala=ala,
+            periodo=periodo,
+            buffer=buffer,
+            datos_mercado=self._obtener_snapshot(refrescar)
+        )
             
-            # Mostrar resultados en UI thread
-            self.root.after(0, self._mostrar_resultados, resultado)
+    def comparar_alas(self):
+        """Comparar todas las alas en el hilo de trabajo con un único snapshot"""
+        parametros = self._leer_parametros()
+        if parametros is None:
+            return
+        
+        self.status_label.config(text="🔄 Comparando alas... Obteniendo datos del mercado")
+        _, periodo, buffer = parametros
+        self._enviar(self._ejecutar_comparacion, self._mostrar_comparacion, periodo, buffer)
+        
+    def _ejecutar_comparacion(self, periodo, buffer):
+        """Ejecutar el barrido de alas (hilo de trabajo)"""
+        return self.agente.barrido_parametros(
+            periodos=[periodo],
+            buffers=[buffer],
+            datos_mercado=self._obtener_snapshot(refrescar=True)
+        )
+        
+    def _actualizar_texto(self, texto):
+        """
+        Actualizar el área de resultados reemplazando solo las líneas que cambiaron
+        (conserva la posición del scroll y evita el parpadeo de reescribir todo)
+        """
+        nuevas = texto.split("\n")
+        posicion = self.results_text.yview()[0]
+        
+        operaciones = difflib.SequenceMatcher(None, self.lineas_mostradas, nuevas, autojunk=False).get_opcodes()
+        # De abajo hacia arriba para que los índices de las líneas anteriores sigan siendo válidos
+        for etiqueta, i1, i2, j1, j2 in reversed(operaciones):
+            if etiqueta == 'equal':
+                continue
+            self.results_text.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+            if j2 > j1:
+                self.results_text.insert(f"{i1 + 1}.0", "\n".join(nuevas[j1:j2]) + "\n")
+        
+        self.lineas_mostradas = nuevas
+        self.results_text.yview_moveto(posicion)
+        
+    def cerrar(self):
+        """Cancelar el trabajo pendiente y cerrar la ventana"""
+        self.generacion += 1
+        # _enviar deja a lo sumo una tarea pendiente (cancel_futures requiere Python 3.9)
+        if self.tarea is not None:
+            self.tarea.cancel()
+        self.ejecutor.shutdown(wait=False)
+        self.root.destroy()
             
-        except Exception as e:
-            self.root.after(0, self._mostrar_error, str(e))
+    def _mostrar_comparacion(self, filas):
+        """Mostrar la tabla comparativa de alas"""
+        lineas = [
+            "",
+            "🔀 COMPARACIÓN DE ALAS",
+            "════════════════════════════════════════════════════════",
+            "",
+            f"📊 SPX: ${filas[0]['spx_valor']:,.2f}   VIX: {filas[0]['vix_valor']:.2f}%   "
+            f"Período: {filas[0]['periodo']}   Buffer: +{filas[0]['buffer']}",
+            "",
+            f"{'Ala':<5} {'Buy Put':<10} {'Sell Put':<10} {'Sell Call':<10} {'Buy Call':<10} {'Rango':<8}",
+            "-" * 60
+        ]
+        for fila in filas:
+            lineas.append(
+                f"{fila['ala']:<5} {fila['buy_put']:<10} {fila['sell_put']:<10} "
+                f"{fila['sell_call']:<10} {fila['buy_call']:<10} {fila['rango_profit']:<8}"
+            )
+        lineas += [
+            "",
+            "════════════════════════════════════════════════════════",
+            f"🕒 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        ]
+        
+        self._actualizar_texto("\n".join(lineas))
+        self.status_label.config(text=f"✅ Comparadas {len(filas)} alas")
             
     def _mostrar_resultados(self, resultado):
         """Mostrar los resultados en la interfaz"""
         try:
-            # Limpiar área de resultados
-            self.results_text.delete(1.0, tk.END)
-            
             # Formatear resultados
             output = self._formatear_resultado(resultado)
             
-            # Mostrar en el área de texto
-            self.results_text.insert(tk.END, output)
+            # Mostrar en el área de texto (solo cambian las líneas distintas)
+            self._actualizar_texto(output)
             
             # Actualizar status
             strikes = resultado['strikes']
@@ -253,6 +408,26 @@ class IronCondorGUI:
         params = resultado['parametros']
         strikes = resultado['strikes']
         resumen = resultado['resumen_estrategia']
+        valoracion = resultado.get('valoracion')
+        
+        # Fuente caída: último dato válido marcado con su antigüedad
+        aviso_respaldo = ""
+        if datos.get('respaldo'):
+            aviso_respaldo = f"\n   ⚠️ RESPALDO: fuente no disponible, dato de hace {datos['antiguedad_segundos']:.0f}s"
+        
+        # Profit/Loss con la prima estimada por Black-Scholes (si está disponible)
+        if valoracion:
+            pnl_texto = f"""   • Crédito neto estimado: {valoracion['credito_neto']:.2f} puntos
+   • Máxima ganancia: {valoracion['credito_neto']:.2f} puntos si SPX queda entre ${strikes['sell_put']:,} y ${strikes['sell_call']:,}
+   • Punto de equilibrio inferior: ${valoracion['breakeven_inferior']:,.2f}
+   • Punto de equilibrio superior: ${valoracion['breakeven_superior']:,.2f}
+   • Máxima pérdida: {valoracion['riesgo_maximo']:.2f} puntos
+   • Griegas: Δ {valoracion['delta']:+.4f} | Γ {valoracion['gamma']:+.4f} | Θ {valoracion['theta']:+.2f}/día | ν {valoracion['vega']:+.2f}"""
+        else:
+            pnl_texto = f"""   • Máxima ganancia: Si SPX queda entre ${strikes['sell_put']:,} y ${strikes['sell_call']:,}
+   • Punto de equilibrio inferior: ${strikes['sell_put']:,} - prima recibida
+   • Punto de equilibrio superior: ${strikes['sell_call']:,} + prima recibida
+   • Máxima pérdida: {strikes['ancho_ala']} puntos - prima recibida"""
         
         output = f"""
 🎯 IRON CONDOR SPX - RESULTADO CALCULADO
@@ -261,7 +436,7 @@ class IronCondorGUI:
 📊 DATOS DEL MERCADO:
    📈 SPX: ${datos['spx_valor']:,.2f}
    📉 VIX: {datos['vix_valor']:.2f}%
-   📅 Fecha: {datos['fecha_datos']}
+   📅 Fecha: {datos['fecha_datos']}{aviso_respaldo}
 
 ⚙️ PARÁMETROS UTILIZADOS:
    🔧 Ala elegida: {params['ala_elegida']} puntos
@@ -292,10 +467,7 @@ class IronCondorGUI:
    4. COMPRAR Call ${strikes['buy_call']:,}
 
 🎲 PROFIT/LOSS:
-   • Máxima ganancia: Si SPX queda entre ${strikes['sell_put']:,} y ${strikes['sell_call']:,}
-   • Punto de equilibrio inferior: ${strikes['sell_put']:,} + prima recibida
-   • Punto de equilibrio superior: ${strikes['sell_call']:,} - prima recibida
-   • Máxima pérdida: {strikes['ancho_ala']} puntos - prima recibida
+{pnl_texto}
 
 ════════════════════════════════════════════════════════
 ✅ Cálculo completado exitosamente
@@ -307,7 +479,6 @@ class IronCondorGUI:
         
     def _mostrar_error(self, error_msg):
         """Mostrar error en la interfaz"""
-        self.results_text.delete(1.0, tk.END)
         error_output = f"""
 ❌ ERROR EN EL CÁLCULO
 ════════════════════════════════════════════
@@ -329,7 +500,7 @@ class IronCondorGUI:
 🕒 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ════════════════════════════════════════════
         """
-        self.results_text.insert(tk.END, error_output)
+        self._actualizar_texto(error_output)
         self.status_label.config(text=f"❌ Error: {error_msg}")
         
         # Mostrar también un popup de error
@@ -8,21 +8,24 @@ Fecha: 2025-09-28
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 import time
 from agente_iron_condor_final import AgenteIronCondorSPX
+from diario_calculos import obtener_diario_compartido
+import metricas
+from metricas import medido
+from perfilado import perfilado
 
-# Importación robusta de plotly
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    st.warning("⚠️ Plotly no está disponible. Los gráficos se mostrarán con matplotlib.")
-    import matplotlib.pyplot as plt
-    import matplotlib.patches as patches
-    PLOTLY_AVAILABLE = False
+# pandas y plotly se importan al dibujar la primera tabla o gráfico: la página
+# inicial carga sin pagar su tiempo de importación
+
+def cargar_plotly():
+    """Importación robusta y diferida de plotly (None si no está disponible)"""
+    try:
+        import plotly.graph_objects as go
+        return go
+    except ImportError:
+        return None
 
 # Configuración de la página
 st.set_page_config(
@@ -69,11 +72,36 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
+@st.cache_resource  # Una sola instancia compartida por todas las sesiones
 def get_agente():
-    """Obtener instancia del agente (con cache)"""
-    return AgenteIronCondorSPX()
+    """Obtener instancia del agente (compartida, sin copias)"""
+    return AgenteIronCondorSPX(diario=obtener_diario_compartido())
+
+@st.cache_data(ttl=60, show_spinner=False)
+def obtener_snapshot(minuto):
+    """Cotizaciones del mercado (una descarga por minuto para todas las sesiones)"""
+    datos = get_agente().obtener_datos_mercado()
+    if not datos:
+        # Las excepciones no se cachean: el próximo intento vuelve a descargar
+        raise Exception("No se pudieron obtener datos del mercado")
+    return datos
+
+@st.cache_data(ttl=300, show_spinner=False)
+def calcular_iron_condor(datos_mercado, ala, periodo, buffer):
+    """Resultado del cálculo memoizado por (snapshot, ala, periodo, buffer)"""
+    return get_agente().ejecutar_calculo_completo(
+        ala=ala,
+        periodo=periodo,
+        buffer=buffer,
+        datos_mercado=datos_mercado
+    )
+
+@st.cache_data(ttl=300, show_spinner=False)
+def barrido_snapshot(datos_mercado, periodo):
+    """Barrido de alas y buffers memoizado por snapshot y período"""
+    return get_agente().barrido_parametros(periodos=[periodo], datos_mercado=datos_mercado)
 
+@medido('iron_condor_render_segundos', vista='pagina')
 def main():
     """Función principal de la aplicación web"""
     
@@ -114,6 +142,23 @@ def main():
         
         st.markdown("---")
         
+        # Modo en vivo
+        en_vivo = st.toggle(
+            "🔴 Modo en vivo",
+            value=False,
+            help="Consulta las cotizaciones periódicamente y actualiza strikes solo si cambian"
+        )
+        intervalo = st.number_input(
+            "⏲️ Intervalo de actualización (segundos)",
+            min_value=5,
+            max_value=300,
+            value=15,
+            step=5,
+            disabled=not en_vivo
+        )
+        
+        st.markdown("---")
+        
         # Información del período
         if periodo == "diario":
             st.info("📅 **Diario**: Movimiento esperado por día de trading (recomendado para Iron Condors)")
@@ -123,6 +168,11 @@ def main():
             st.info("📅 **Mensual**: Movimiento esperado por mes")
         else:
             st.info("📅 **Anual**: Movimiento esperado por año completo")
+        
+        # Métricas del proceso (solo con IRON_CONDOR_METRICAS=1)
+        if metricas.activo():
+            with st.expander("📈 Métricas (Prometheus)"):
+                st.code(metricas.exportar_prometheus() or "Sin datos todavía", language="text")
     
     # Columnas principales
     col1, col2 = st.columns([1, 1])
@@ -130,18 +180,18 @@ def main():
     with col1:
         st.subheader("📊 Cálculo del Iron Condor")
         
-        if st.button("🚀 CALCULAR IRON CONDOR", type="primary", use_container_width=True):
+        pulsado = st.button("🚀 CALCULAR IRON CONDOR", type="primary", use_container_width=True)
+        
+        # En modo en vivo el primer cálculo no espera al botón
+        if pulsado or (en_vivo and not st.session_state.get('calculado', False)):
             with st.spinner("🔄 Obteniendo datos del mercado y calculando..."):
                 try:
-                    # Obtener agente y calcular
-                    agente = get_agente()
-                    resultado = agente.ejecutar_calculo_completo(
-                        ala=ala,
-                        periodo=periodo,
-                        buffer=buffer
-                    )
+                    # Snapshot compartido del minuto actual y cálculo memoizado
+                    datos_mercado = obtener_snapshot(datetime.now().strftime('%Y-%m-%d %H:%M'))
+                    resultado = calcular_iron_condor(datos_mercado, ala, periodo, buffer)
                     
                     # Guardar en session state
+                    st.session_state['datos_mercado'] = datos_mercado
                     st.session_state['resultado'] = resultado
                     st.session_state['calculado'] = True
                     
@@ -150,6 +200,15 @@ def main():
                 except Exception as e:
                     st.error(f"❌ Error: {e}")
                     st.session_state['calculado'] = False
+        
+        elif st.session_state.get('calculado', False) and 'datos_mercado' in st.session_state:
+            # Cambio de parámetros: recalcular sobre el mismo snapshot, sin volver a descargar
+            try:
+                st.session_state['resultado'] = calcular_iron_condor(
+                    st.session_state['datos_mercado'], ala, periodo, buffer
+                )
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
     
     with col2:
         st.subheader("ℹ️ Información")
@@ -167,9 +226,11 @@ def main():
     
     # Mostrar resultados si están disponibles
     if st.session_state.get('calculado', False) and 'resultado' in st.session_state:
-        mostrar_resultados(st.session_state['resultado'])
+        mostrar_resultados(st.session_state['resultado'], intervalo_en_vivo=int(intervalo) if en_vivo else None)
 
-def mostrar_resultados(resultado):
+@perfilado('mostrar_resultados')
+@medido('iron_condor_render_segundos', vista='resultados')
+def mostrar_resultados(resultado, intervalo_en_vivo=None):
     """Mostrar los resultados del cálculo"""
     
     datos = resultado['datos_mercado']
@@ -180,6 +241,91 @@ def mostrar_resultados(resultado):
     st.markdown("---")
     st.header("📊 Resultados del Cálculo")
     
+    # Métricas y strikes: en modo en vivo se refrescan solos sin redibujar el resto
+    if intervalo_en_vivo:
+        panel = st.fragment(panel_en_vivo, run_every=intervalo_en_vivo)
+        panel(params['ala_elegida'], params['periodo_temporal'], params['buffer_agregado'], intervalo_en_vivo)
+    else:
+        mostrar_metricas_y_strikes(resultado)
+    
+    # Valoración Black-Scholes
+    crear_panel_valoracion(resultado)
+    
+    # Probabilidades (Monte Carlo)
+    crear_panel_probabilidades(resultado)
+    
+    # Gráfico visual
+    crear_grafico_iron_condor(datos, strikes)
+    
+    # Prueba de estrés SPX × VIX
+    crear_mapa_estres(resultado)
+    
+    # Análisis detallado
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Análisis de la Estrategia")
+        
+        st.markdown(f"""
+        **💰 Rango de Rentabilidad**: ${strikes['sell_put']:,} - ${strikes['sell_call']:,}
+        
+        **📐 Amplitud**: {strikes['rango_profit']} puntos
+        
+        **⬇️ Distancia a Sell Put**: {resumen['distancia_spx_sell_put']:.1f} puntos
+        
+        **⬆️ Distancia a Sell Call**: {resumen['distancia_spx_sell_call']:.1f} puntos
+        
+        **⚖️ Simetría**: {resumen['simetria']:.1f} puntos
+        """)
+    
+    with col2:
+        st.subheader("⚙️ Detalles del Cálculo")
+        
+        st.markdown(f"""
+        **🔧 Ala elegida**: {params['ala_elegida']} puntos
+        
+        **⏱️ Período**: {params['periodo_temporal']} (factor: √{params['factor_tiempo']})
+        
+        **📊 IV anualizado**: {params['iv_anualizado']:.2f} puntos
+        
+        **📊 IV ajustado**: {params['iv_ajustado_tiempo']:.2f} puntos
+        
+        **🛡️ Buffer**: +{params['buffer_agregado']} puntos
+        """)
+    
+    # Instrucciones de trading
+    st.markdown(f"""
+    <div class="success-box">
+        <h3>📋 Instrucciones de Trading</h3>
+        <ol>
+            <li><strong>VENDER</strong> Put ${strikes['sell_put']:,} (recibir prima)</li>
+            <li><strong>COMPRAR</strong> Put ${strikes['buy_put']:,} (pagar prima)</li>
+            <li><strong>VENDER</strong> Call ${strikes['sell_call']:,} (recibir prima)</li>
+            <li><strong>COMPRAR</strong> Call ${strikes['buy_call']:,} (pagar prima)</li>
+        </ol>
+        <p><strong>🎯 Objetivo</strong>: Que el SPX se mantenga entre ${strikes['sell_put']:,} y ${strikes['sell_call']:,} al vencimiento.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Tabla resumen
+    crear_tabla_resumen(resultado)
+    
+    # Comparación de configuraciones sobre el mismo snapshot
+    crear_tabla_comparativa(resultado)
+
+@medido('iron_condor_render_segundos', vista='metricas_strikes')
+def mostrar_metricas_y_strikes(resultado):
+    """Mostrar métricas del mercado y los cuatro strikes"""
+    
+    datos = resultado['datos_mercado']
+    params = resultado['parametros']
+    strikes = resultado['strikes']
+    
+    # Fuente caída: se muestra el último dato válido con su antigüedad
+    if datos.get('respaldo'):
+        st.warning(f"⚠️ Fuente de datos no disponible ({datos['error_fuente']}). Mostrando el último dato "
+                   f"válido del {datos['fecha_datos']} (hace {datos['antiguedad_segundos']:.0f}s).")
+    
     # Datos del mercado
     col1, col2, col3, col4 = st.columns(4)
     
@@ -251,60 +397,206 @@ def mostrar_resultados(resultado):
             <p>COMPRAR</p>
         </div>
         """, unsafe_allow_html=True)
+
+def firma_resultado(resultado):
+    """Strikes del condor: si no cambian alcanza con redibujar el fragmento"""
+    strikes = resultado['strikes']
+    return tuple(strikes[k] for k in ('buy_put', 'sell_put', 'sell_call', 'buy_call'))
+
+@medido('iron_condor_render_segundos', vista='en_vivo')
+def panel_en_vivo(ala, periodo, buffer, intervalo):
+    """Fragmento que consulta el cache de cotizaciones cada 'intervalo' segundos"""
+    
+    resultado = st.session_state['resultado']
+    try:
+        # Todas las sesiones con el mismo intervalo comparten la misma descarga
+        datos_mercado = obtener_snapshot(f"{intervalo}s:{int(time.time() // intervalo)}")
+        nuevo = calcular_iron_condor(datos_mercado, ala, periodo, buffer)
+    except Exception as e:
+        st.warning(f"⚠️ Sin actualización: {e}")
+    else:
+        st.session_state['datos_mercado'] = datos_mercado
+        st.session_state['resultado'] = nuevo
+        if firma_resultado(nuevo) != firma_resultado(resultado):
+            # Cambiaron los strikes: redibujar también gráfico y tablas
+            st.rerun()
+        resultado = nuevo
+    
+    mostrar_metricas_y_strikes(resultado)
+    st.caption(f"🔴 En vivo: consulta cada {intervalo}s · "
+               f"datos del {resultado['datos_mercado']['fecha_datos']}")
+
+@medido('iron_condor_render_segundos', vista='valoracion')
+def crear_panel_valoracion(resultado):
+    """Mostrar crédito, riesgo, breakevens y griegas del condor"""
     
-    # Gráfico visual
-    crear_grafico_iron_condor(datos, strikes)
+    valoracion = resultado.get('valoracion')
+    if not valoracion:
+        return
     
-    # Análisis detallado
-    col1, col2 = st.columns(2)
+    st.subheader("💵 Valoración Black-Scholes")
+    
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.subheader("📊 Análisis de la Estrategia")
-        
-        st.markdown(f"""
-        **💰 Rango de Rentabilidad**: ${strikes['sell_put']:,} - ${strikes['sell_call']:,}
-        
-        **📐 Amplitud**: {strikes['rango_profit']} puntos
-        
-        **⬇️ Distancia a Sell Put**: {resumen['distancia_spx_sell_put']:.1f} puntos
-        
-        **⬆️ Distancia a Sell Call**: {resumen['distancia_spx_sell_call']:.1f} puntos
-        
-        **⚖️ Simetría**: {resumen['simetria']:.1f} puntos
-        """)
+        st.metric(
+            label="💰 Crédito Neto",
+            value=f"{valoracion['credito_neto']:.2f} pts",
+            help="Prima neta teórica recibida (VIX como volatilidad implícita)"
+        )
     
     with col2:
-        st.subheader("⚙️ Detalles del Cálculo")
-        
-        st.markdown(f"""
-        **🔧 Ala elegida**: {params['ala_elegida']} puntos
-        
-        **⏱️ Período**: {params['periodo_temporal']} (factor: √{params['factor_tiempo']})
-        
-        **📊 IV anualizado**: {params['iv_anualizado']:.2f} puntos
-        
-        **📊 IV ajustado**: {params['iv_ajustado_tiempo']:.2f} puntos
-        
-        **🛡️ Buffer**: +{params['buffer_agregado']} puntos
-        """)
+        st.metric(
+            label="🚨 Riesgo Máximo",
+            value=f"{valoracion['riesgo_maximo']:.2f} pts",
+            help="Ancho del ala menos el crédito recibido"
+        )
     
-    # Instrucciones de trading
-    st.markdown(f"""
-    <div class="success-box">
-        <h3>📋 Instrucciones de Trading</h3>
-        <ol>
-            <li><strong>VENDER</strong> Put ${strikes['sell_put']:,} (recibir prima)</li>
-            <li><strong>COMPRAR</strong> Put ${strikes['buy_put']:,} (pagar prima)</li>
-            <li><strong>VENDER</strong> Call ${strikes['sell_call']:,} (recibir prima)</li>
-            <li><strong>COMPRAR</strong> Call ${strikes['buy_call']:,} (pagar prima)</li>
-        </ol>
-        <p><strong>🎯 Objetivo</strong>: Que el SPX se mantenga entre ${strikes['sell_put']:,} y ${strikes['sell_call']:,} al vencimiento.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    with col3:
+        st.metric(
+            label="↔️ Breakevens",
+            value=f"{valoracion['breakeven_inferior']:,.0f} - {valoracion['breakeven_superior']:,.0f}",
+            help="Puntos de equilibrio al vencimiento"
+        )
     
-    # Tabla resumen
-    crear_tabla_resumen(resultado)
+    with col4:
+        st.metric(
+            label="⚖️ Crédito / Riesgo",
+            value=f"{valoracion['ratio_credito_riesgo']:.1%}"
+        )
+    
+    st.caption(
+        f"Δ {valoracion['delta']:+.4f} | Γ {valoracion['gamma']:+.4f} | "
+        f"Θ {valoracion['theta']:+.2f} pts/día | ν {valoracion['vega']:+.2f} pts/punto de vol"
+    )
 
+@st.cache_data(ttl=300)
+def estimar_probabilidades(spx_valor, vix_valor, strikes_condor, periodo, fecha_objetivo, credito):
+    """Simulación Monte Carlo del condor (cacheada por snapshot, strikes y crédito)"""
+    from montecarlo_iron_condor import resolucion_por_presupuesto, simular_iron_condor
+    from motor_vectorizado import dias_horizonte
+    
+    # Horizontes largos: menos pasos intradía y trayectorias para no bloquear la página
+    pasos_por_dia, trayectorias = resolucion_por_presupuesto(
+        dias_horizonte(periodo, fecha_objetivo), 200_000, presupuesto=10_000_000
+    )
+    buy_put, sell_put, sell_call, buy_call = strikes_condor
+    return simular_iron_condor(
+        spx_valor, vix_valor,
+        {'buy_put': buy_put, 'sell_put': sell_put, 'sell_call': sell_call, 'buy_call': buy_call},
+        periodo=periodo,
+        fecha_objetivo=fecha_objetivo,
+        n_trayectorias=trayectorias,
+        credito=credito,
+        pasos_por_dia=pasos_por_dia,
+        semilla=0
+    )
+
+@medido('iron_condor_render_segundos', vista='probabilidades')
+def crear_panel_probabilidades(resultado):
+    """Mostrar probabilidad de ganancia y de toque de los strikes vendidos"""
+    
+    datos = resultado['datos_mercado']
+    strikes = resultado['strikes']
+    
+    st.subheader("🎲 Probabilidades (Monte Carlo)")
+    
+    prob = estimar_probabilidades(
+        datos['spx_valor'],
+        datos['vix_valor'],
+        (strikes['buy_put'], strikes['sell_put'], strikes['sell_call'], strikes['buy_call']),
+        resultado['parametros']['periodo_temporal'],
+        datos['fecha_objetivo'],
+        (resultado.get('valoracion') or {}).get('credito_neto', 0.0)
+    )
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="💰 Prob. Ganancia",
+            value=f"{prob['prob_ganancia']:.1%}",
+            help="Probabilidad de que el SPX termine entre los breakevens (prima incluida)"
+        )
+    
+    with col2:
+        st.metric(
+            label="⚠️ Prob. Toque",
+            value=f"{prob['prob_toque']:.1%}",
+            help="Probabilidad de tocar algún strike vendido antes del vencimiento"
+        )
+    
+    with col3:
+        st.metric(
+            label="📉 Prob. Pérdida Máx.",
+            value=f"{prob['prob_perdida_maxima']:.1%}",
+            help="Probabilidad de terminar fuera de los strikes comprados"
+        )
+    
+    with col4:
+        st.metric(
+            label="📊 P&L Esperado",
+            value=f"{prob['pnl_esperado']:.1f} pts",
+            help="P&L esperado al vencimiento, incluida la prima recibida"
+        )
+    
+    st.caption(f"🔢 {prob['trayectorias']:,} trayectorias lognormales con VIX como volatilidad, "
+               f"horizonte de {prob['dias_horizonte']} día(s)")
+
+@st.cache_resource(max_entries=64)
+def construir_figura_condor(spx_actual, strikes_condor):
+    """Figura plotly del condor, compartida entre sesiones con los mismos strikes"""
+    
+    go = cargar_plotly()
+    buy_put, sell_put, sell_call, buy_call = strikes_condor
+    fig = go.Figure()
+    
+    # Línea vertical del SPX actual
+    fig.add_vline(
+        x=spx_actual, 
+        line_dash="dash", 
+        line_color="blue",
+        annotation_text=f"SPX Actual: ${spx_actual:,.0f}"
+    )
+    
+    # Strikes
+    strikes_data = [
+        (buy_put, "Buy Put", "red"),
+        (sell_put, "Sell Put", "green"),
+        (sell_call, "Sell Call", "green"),
+        (buy_call, "Buy Call", "red")
+    ]
+    
+    for strike, label, color in strikes_data:
+        fig.add_vline(
+            x=strike,
+            line_color=color,
+            annotation_text=f"{label}: ${strike:,}",
+            annotation_position="top"
+        )
+    
+    # Zona de rentabilidad
+    fig.add_vrect(
+        x0=sell_put,
+        x1=sell_call,
+        fillcolor="green",
+        opacity=0.2,
+        annotation_text="Zona de Ganancia",
+        annotation_position="inside top"
+    )
+    
+    fig.update_layout(
+        title="Iron Condor - Distribución de Strikes",
+        xaxis_title="Precio del SPX",
+        yaxis_title="P&L",
+        height=400,
+        showlegend=False
+    )
+    
+    return fig
+
+@perfilado('crear_grafico_iron_condor')
+@medido('iron_condor_render_segundos', vista='grafico')
 def crear_grafico_iron_condor(datos, strikes):
     """Crear gráfico visual del Iron Condor"""
     
@@ -315,56 +607,20 @@ def crear_grafico_iron_condor(datos, strikes):
     rango_inferior = strikes['buy_put'] - 50
     rango_superior = strikes['buy_call'] + 50
     
-    if PLOTLY_AVAILABLE:
-        # Versión con Plotly
-        fig = go.Figure()
-        
-        # Línea vertical del SPX actual
-        fig.add_vline(
-            x=spx_actual, 
-            line_dash="dash", 
-            line_color="blue",
-            annotation_text=f"SPX Actual: ${spx_actual:,.0f}"
-        )
-        
-        # Strikes
-        strikes_data = [
-            (strikes['buy_put'], "Buy Put", "red"),
-            (strikes['sell_put'], "Sell Put", "green"),
-            (strikes['sell_call'], "Sell Call", "green"),
-            (strikes['buy_call'], "Buy Call", "red")
-        ]
-        
-        for strike, label, color in strikes_data:
-            fig.add_vline(
-                x=strike,
-                line_color=color,
-                annotation_text=f"{label}: ${strike:,}",
-                annotation_position="top"
-            )
-        
-        # Zona de rentabilidad
-        fig.add_vrect(
-            x0=strikes['sell_put'],
-            x1=strikes['sell_call'],
-            fillcolor="green",
-            opacity=0.2,
-            annotation_text="Zona de Ganancia",
-            annotation_position="inside top"
-        )
-        
-        fig.update_layout(
-            title="Iron Condor - Distribución de Strikes",
-            xaxis_title="Precio del SPX",
-            yaxis_title="P&L",
-            height=400,
-            showlegend=False
+    if cargar_plotly() is not None:
+        # Versión con Plotly (la figura solo se reconstruye si cambian SPX redondeado o strikes)
+        fig = construir_figura_condor(
+            round(spx_actual),
+            (strikes['buy_put'], strikes['sell_put'], strikes['sell_call'], strikes['buy_call'])
         )
         
         st.plotly_chart(fig, use_container_width=True)
         
     else:
-        # Versión alternativa con matplotlib y datos tabulares
+        # Versión alternativa con datos tabulares
+        import pandas as pd
+        
+        st.warning("⚠️ Plotly no está disponible. Los gráficos se mostrarán como tablas.")
         st.write("**Iron Condor - Distribución de Strikes**")
         
         # Crear tabla visual de los strikes
@@ -412,8 +668,111 @@ def crear_grafico_iron_condor(datos, strikes):
         df_ranges = pd.DataFrame(ranges_data)
         st.dataframe(df_ranges, use_container_width=True)
 
+@st.cache_data(ttl=300, show_spinner=False)
+def calcular_malla_estres(spx_valor, vix_valor, strikes_condor, periodo, fecha_objetivo, rango_spot, rango_vol):
+    """Malla de P&L SPX × VIX (una evaluación vectorizada, cacheada por snapshot y strikes)"""
+    from prueba_estres import malla_estres
+    from valoracion_black_scholes import tiempo_vencimiento
+    
+    buy_put, sell_put, sell_call, buy_call = strikes_condor
+    return malla_estres(
+        spx_valor, vix_valor,
+        {'buy_put': buy_put, 'sell_put': sell_put, 'sell_call': sell_call, 'buy_call': buy_call},
+        tiempo_vencimiento(periodo, fecha_objetivo),
+        rango_spot=rango_spot / 100,
+        rango_vol=rango_vol
+    )
+
+@st.cache_resource(max_entries=16)
+def construir_mapa_estres(spx_valor, vix_valor, strikes_condor, periodo, fecha_objetivo, rango_spot, rango_vol):
+    """Figura plotly del mapa de calor, compartida entre sesiones con los mismos parámetros"""
+    
+    go = cargar_plotly()
+    malla = calcular_malla_estres(spx_valor, vix_valor, strikes_condor, periodo, fecha_objetivo,
+                                  rango_spot, rango_vol)
+    
+    # float32 con 2 decimales: la mitad de datos a serializar por cada re-ejecución
+    fig = go.Figure(go.Heatmap(
+        x=malla['spot'].round(2),
+        y=malla['vix'].round(2),
+        z=malla['pnl'].round(2).astype('float32'),
+        colorscale='RdYlGn',
+        zmid=0,
+        colorbar={'title': 'P&L (pts)'},
+        hovertemplate="SPX %{x:,.0f}<br>VIX %{y:.1f}<br>P&L %{z:+.2f} pts<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=[spx_valor], y=[vix_valor], mode='markers',
+        marker={'symbol': 'x', 'size': 12, 'color': 'black'}, name='Actual', hoverinfo='skip'
+    ))
+    for strike in (strikes_condor[1], strikes_condor[2]):
+        fig.add_vline(x=strike, line_dash="dot", line_color="black")
+    fig.update_layout(
+        xaxis_title="Precio del SPX",
+        yaxis_title="VIX",
+        height=450,
+        showlegend=False
+    )
+    
+    return fig
+
+@medido('iron_condor_render_segundos', vista='estres')
+def crear_mapa_estres(resultado):
+    """Mapa de calor del P&L del condor ante choques del SPX y del VIX"""
+    
+    datos = resultado['datos_mercado']
+    strikes = resultado['strikes']
+    
+    st.subheader("🌡️ Prueba de Estrés (SPX × VIX)")
+    
+    # La malla y su figura solo se calculan si se piden: los demás redibujados no las pagan
+    if not st.toggle("Mostrar mapa de calor", key="estres_visible",
+                     help="Calcula el P&L del condor en una malla de choques del SPX y del VIX"):
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        rango_spot = st.slider("📉 Choque del SPX (±%)", min_value=1, max_value=20, value=5, key="estres_spot")
+    with col2:
+        rango_vol = st.slider("⚡ Choque del VIX (puntos)", min_value=-15, max_value=40, value=(-8, 12),
+                              key="estres_vol")
+    
+    escenario = (
+        datos['spx_valor'],
+        datos['vix_valor'],
+        (strikes['buy_put'], strikes['sell_put'], strikes['sell_call'], strikes['buy_call']),
+        resultado['parametros']['periodo_temporal'],
+        datos['fecha_objetivo'],
+        rango_spot,
+        tuple(float(v) for v in rango_vol)
+    )
+    malla = calcular_malla_estres(*escenario)
+    
+    if cargar_plotly() is not None:
+        # La figura solo se reconstruye si cambian snapshot, strikes o rangos
+        st.plotly_chart(construir_mapa_estres(*escenario), use_container_width=True)
+    else:
+        # Sin plotly: tabla reducida de la malla
+        import pandas as pd
+        
+        filas = range(0, len(malla['vix']), max(1, len(malla['vix']) // 8))
+        columnas = range(0, len(malla['spot']), max(1, len(malla['spot']) // 8))
+        tabla = pd.DataFrame(
+            [[round(float(malla['pnl'][i, j]), 2) for j in columnas] for i in filas],
+            index=[f"VIX {malla['vix'][i]:.1f}" for i in filas],
+            columns=[f"{malla['choques_spot'][j]:+.1%}" for j in columnas]
+        )
+        st.dataframe(tabla, use_container_width=True)
+    
+    st.caption(
+        f"P&L en puntos al cerrar ahora el condor tras el choque (crédito inicial "
+        f"{malla['credito_inicial']:.2f} pts), {malla['pnl'].shape[1]}×{malla['pnl'].shape[0]} escenarios"
+    )
+
+@medido('iron_condor_render_segundos', vista='tabla_resumen')
 def crear_tabla_resumen(resultado):
     """Crear tabla resumen de resultados"""
+    import pandas as pd
     
     st.subheader("📋 Resumen Completo")
     
@@ -470,6 +829,23 @@ def crear_tabla_resumen(resultado):
     # Timestamp
     st.caption(f"🕒 Calculado el {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+@medido('iron_condor_render_segundos', vista='tabla_comparativa')
+def crear_tabla_comparativa(resultado):
+    """Comparar todas las alas y buffers con los mismos datos del mercado"""
+    import pandas as pd
+    
+    params = resultado['parametros']
+    
+    with st.expander("🔀 Comparar alas y buffers (mismo snapshot)"):
+        filas = barrido_snapshot(resultado['datos_mercado'], params['periodo_temporal'])
+        
+        df = pd.DataFrame(filas)[
+            ['ala', 'buffer', 'iv_final', 'buy_put', 'sell_put', 'sell_call', 'buy_call', 'rango_profit']
+        ]
+        df.columns = ['Ala', 'Buffer', 'IV Final', 'Buy Put', 'Sell Put', 'Sell Call', 'Buy Call', 'Rango']
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        st.caption(f"📊 {len(df)} combinaciones para el período {params['periodo_temporal']}")
+
 # Inicializar session state
 if 'calculado' not in st.session_state:
     st.session_state['calculado'] = False
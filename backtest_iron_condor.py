@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Backtest - Iron Condor SPX
+Evalúa históricamente la regla de strikes del agente (SPX ± movimiento VIX + buffer,
+redondeado a múltiplos de 5) para todas las combinaciones de ala, período y buffer
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import csv
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from motor_vectorizado import DIAS_TRADING_ANIO, PERIODOS_DISPONIBLES, calcular_strikes_lote
+from valoracion_black_scholes import valorar_iron_condor
+
+ALAS_DEFAULT = [10, 15, 20, 25]
+BUFFERS_DEFAULT = list(range(0, 51, 5))
+MAX_CELDAS_BLOQUE = 4_000_000  # Límite de memoria por bloque (configs × días)
+
+# Histórico cargado en cada proceso del pool (se envía una sola vez)
+_historico_proceso = None
+
+
+def cargar_historico(ruta: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Carga el histórico diario de SPX/VIX en columnas NumPy
+
+    Args:
+        ruta: CSV/Parquet con columnas 'fecha', 'spx', 'vix'
+              (None = descargar todo el histórico de Yahoo Finance)
+
+    Returns:
+        Dict con 'fechas', 'spx' y 'vix' ordenados por fecha
+    """
+    if ruta is None:
+        import yfinance as yf
+
+        datos = yf.download(['^GSPC', '^VIX'], period='max', progress=False)['Close'].dropna()
+        fechas = datos.index.strftime('%Y-%m-%d').to_numpy()
+        spx = datos['^GSPC'].to_numpy(dtype=np.float64)
+        vix = datos['^VIX'].to_numpy(dtype=np.float64)
+    elif ruta.endswith('.parquet'):
+        import pandas as pd
+
+        tabla = pd.read_parquet(ruta)
+        tabla.columns = [str(c).lower() for c in tabla.columns]
+        fechas = tabla['fecha'].astype(str).to_numpy()
+        spx = tabla['spx'].to_numpy(dtype=np.float64)
+        vix = tabla['vix'].to_numpy(dtype=np.float64)
+    else:
+        with open(ruta, newline='') as archivo:
+            lector = csv.DictReader(archivo)
+            filas = [{k.lower(): v for k, v in fila.items()} for fila in lector]
+        fechas = np.array([f['fecha'] for f in filas])
+        spx = np.array([float(f['spx']) for f in filas])
+        vix = np.array([float(f['vix']) for f in filas])
+
+    orden = np.argsort(fechas, kind='stable')
+    return {
+        'fechas': fechas[orden].astype('datetime64[D]'),
+        'spx': np.round(spx[orden], 2),
+        'vix': np.round(vix[orden], 2)
+    }
+
+
+def horizonte_dias(periodo: str) -> int:
+    """
+    Días de trading hasta el vencimiento implícito en el período
+    """
+    return max(1, round(DIAS_TRADING_ANIO / PERIODOS_DISPONIBLES[periodo]))
+
+
+def pnl_vencimiento(spx_final: np.ndarray, buy_put, sell_put, sell_call, buy_call,
+                    credito=0.0) -> np.ndarray:
+    """
+    P&L neto al vencimiento en puntos: crédito recibido menos el valor de liquidación
+    """
+    perdida_puts = np.maximum(sell_put - spx_final, 0) - np.maximum(buy_put - spx_final, 0)
+    perdida_calls = np.maximum(spx_final - sell_call, 0) - np.maximum(spx_final - buy_call, 0)
+    return credito - (perdida_puts + perdida_calls)
+
+
+def evaluar_configuraciones(historico: Dict[str, np.ndarray], periodo: str,
+                            alas: np.ndarray, buffers: np.ndarray) -> List[Dict]:
+    """
+    Evalúa un bloque de configuraciones (pares ala/buffer) de un mismo período
+
+    Cada fila de la matriz es una configuración y cada columna un día de entrada.
+    El crédito de entrada se valora con Black-Scholes usando el VIX como volatilidad.
+    """
+    h = horizonte_dias(periodo)
+    spx = historico['spx']
+    if len(spx) <= h:
+        return []
+
+    spx_entrada = spx[:-h]
+    vix_entrada = historico['vix'][:-h]
+    spx_final = spx[h:]
+    tiempo = h / DIAS_TRADING_ANIO
+
+    alas = np.asarray(alas)
+    buffers = np.asarray(buffers)
+    resultados = []
+    filas_bloque = max(1, MAX_CELDAS_BLOQUE // len(spx_entrada))
+
+    for inicio in range(0, len(alas), filas_bloque):
+        a = alas[inicio:inicio + filas_bloque, None]
+        b = buffers[inicio:inicio + filas_bloque, None]
+
+        strikes = calcular_strikes_lote(spx_entrada[None, :], vix_entrada[None, :], a, periodo, b)
+        sell_put, sell_call = strikes['sell_put'], strikes['sell_call']
+        buy_put, buy_call = strikes['buy_put'], strikes['buy_call']
+
+        ruptura_put = spx_final < sell_put
+        ruptura_call = spx_final > sell_call
+        perdida_maxima = (spx_final <= buy_put) | (spx_final >= buy_call)
+        credito = valorar_iron_condor(spx_entrada, buy_put, sell_put, sell_call, buy_call,
+                                      vix_entrada / 100, tiempo)['credito_neto']
+        pnl = pnl_vencimiento(spx_final, buy_put, sell_put, sell_call, buy_call, credito)
+
+        operaciones = spx_entrada.size
+        for i in range(a.shape[0]):
+            resultados.append({
+                'ala': int(a[i, 0]),
+                'periodo': periodo,
+                'buffer': int(b[i, 0]),
+                'horizonte_dias': h,
+                'operaciones': operaciones,
+                'tasa_ruptura': float((ruptura_put[i] | ruptura_call[i]).mean()),
+                'tasa_ruptura_put': float(ruptura_put[i].mean()),
+                'tasa_ruptura_call': float(ruptura_call[i].mean()),
+                'frecuencia_perdida_maxima': float(perdida_maxima[i].mean()),
+                'credito_medio': float(credito[i].mean()),
+                'pnl_medio': float(pnl[i].mean()) + 0.0,
+                'pnl_peor': float(pnl[i].min()) + 0.0,
+                'pnl_total': float(pnl[i].sum()) + 0.0
+            })
+
+    return resultados
+
+
+def _inicializar_proceso(historico: Dict[str, np.ndarray]):
+    global _historico_proceso
+    _historico_proceso = historico
+
+
+def _evaluar_en_proceso(tarea):
+    periodo, alas, buffers = tarea
+    return evaluar_configuraciones(_historico_proceso, periodo, alas, buffers)
+
+
+def ejecutar_backtest(historico: Dict[str, np.ndarray], alas: Optional[List[int]] = None,
+                      periodos: Optional[List[str]] = None, buffers: Optional[List[int]] = None,
+                      procesos: int = 1, configs_por_tarea: int = 64) -> List[Dict]:
+    """
+    Ejecuta el backtest de toda la malla alas × períodos × buffers
+
+    Args:
+        historico: Resultado de cargar_historico
+        alas: Anchos de ala
+        periodos: Períodos a evaluar
+        buffers: Buffers en puntos
+        procesos: Número de procesos (1 = todo en el proceso actual)
+        configs_por_tarea: Configuraciones por tarea enviada al pool
+
+    Returns:
+        Lista de filas con métricas por configuración
+    """
+    alas = ALAS_DEFAULT if alas is None else alas
+    periodos = list(PERIODOS_DISPONIBLES) if periodos is None else periodos
+    buffers = BUFFERS_DEFAULT if buffers is None else buffers
+
+    malla_alas, malla_buffers = np.meshgrid(np.array(alas), np.array(buffers), indexing='ij')
+    malla_alas, malla_buffers = malla_alas.ravel(), malla_buffers.ravel()
+
+    if procesos <= 1:
+        resultados = []
+        for periodo in periodos:
+            resultados.extend(evaluar_configuraciones(historico, periodo, malla_alas, malla_buffers))
+        return resultados
+
+    tareas = [
+        (periodo, malla_alas[i:i + configs_por_tarea], malla_buffers[i:i + configs_por_tarea])
+        for periodo in periodos
+        for i in range(0, malla_alas.size, configs_por_tarea)
+    ]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso,
+                             initargs=(historico,)) as pool:
+        return [fila for bloque in pool.map(_evaluar_en_proceso, tareas) for fila in bloque]
+
+
+def mostrar_resultados(resultados: List[Dict], historico: Dict[str, np.ndarray], limite: int = 20):
+    """
+    Muestra las configuraciones con mayor P&L neto medio
+    """
+    print("\n" + "="*100)
+    print("📊 BACKTEST IRON CONDOR SPX")
+    print("="*100)
+    print(f"📅 Histórico: {historico['fechas'][0]} → {historico['fechas'][-1]} "
+          f"({len(historico['spx'])} sesiones)")
+    print(f"🔧 Configuraciones evaluadas: {len(resultados)}")
+
+    print(f"\n{'Ala':<5} {'Período':<9} {'Buffer':<7} {'Ops':<7} {'Ruptura':<9} "
+          f"{'Pérd.Máx':<9} {'Crédito':<9} {'P&L medio':<10} {'P&L peor':<9}")
+    print("-" * 100)
+
+    for fila in sorted(resultados, key=lambda f: (-f['pnl_medio'], f['tasa_ruptura']))[:limite]:
+        print(f"{fila['ala']:<5} {fila['periodo']:<9} {fila['buffer']:<7} {fila['operaciones']:<7} "
+              f"{fila['tasa_ruptura']:<9.2%} {fila['frecuencia_perdida_maxima']:<9.2%} "
+              f"{fila['credito_medio']:<9.2f} {fila['pnl_medio']:<10.2f} {fila['pnl_peor']:<9.1f}")
+
+    print("\n💡 P&L neto en puntos al vencimiento: crédito Black-Scholes (vol = VIX) menos liquidación")
+
+
+def main():
+    """
+    Función principal del backtest por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Backtest de la regla de strikes del Iron Condor SPX")
+    parser.add_argument('--historico', help="CSV/Parquet con columnas fecha, spx, vix (por defecto Yahoo Finance)")
+    parser.add_argument('--alas', type=int, nargs='+', default=ALAS_DEFAULT)
+    parser.add_argument('--periodos', nargs='+', default=list(PERIODOS_DISPONIBLES))
+    parser.add_argument('--buffers', type=int, nargs='+', default=BUFFERS_DEFAULT)
+    parser.add_argument('--procesos', type=int, default=1, help="Procesos en paralelo")
+    parser.add_argument('--salida', help="Guardar todas las filas en un CSV")
+    args = parser.parse_args()
+
+    try:
+        inicio = time.perf_counter()
+        historico = cargar_historico(args.historico)
+        carga = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultados = ejecutar_backtest(historico, args.alas, args.periodos, args.buffers, args.procesos)
+        calculo = time.perf_counter() - inicio
+
+        mostrar_resultados(resultados, historico)
+        print(f"⏱️ Carga: {carga:.2f}s | Cálculo: {calculo:.2f}s")
+
+        if args.salida:
+            with open(args.salida, 'w', newline='') as archivo:
+                escritor = csv.DictWriter(archivo, fieldnames=list(resultados[0].keys()))
+                escritor.writeheader()
+                escritor.writerows(resultados)
+            print(f"💾 Resultados guardados en {args.salida}")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
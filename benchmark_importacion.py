@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Importación - Iron Condor SPX
+Mide el tiempo de arranque (importación) de cada punto de entrada en un
+intérprete nuevo y qué dependencias pesadas carga cada uno
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Módulos que se pueden importar sin abrir ventanas ni lanzar cálculos
+PUNTOS_ENTRADA = [
+    'agente_iron_condor_final',
+    'agente_iron_condor_final_simple',
+    'guia_rapida',
+    'demo_interactivo',
+    'servidor_api',
+    'backtest_iron_condor',
+    'montecarlo_iron_condor',
+    'escaner_condores',
+    'app_iron_condor_gui',
+    'app_iron_condor_web'
+]
+
+# Dependencias cuyo costo de importación interesa vigilar
+DEPENDENCIAS_PESADAS = ['numpy', 'pandas', 'yfinance', 'scipy', 'plotly', 'matplotlib', 'streamlit', 'tkinter']
+
+_LINEA_IMPORTTIME = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def medir_importacion(modulo: str, repeticiones: int = 5, directorio: Optional[str] = None) -> Dict:
+    """
+    Importa el módulo en un intérprete nuevo varias veces con -X importtime
+
+    Args:
+        modulo: Nombre del módulo a importar
+        repeticiones: Número de intérpretes lanzados (se informa la mediana y el mínimo)
+        directorio: Carpeta del proyecto (por defecto la de este archivo)
+
+    Returns:
+        Dict con tiempos en ms, dependencias pesadas cargadas y las importaciones más costosas
+    """
+    directorio = directorio or os.path.dirname(os.path.abspath(__file__))
+    codigo = (
+        f"import sys; import {modulo}; "
+        f"print('PESADAS=' + ','.join(m for m in {DEPENDENCIAS_PESADAS!r} if m in sys.modules))"
+    )
+    entorno = dict(os.environ, PYTHONPATH=directorio)
+
+    tiempos = []
+    pesadas = []
+    costosas = {}
+    for _ in range(repeticiones):
+        proceso = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', codigo],
+            cwd=directorio, env=entorno, capture_output=True, text=True
+        )
+        if proceso.returncode != 0:
+            ultima = proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else 'error'
+            return {'modulo': modulo, 'error': ultima}
+
+        total_us = None
+        hijos = {}
+        for linea in proceso.stderr.splitlines():
+            coincidencia = _LINEA_IMPORTTIME.match(linea)
+            if not coincidencia:
+                continue
+            acumulado, sangria, nombre = int(coincidencia.group(2)), coincidencia.group(3), coincidencia.group(4)
+
+            # -X importtime lista los hijos antes que su padre, con 2 espacios más de sangría
+            if len(sangria) == 3:
+                hijos[nombre] = acumulado
+            elif len(sangria) == 1:
+                if nombre == modulo:
+                    total_us = acumulado
+                    for hijo, us in hijos.items():
+                        costosas[hijo] = max(costosas.get(hijo, 0), us)
+                hijos = {}
+
+        if total_us is None:
+            # Ya importado durante el arranque del intérprete
+            total_us = 0
+        tiempos.append(total_us / 1000)
+        for linea in proceso.stdout.splitlines():
+            if linea.startswith('PESADAS='):
+                pesadas = [m for m in linea[len('PESADAS='):].split(',') if m]
+
+    principales = sorted(costosas.items(), key=lambda par: par[1], reverse=True)[:5]
+    return {
+        'modulo': modulo,
+        'mediana_ms': round(statistics.median(tiempos), 1),
+        'minimo_ms': round(min(tiempos), 1),
+        'dependencias_pesadas': pesadas,
+        'mas_costosas': [(nombre, round(us / 1000, 1)) for nombre, us in principales]
+    }
+
+
+def medir_todos(modulos: List[str], repeticiones: int = 5) -> List[Dict]:
+    """
+    Mide cada punto de entrada
+    """
+    return [medir_importacion(m, repeticiones) for m in modulos]
+
+
+def main():
+    """
+    Función principal del benchmark por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Tiempo de importación de cada punto de entrada")
+    parser.add_argument('modulos', nargs='*', default=PUNTOS_ENTRADA)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--salida', help="Guardar los resultados en JSON")
+    parser.add_argument('--limite-ms', type=float,
+                        help="Termina con código 1 si algún módulo supera este tiempo (mediana)")
+    args = parser.parse_args()
+
+    resultados = medir_todos(args.modulos, args.repeticiones)
+
+    print("\n" + "="*100)
+    print("⏱️ TIEMPO DE IMPORTACIÓN POR PUNTO DE ENTRADA")
+    print("="*100)
+    print(f"{'Módulo':<34} {'Mediana':>9} {'Mínimo':>9}  Dependencias pesadas")
+    print("-"*100)
+    for r in resultados:
+        if 'error' in r:
+            print(f"{r['modulo']:<34} {'—':>9} {'—':>9}  ❌ {r['error']}")
+            continue
+        print(f"{r['modulo']:<34} {r['mediana_ms']:>7.1f}ms {r['minimo_ms']:>7.1f}ms  "
+              f"{', '.join(r['dependencias_pesadas']) or '-'}")
+        print(f"{'':<34} {'':>9} {'':>9}  ↳ {', '.join(f'{n} {ms}ms' for n, ms in r['mas_costosas'])}")
+    print("="*100)
+
+    if args.salida:
+        with open(args.salida, 'w') as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados guardados en {args.salida}")
+
+    if args.limite_ms is not None:
+        lentos = [r['modulo'] for r in resultados if r.get('mediana_ms', 0) > args.limite_ms]
+        if lentos:
+            print(f"❌ Superan {args.limite_ms:.0f} ms: {', '.join(lentos)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Benchmark Iron Condor - Iron Condor SPX
+Micro y macro benchmarks del cálculo y de la app web sobre cotizaciones grabadas
+(sin conexión), con resultados guardados por commit y umbrales de regresión
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DEFAULT = os.path.join(DIRECTORIO, 'fixtures', 'spx_vix.csv')
+DIRECTORIO_RESULTADOS = os.path.join(DIRECTORIO, '.benchmarks')
+UMBRAL_DEFAULT = 0.25       # Regresión: más de un 25% más lento que la referencia
+TIEMPO_MINIMO_S = 0.05      # Duración mínima de cada repetición (se ajustan las iteraciones)
+REPETICIONES_DEFAULT = 7
+
+
+def cargar_fixture(ruta: str = FIXTURE_DEFAULT) -> List[Tuple[float, float]]:
+    """
+    Lee las cotizaciones grabadas (columnas 'spx' y 'vix')
+
+    Returns:
+        Lista de (spx, vix)
+    """
+    with open(ruta, newline='') as archivo:
+        return [(float(fila['spx']), float(fila['vix'])) for fila in csv.DictReader(archivo)]
+
+
+def grabar_fixture(ruta: str, filas: int = 250):
+    """
+    Graba los últimos 'filas' cierres diarios de SPX/VIX de Yahoo Finance
+    """
+    from backtest_iron_condor import cargar_historico
+
+    historico = cargar_historico(None)
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    with open(ruta, 'w', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['fecha', 'spx', 'vix'])
+        for fecha, spx, vix in zip(historico['fechas'][-filas:], historico['spx'][-filas:],
+                                   historico['vix'][-filas:]):
+            escritor.writerow([str(fecha), f"{spx:.2f}", f"{vix:.2f}"])
+
+
+# --- Benchmarks ---
+# Cada preparación recibe la ruta del fixture y devuelve la función a medir (sin argumentos)
+
+def _ciclo(valores: List):
+    """
+    Función que devuelve un elemento distinto en cada llamada (recorre la lista)
+    """
+    estado = {'i': 0}
+
+    def siguiente():
+        i = estado['i']
+        estado['i'] = i + 1 if i + 1 < len(valores) else 0
+        return valores[i]
+    return siguiente
+
+
+def _agente_replay(fixture: str):
+    from agente_iron_condor_final import AgenteIronCondorSPX
+    from proveedores_datos import ProveedorReplay
+
+    return AgenteIronCondorSPX(proveedor=ProveedorReplay(fixture), usar_cache=False)
+
+
+def preparar_iv_puntos(fixture: str) -> Callable:
+    agente = _agente_replay(fixture)
+    siguiente = _ciclo(cargar_fixture(fixture))
+
+    def ejecutar():
+        spx, vix = siguiente()
+        agente.calcular_iv_puntos(spx, vix, periodo='diario', buffer=10)
+    return ejecutar
+
+
+def preparar_strikes(fixture: str) -> Callable:
+    agente = _agente_replay(fixture)
+    entradas = [(spx, agente.calcular_iv_puntos(spx, vix)['iv_final']) for spx, vix in cargar_fixture(fixture)]
+    siguiente = _ciclo(entradas)
+
+    def ejecutar():
+        spx, iv_puntos = siguiente()
+        agente.calcular_strikes(spx, iv_puntos, 25)
+    return ejecutar
+
+
+def preparar_redondeo(fixture: str) -> Callable:
+    agente = _agente_replay(fixture)
+    siguiente = _ciclo([spx for spx, _ in cargar_fixture(fixture)])
+
+    def ejecutar():
+        valor = siguiente()
+        agente.redondear_multiplo_5_superior(valor)
+        agente.redondear_multiplo_5_inferior(valor)
+    return ejecutar
+
+
+def preparar_calculo_completo(fixture: str) -> Callable:
+    agente = _agente_replay(fixture)
+    agente.ejecutar_calculo_completo(ala=25)  # Importaciones perezosas fuera de la medición
+
+    def ejecutar():
+        agente.ejecutar_calculo_completo(ala=25, periodo='diario', buffer=10)
+    return ejecutar
+
+
+def preparar_barrido(fixture: str) -> Callable:
+    agente = _agente_replay(fixture)
+    agente.barrido_parametros()
+
+    def ejecutar():
+        agente.barrido_parametros()
+    return ejecutar
+
+
+def preparar_app_web(fixture: str) -> Callable:
+    """
+    Re-ejecución completa del script de Streamlit tras cambiar un parámetro
+    (cálculo memoizado + render de métricas, gráfico y tablas)
+    """
+    from streamlit.testing.v1 import AppTest
+
+    # Cache de cotizaciones temporal con la primera fila del fixture: sin red
+    temporal = tempfile.mkdtemp(prefix='iron_condor_bench_')
+    os.environ['IRON_CONDOR_CACHE_DB'] = os.path.join(temporal, 'cache.sqlite3')
+    os.environ['IRON_CONDOR_CACHE_TTL'] = str(10 ** 9)
+    os.environ['IRON_CONDOR_DIARIO_DB'] = os.path.join(temporal, 'diario.sqlite3')
+
+    from cache_datos_mercado import obtener_cache_compartida
+    spx, vix = cargar_fixture(fixture)[0]
+    cache = obtener_cache_compartida()
+    cache.guardar('yfinance:^GSPC', spx)
+    cache.guardar('yfinance:^VIX', vix)
+
+    app = AppTest.from_file(os.path.join(DIRECTORIO, 'app_iron_condor_web.py'), default_timeout=120).run()
+    app.button[0].click().run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    buffers = _ciclo([10, 15])
+    slider_buffer = next(i for i, slider in enumerate(app.slider) if 'Buffer' in slider.label)
+
+    def ejecutar():
+        app.slider[slider_buffer].set_value(buffers()).run()
+    return ejecutar
+
+
+def preparar_malla_estres(fixture: str) -> Callable:
+    from prueba_estres import malla_estres_resultado
+
+    resultado = _agente_replay(fixture).ejecutar_calculo_completo(ala=25, periodo='semanal')
+
+    def ejecutar():
+        malla_estres_resultado(resultado, puntos_spot=200, puntos_vol=200)
+    return ejecutar
+
+
+BENCHMARKS = {
+    # Micro
+    'calcular_iv_puntos': preparar_iv_puntos,
+    'calcular_strikes': preparar_strikes,
+    'redondear_multiplo_5': preparar_redondeo,
+    'malla_estres_200x200': preparar_malla_estres,
+    # Macro
+    'ejecutar_calculo_completo': preparar_calculo_completo,
+    'barrido_parametros': preparar_barrido,
+    'app_web_rerender': preparar_app_web
+}
+
+
+def medir(funcion: Callable, repeticiones: int = REPETICIONES_DEFAULT) -> Dict:
+    """
+    Mide una función: ajusta las iteraciones para que cada repetición dure al menos
+    TIEMPO_MINIMO_S y devuelve el tiempo por llamada (mínimo y mediana, en µs)
+    """
+    iteraciones = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= TIEMPO_MINIMO_S:
+            break
+        iteraciones *= 2 if duracion * 10 < TIEMPO_MINIMO_S else 1 + int(TIEMPO_MINIMO_S / max(duracion, 1e-9))
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / iteraciones * 1e6)
+
+    return {
+        'minimo_us': round(min(tiempos), 3),
+        'mediana_us': round(statistics.median(tiempos), 3),
+        'iteraciones': iteraciones,
+        'repeticiones': repeticiones
+    }
+
+
+def ejecutar_benchmarks(nombres: List[str], fixture: str = FIXTURE_DEFAULT,
+                        repeticiones: int = REPETICIONES_DEFAULT) -> Dict[str, Dict]:
+    """
+    Prepara y mide cada benchmark; los que no se pueden preparar se informan con 'error'
+    """
+    resultados = {}
+    for nombre in nombres:
+        try:
+            funcion = BENCHMARKS[nombre](fixture)
+        except ImportError as e:
+            resultados[nombre] = {'error': f"Dependencia no instalada: {e.name}"}
+            continue
+        except Exception as e:
+            resultados[nombre] = {'error': str(e)}
+            continue
+        resultados[nombre] = medir(funcion, repeticiones)
+    return resultados
+
+
+def commit_actual() -> str:
+    """
+    Hash corto del commit actual (con sufijo -dirty si hay cambios sin confirmar)
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=DIRECTORIO,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        cambios = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=DIRECTORIO,
+                                 capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if cambios else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'sin-git'
+
+
+def cargar_referencia(referencia: Optional[str], actual: str) -> Optional[Dict]:
+    """
+    Resultados de referencia: un commit, un archivo JSON o, por defecto, el último
+    guardado de otro commit
+    """
+    if referencia:
+        ruta = referencia if os.path.exists(referencia) else os.path.join(DIRECTORIO_RESULTADOS, f"{referencia}.json")
+    else:
+        if not os.path.isdir(DIRECTORIO_RESULTADOS):
+            return None
+        candidatos = [
+            os.path.join(DIRECTORIO_RESULTADOS, nombre) for nombre in os.listdir(DIRECTORIO_RESULTADOS)
+            if nombre.endswith('.json') and nombre != f"{actual}.json"
+        ]
+        if not candidatos:
+            return None
+        ruta = max(candidatos, key=os.path.getmtime)
+
+    with open(ruta) as archivo:
+        return json.load(archivo)
+
+
+def comparar(actuales: Dict[str, Dict], referencia: Dict[str, Dict], umbral: float,
+             umbrales: Dict[str, float]) -> List[Dict]:
+    """
+    Compara el tiempo mínimo por llamada contra la referencia
+
+    Returns:
+        Una fila por benchmark medido en ambos, con 'regresion' True si supera su umbral
+    """
+    filas = []
+    for nombre, actual in actuales.items():
+        anterior = referencia.get(nombre)
+        if 'error' in actual or not anterior or 'error' in anterior:
+            continue
+        cambio = actual['minimo_us'] / anterior['minimo_us'] - 1
+        limite = umbrales.get(nombre, umbral)
+        filas.append({'nombre': nombre, 'anterior_us': anterior['minimo_us'], 'actual_us': actual['minimo_us'],
+                      'cambio': cambio, 'umbral': limite, 'regresion': cambio > limite})
+    return filas
+
+
+def _leer_umbrales(valores: List[str]) -> Dict[str, float]:
+    umbrales = {}
+    for valor in valores:
+        nombre, _, fraccion = valor.partition('=')
+        if nombre not in BENCHMARKS or not fraccion:
+            raise ValueError(f"Umbral inválido: {valor!r} (formato nombre=fracción)")
+        umbrales[nombre] = float(fraccion)
+    return umbrales
+
+
+def main():
+    """
+    Función principal del benchmark por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del Iron Condor SPX con umbrales de regresión")
+    parser.add_argument('benchmarks', nargs='*', default=list(BENCHMARKS), help="Por defecto: todos")
+    parser.add_argument('--fixture', default=FIXTURE_DEFAULT, help="CSV con columnas fecha, spx, vix")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES_DEFAULT)
+    parser.add_argument('--referencia', help="Commit o archivo JSON contra el que comparar")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_DEFAULT,
+                        help="Fracción de empeoramiento tolerada (0.25 = 25%%)")
+    parser.add_argument('--umbral-benchmark', action='append', default=[], metavar='NOMBRE=FRACCION',
+                        help="Umbral propio de un benchmark (se puede repetir)")
+    parser.add_argument('--no-guardar', action='store_true', help="No guardar los resultados en .benchmarks/")
+    parser.add_argument('--grabar', metavar='RUTA', help="Grabar un fixture desde Yahoo Finance y salir")
+    parser.add_argument('--filas', type=int, default=250, help="Filas a grabar con --grabar")
+    args = parser.parse_args()
+
+    try:
+        if args.grabar:
+            grabar_fixture(args.grabar, args.filas)
+            print(f"💾 Fixture grabado en {args.grabar}")
+            return
+
+        desconocidos = [b for b in args.benchmarks if b not in BENCHMARKS]
+        if desconocidos:
+            raise ValueError(f"Benchmarks desconocidos: {desconocidos}. Disponibles: {list(BENCHMARKS)}")
+        umbrales = _leer_umbrales(args.umbral_benchmark)
+
+        commit = commit_actual()
+        resultados = ejecutar_benchmarks(args.benchmarks, args.fixture, args.repeticiones)
+        referencia = cargar_referencia(args.referencia, commit)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print("\n" + "="*90)
+    print(f"⏱️ BENCHMARKS IRON CONDOR ({commit})")
+    print("="*90)
+    print(f"{'Benchmark':<28} {'Mínimo':>14} {'Mediana':>14} {'Iteraciones':>12}")
+    print("-"*90)
+    for nombre, r in resultados.items():
+        if 'error' in r:
+            print(f"{nombre:<28} ⚠️ {r['error']}")
+        else:
+            print(f"{nombre:<28} {r['minimo_us']:>12,.2f}µs {r['mediana_us']:>12,.2f}µs {r['iteraciones']:>12,}")
+
+    regresiones = []
+    if referencia:
+        print("-"*90)
+        print(f"📊 Comparación contra {referencia.get('commit', '?')}")
+        for fila in comparar(resultados, referencia.get('benchmarks', {}), args.umbral, umbrales):
+            marca = '❌' if fila['regresion'] else '✅'
+            print(f"   {marca} {fila['nombre']:<28} {fila['anterior_us']:>12,.2f}µs -> {fila['actual_us']:>12,.2f}µs "
+                  f"({fila['cambio']:+.1%}, umbral {fila['umbral']:.0%})")
+            if fila['regresion']:
+                regresiones.append(fila['nombre'])
+    print("="*90)
+
+    if not args.no_guardar:
+        os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+        ruta = os.path.join(DIRECTORIO_RESULTADOS, f"{commit}.json")
+        with open(ruta, 'w') as archivo:
+            json.dump({
+                'commit': commit,
+                'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'fixture': os.path.relpath(args.fixture, DIRECTORIO),
+                'benchmarks': resultados
+            }, archivo, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados guardados en {os.path.relpath(ruta, DIRECTORIO)}")
+
+    if regresiones:
+        print(f"❌ Regresiones: {', '.join(regresiones)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Cache de Datos de Mercado - Iron Condor SPX
+Cache con TTL para cotizaciones de SPX/VIX, respaldado en SQLite y compartido
+por el agente, la GUI, la app web y el demo interactivo
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Ubicación y TTL por defecto (configurables por variables de entorno)
+RUTA_CACHE_DEFAULT = os.path.join(os.path.expanduser("~"), ".iron_condor", "cache_mercado.sqlite3")
+TTL_DEFAULT = 60  # Segundos
+
+
+class CacheDatosMercado:
+    """
+    Cache de cotizaciones en dos niveles:
+    memoria (LRU acotado) y disco (SQLite compartido entre procesos).
+    """
+
+    def __init__(self, ruta: Optional[str] = RUTA_CACHE_DEFAULT, ttl_segundos: float = TTL_DEFAULT,
+                 max_entradas: int = 256):
+        """
+        Args:
+            ruta: Archivo SQLite del cache (None = solo memoria)
+            ttl_segundos: Vigencia de cada cotización
+            max_entradas: Máximo de entradas en memoria y en disco
+        """
+        self.ruta = ruta
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._conexion = None
+
+    def __getstate__(self) -> Dict:
+        """
+        Permite copiar/serializar el cache (ej: st.cache_data) sin la conexión ni el lock
+        """
+        estado = self.__dict__.copy()
+        estado['_lock'] = None
+        estado['_conexion'] = None
+        return estado
+
+    def __setstate__(self, estado: Dict):
+        self.__dict__.update(estado)
+        self._lock = threading.Lock()
+
+    def _obtener_conexion(self) -> Optional[sqlite3.Connection]:
+        """
+        Abre la base de datos la primera vez que se necesita
+        """
+        if self.ruta is None:
+            return None
+
+        if self._conexion is None:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+
+            conexion = sqlite3.connect(self.ruta, timeout=5, check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS cotizaciones ("
+                "clave TEXT PRIMARY KEY, valor REAL NOT NULL, guardado REAL NOT NULL)"
+            )
+            conexion.commit()
+            self._conexion = conexion
+
+        return self._conexion
+
+    def obtener(self, clave: str) -> Optional[Dict]:
+        """
+        Busca una cotización vigente
+
+        Args:
+            clave: Identificador de la cotización (ej: '^GSPC')
+
+        Returns:
+            Dict con 'valor' y 'guardado' (epoch) o None si no hay dato vigente
+        """
+        ahora = time.time()
+
+        with self._lock:
+            # Nivel 1: memoria
+            entrada = self._memoria.get(clave)
+            if entrada is not None:
+                if ahora - entrada['guardado'] <= self.ttl_segundos:
+                    self._memoria.move_to_end(clave)
+                    return dict(entrada)
+                del self._memoria[clave]
+
+            # Nivel 2: disco
+            try:
+                conexion = self._obtener_conexion()
+                if conexion is None:
+                    return None
+                fila = conexion.execute(
+                    "SELECT valor, guardado FROM cotizaciones WHERE clave = ?", (clave,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ Cache no disponible: {e}")
+                return None
+
+            if fila is None or ahora - fila[1] > self.ttl_segundos:
+                return None
+
+            entrada = {'valor': fila[0], 'guardado': fila[1]}
+            self._guardar_en_memoria(clave, entrada)
+            return dict(entrada)
+
+    def guardar(self, clave: str, valor: float):
+        """
+        Guarda una cotización en memoria y en disco
+        """
+        entrada = {'valor': valor, 'guardado': time.time()}
+
+        with self._lock:
+            self._guardar_en_memoria(clave, entrada)
+
+            try:
+                conexion = self._obtener_conexion()
+                if conexion is None:
+                    return
+                conexion.execute(
+                    "INSERT OR REPLACE INTO cotizaciones (clave, valor, guardado) VALUES (?, ?, ?)",
+                    (clave, entrada['valor'], entrada['guardado'])
+                )
+                self._desalojar_disco(conexion, entrada['guardado'])
+                conexion.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ No se pudo escribir el cache: {e}")
+
+    def _guardar_en_memoria(self, clave: str, entrada: Dict):
+        """
+        Inserta en el LRU de memoria desalojando la entrada más antigua
+        """
+        self._memoria[clave] = entrada
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_entradas:
+            self._memoria.popitem(last=False)
+
+    def _desalojar_disco(self, conexion: sqlite3.Connection, ahora: float):
+        """
+        Elimina entradas expiradas y, si sobran, las menos recientes
+        """
+        conexion.execute("DELETE FROM cotizaciones WHERE guardado < ?", (ahora - self.ttl_segundos,))
+        conexion.execute(
+            "DELETE FROM cotizaciones WHERE clave NOT IN "
+            "(SELECT clave FROM cotizaciones ORDER BY guardado DESC LIMIT ?)",
+            (self.max_entradas,)
+        )
+
+    def limpiar(self):
+        """
+        Vacía el cache completo (memoria y disco)
+        """
+        with self._lock:
+            self._memoria.clear()
+            try:
+                conexion = self._obtener_conexion()
+                if conexion is not None:
+                    conexion.execute("DELETE FROM cotizaciones")
+                    conexion.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ No se pudo limpiar el cache: {e}")
+
+
+_cache_compartida = None
+_lock_compartida = threading.Lock()
+
+
+def obtener_cache_compartida() -> CacheDatosMercado:
+    """
+    Devuelve la instancia de cache compartida por todos los puntos de entrada.
+
+    Variables de entorno:
+        IRON_CONDOR_CACHE_DB: Ruta del archivo SQLite
+        IRON_CONDOR_CACHE_TTL: TTL en segundos
+    """
+    global _cache_compartida
+
+    with _lock_compartida:
+        if _cache_compartida is None:
+            _cache_compartida = CacheDatosMercado(
+                ruta=os.environ.get("IRON_CONDOR_CACHE_DB", RUTA_CACHE_DEFAULT),
+                ttl_segundos=float(os.environ.get("IRON_CONDOR_CACHE_TTL", TTL_DEFAULT))
+            )
+        return _cache_compartida
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Cadena de Opciones - Iron Condor SPX
+Carga snapshots locales de la cadena (CSV/Parquet) en un índice por vencimiento con
+strikes ordenados, para ajustar strikes calculados a los realmente listados
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import bisect
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Nombres aceptados para cada columna del snapshot
+ALIAS_COLUMNAS = {
+    'strike': 'strike',
+    'vencimiento': 'vencimiento', 'expiry': 'vencimiento', 'expiration': 'vencimiento',
+    'bid': 'bid',
+    'ask': 'ask',
+    'iv': 'iv', 'implied_volatility': 'iv',
+    'oi': 'oi', 'open_interest': 'oi',
+    'tipo': 'tipo', 'type': 'tipo', 'option_type': 'tipo'
+}
+DIRECCIONES = ('cercano', 'superior', 'inferior')
+
+
+class CadenaOpciones:
+    """
+    Índice en memoria de una cadena de opciones:
+    {vencimiento: {tipo: columnas NumPy ordenadas por strike}}
+    """
+
+    def __init__(self, columnas: Dict[str, np.ndarray], origen: str = 'memoria'):
+        """
+        Args:
+            columnas: Arrays 'strike', 'vencimiento' y opcionalmente 'bid', 'ask', 'iv', 'oi', 'tipo'
+            origen: Descripción de la fuente (ruta del archivo)
+        """
+        self.origen = origen
+        self.indice = {}
+        self._filtrados = {}
+        self._lock = threading.Lock()
+
+        n = len(columnas['strike'])
+        strike = np.asarray(columnas['strike'], dtype=np.float64)
+        vencimiento = np.asarray(columnas['vencimiento']).astype(str)
+        tipo = np.asarray(columnas.get('tipo', np.full(n, 'ambos'))).astype(str)
+        tipo = np.char.lower(tipo)
+        tipo = np.where(np.isin(tipo, ['c', 'call']), 'call', np.where(np.isin(tipo, ['p', 'put']), 'put', tipo))
+        extras = {
+            c: np.asarray(columnas.get(c, np.full(n, np.nan)), dtype=np.float64)
+            for c in ('bid', 'ask', 'iv', 'oi')
+        }
+
+        # Un solo ordenamiento global por (vencimiento, tipo, strike)
+        orden = np.lexsort((strike, tipo, vencimiento))
+        claves = np.char.add(np.char.add(vencimiento[orden], '|'), tipo[orden])
+        cortes = np.flatnonzero(claves[1:] != claves[:-1]) + 1
+
+        for inicio, fin in zip(np.r_[0, cortes], np.r_[cortes, n]):
+            if inicio == fin:
+                continue
+            filas = orden[inicio:fin]
+            venc, t = str(vencimiento[filas[0]]), str(tipo[filas[0]])
+            bloque = {'strike': strike[filas]}
+            bloque.update({c: valores[filas] for c, valores in extras.items()})
+            self.indice.setdefault(venc, {})[t] = bloque
+
+        self._vencimientos = sorted(self.indice)
+
+    @classmethod
+    def desde_archivo(cls, ruta: str) -> 'CadenaOpciones':
+        """
+        Carga un snapshot CSV o Parquet (columnas strike, vencimiento/expiry, bid, ask, iv, oi, tipo)
+        """
+        import pandas as pd
+
+        tabla = pd.read_parquet(ruta) if ruta.endswith('.parquet') else pd.read_csv(ruta)
+        tabla.columns = [ALIAS_COLUMNAS.get(str(c).lower(), str(c).lower()) for c in tabla.columns]
+
+        faltantes = [c for c in ('strike', 'vencimiento') if c not in tabla.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {ruta}: {faltantes}")
+
+        tabla['vencimiento'] = pd.to_datetime(tabla['vencimiento']).dt.strftime('%Y-%m-%d')
+        columnas = {c: tabla[c].to_numpy() for c in set(ALIAS_COLUMNAS.values()) if c in tabla.columns}
+        return cls(columnas, origen=ruta)
+
+    def vencimientos(self) -> List[str]:
+        """
+        Vencimientos disponibles ordenados
+        """
+        return list(self._vencimientos)
+
+    def vencimiento_para(self, fecha: str) -> Optional[str]:
+        """
+        Primer vencimiento en o después de la fecha 'YYYY-MM-DD'
+        """
+        posicion = bisect.bisect_left(self._vencimientos, fecha)
+        return self._vencimientos[posicion] if posicion < len(self._vencimientos) else None
+
+    def columnas(self, vencimiento: str, tipo: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Columnas ordenadas por strike de un vencimiento (y tipo, si se indica)
+        """
+        if vencimiento not in self.indice:
+            raise KeyError(f"Vencimiento {vencimiento} no está en la cadena")
+
+        por_tipo = self.indice[vencimiento]
+        if tipo is not None:
+            if tipo in por_tipo:
+                return por_tipo[tipo]
+            if 'ambos' in por_tipo:
+                return por_tipo['ambos']
+            raise KeyError(f"No hay opciones {tipo} para {vencimiento}")
+
+        if len(por_tipo) == 1:
+            return next(iter(por_tipo.values()))
+
+        # Unión de strikes de todos los tipos (máximo OI por strike)
+        clave = (vencimiento, None, None)
+        with self._lock:
+            if clave not in self._filtrados:
+                strikes = np.concatenate([b['strike'] for b in por_tipo.values()])
+                oi = np.concatenate([b['oi'] for b in por_tipo.values()])
+                unicos, inversos = np.unique(strikes, return_inverse=True)
+                oi_max = np.full(unicos.size, -np.inf)
+                np.maximum.at(oi_max, inversos, np.nan_to_num(oi, nan=-np.inf))
+                self._filtrados[clave] = {'strike': unicos, 'oi': np.where(np.isinf(oi_max), np.nan, oi_max)}
+            return self._filtrados[clave]
+
+    def strikes(self, vencimiento: str, tipo: Optional[str] = None, oi_minimo: float = 0) -> np.ndarray:
+        """
+        Strikes listados ordenados, opcionalmente solo los que tienen OI suficiente.
+
+        El filtrado por OI se hace una vez por umbral y queda en memoria.
+        """
+        bloque = self.columnas(vencimiento, tipo)
+        if not oi_minimo:
+            return bloque['strike']
+
+        clave = (vencimiento, tipo, oi_minimo)
+        with self._lock:
+            if clave not in self._filtrados:
+                self._filtrados[clave] = {'strike': bloque['strike'][bloque['oi'] >= oi_minimo]}
+            return self._filtrados[clave]['strike']
+
+    def ajustar_strikes(self, valores, vencimiento: str, direccion: str = 'cercano',
+                        tipo: Optional[str] = None, oi_minimo: float = 0) -> np.ndarray:
+        """
+        Ajusta strikes teóricos al strike listado más cercano (búsqueda binaria vectorizada)
+
+        Args:
+            valores: Strike(s) teórico(s)
+            vencimiento: Vencimiento 'YYYY-MM-DD'
+            direccion: 'cercano', 'superior' (>= valor) o 'inferior' (<= valor)
+            tipo: 'put', 'call' o None (cualquiera)
+            oi_minimo: Open interest mínimo exigido
+
+        Returns:
+            Array de strikes listados (NaN donde no existe ninguno en esa dirección)
+        """
+        if direccion not in DIRECCIONES:
+            raise ValueError(f"Dirección debe ser una de: {list(DIRECCIONES)}")
+
+        listados = self.strikes(vencimiento, tipo, oi_minimo)
+        valores = np.asarray(valores, dtype=np.float64)
+        if listados.size == 0:
+            return np.full(valores.shape, np.nan)
+
+        # Posición del primer strike >= valor
+        posicion = np.searchsorted(listados, valores, side='left')
+        superior = np.where(posicion < listados.size, listados[np.minimum(posicion, listados.size - 1)], np.nan)
+
+        # Último strike <= valor
+        posicion_inf = np.searchsorted(listados, valores, side='right') - 1
+        inferior = np.where(posicion_inf >= 0, listados[np.maximum(posicion_inf, 0)], np.nan)
+
+        if direccion == 'superior':
+            return superior
+        if direccion == 'inferior':
+            return inferior
+
+        distancia_sup = np.where(np.isnan(superior), np.inf, superior - valores)
+        distancia_inf = np.where(np.isnan(inferior), np.inf, valores - inferior)
+        return np.where(distancia_inf <= distancia_sup, inferior, superior)
+
+    def ajustar_strike(self, valor: float, vencimiento: str, direccion: str = 'cercano',
+                       tipo: Optional[str] = None, oi_minimo: float = 0) -> Optional[float]:
+        """
+        Versión escalar de ajustar_strikes (None si no hay strike listado).
+        Los strikes enteros se devuelven como int, igual que calcular_strikes.
+        """
+        ajustado = float(self.ajustar_strikes(valor, vencimiento, direccion, tipo, oi_minimo))
+        if np.isnan(ajustado):
+            return None
+        return int(ajustado) if ajustado.is_integer() else ajustado
+
+    def __len__(self) -> int:
+        return sum(b['strike'].size for por_tipo in self.indice.values() for b in por_tipo.values())
+
+
+_cadenas_cargadas = OrderedDict()
+_lock_cadenas = threading.Lock()
+MAX_CADENAS_EN_MEMORIA = 8
+
+
+def cargar_cadena(ruta: str) -> CadenaOpciones:
+    """
+    Carga una cadena una sola vez y la mantiene en memoria mientras el archivo no cambie
+    """
+    clave = (os.path.abspath(ruta), os.path.getmtime(ruta))
+
+    with _lock_cadenas:
+        if clave in _cadenas_cargadas:
+            _cadenas_cargadas.move_to_end(clave)
+            return _cadenas_cargadas[clave]
+
+    cadena = CadenaOpciones.desde_archivo(ruta)
+
+    with _lock_cadenas:
+        _cadenas_cargadas[clave] = cadena
+        while len(_cadenas_cargadas) > MAX_CADENAS_EN_MEMORIA:
+            _cadenas_cargadas.popitem(last=False)
+
+    return cadena
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Cálculo por Lotes - Iron Condor SPX
+Procesa escenarios (spx, vix, ala, periodo, buffer, fecha) desde CSV o JSONL, por
+archivo o stdin, y escribe un JSONL de resultados en el mismo orden con memoria constante
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from motor_vectorizado import DIAS_TRADING_ANIO, PERIODOS_DISPONIBLES, calcular_strikes_lote
+
+FILAS_POR_BLOQUE = 20_000
+BLOQUES_EN_VUELO_POR_PROCESO = 2  # Ventana acotada: la memoria no crece con el archivo
+
+# Nombres aceptados para cada columna de entrada
+ALIAS_COLUMNAS = {
+    'spx': 'spx', 'spot': 'spx', 'spx_valor': 'spx',
+    'vix': 'vix', 'vix_valor': 'vix',
+    'ala': 'ala',
+    'periodo': 'periodo',
+    'buffer': 'buffer',
+    'fecha': 'fecha', 'fecha_objetivo': 'fecha'
+}
+VALORES_DEFAULT = {'ala': 25, 'periodo': 'diario', 'buffer': 10, 'fecha': None}
+COLUMNAS_VALORACION = ('credito_neto', 'riesgo_maximo', 'breakeven_inferior', 'breakeven_superior',
+                       'delta', 'gamma', 'theta', 'vega')
+
+
+def _normalizar(registro: Dict) -> Dict:
+    """
+    Valida un escenario y aplica los valores por defecto (lanza ValueError si es inválido)
+    """
+    escenario = dict(VALORES_DEFAULT)
+    for clave, valor in registro.items():
+        nombre = ALIAS_COLUMNAS.get(str(clave).strip().lower())
+        if nombre is not None and valor not in (None, ''):
+            escenario[nombre] = valor
+
+    if 'spx' not in escenario or 'vix' not in escenario:
+        raise ValueError("Faltan 'spx' o 'vix'")
+
+    spx, vix = float(escenario['spx']), float(escenario['vix'])
+    if not (spx > 0 and vix > 0) or spx == float('inf') or vix == float('inf'):
+        raise ValueError("'spx' y 'vix' deben ser positivos")
+
+    ala = float(escenario['ala'])
+    if not ala.is_integer() or ala <= 0:
+        raise ValueError(f"Ala inválida: {escenario['ala']!r}")
+
+    buffer = float(escenario['buffer'])
+    if buffer != buffer or abs(buffer) == float('inf'):
+        raise ValueError(f"Buffer inválido: {escenario['buffer']!r}")
+
+    periodo = str(escenario['periodo']).strip().lower()
+    if periodo not in PERIODOS_DISPONIBLES:
+        raise ValueError(f"Período debe ser uno de: {list(PERIODOS_DISPONIBLES)}")
+
+    fecha = escenario['fecha']
+    if fecha is not None:
+        fecha = datetime.strptime(str(fecha).strip()[:10], '%Y-%m-%d').strftime('%Y-%m-%d')
+
+    return {
+        'spx': spx,
+        'vix': vix,
+        'ala': int(ala),
+        'periodo': periodo,
+        'buffer': int(buffer) if buffer.is_integer() else buffer,
+        'fecha': fecha
+    }
+
+
+def calcular_escenarios(escenarios: List[Dict], valorar: bool = False) -> List[Dict]:
+    """
+    Calcula strikes (y opcionalmente la valoración) de escenarios ya normalizados
+
+    Args:
+        escenarios: Lista de dicts con spx, vix, ala, periodo, buffer, fecha
+        valorar: True para agregar crédito, riesgo, breakevens y griegas (Black-Scholes)
+
+    Returns:
+        Lista de resultados en el mismo orden
+    """
+    if not escenarios:
+        return []
+
+    entradas = {c: [e[c] for e in escenarios] for c in ('spx', 'vix', 'ala', 'periodo', 'buffer', 'fecha')}
+    columnas = calcular_columnas(entradas, valorar)
+
+    resultados = []
+    for i, escenario in enumerate(escenarios):
+        resultado = dict(escenario)
+        resultado.update({clave: valores[i] for clave, valores in columnas.items()})
+        resultados.append(resultado)
+    return resultados
+
+
+def calcular_columnas(entradas: Dict, valorar: bool = False) -> Dict[str, list]:
+    """
+    Versión columnar de calcular_escenarios (listas o arrays por columna)
+
+    Returns:
+        Dict {columna de resultado: lista de valores}
+    """
+    spx = np.asarray(entradas['spx'], dtype=np.float64)
+    vix = np.asarray(entradas['vix'], dtype=np.float64)
+    lote = calcular_strikes_lote(
+        spx, vix,
+        np.asarray(entradas['ala'], dtype=np.int64),
+        periodo=np.asarray(entradas['periodo']),
+        buffer=np.asarray(entradas['buffer'], dtype=np.float64)
+    )
+    columnas = {c: lote[c].tolist() for c in ('iv_final', 'buy_put', 'sell_put', 'sell_call', 'buy_call',
+                                              'rango_profit')}
+
+    if valorar:
+        from valoracion_black_scholes import valorar_iron_condor
+
+        # Mismo horizonte que dias_horizonte: días hábiles hasta la fecha o 252 / factor
+        con_fecha = np.array([f is not None for f in entradas['fecha']], dtype=bool)
+        hoy = np.datetime64(datetime.now().strftime('%Y-%m-%d'))
+        fechas = np.array([f or '1970-01-01' for f in entradas['fecha']], dtype='datetime64[D]')
+        dias = np.where(
+            con_fecha,
+            np.busday_count(hoy, np.where(con_fecha, fechas, hoy)),
+            np.round(DIAS_TRADING_ANIO / lote['factor_tiempo'])
+        )
+        tiempo = np.maximum(dias, 1) / DIAS_TRADING_ANIO
+
+        valoracion = valorar_iron_condor(spx, lote['buy_put'], lote['sell_put'], lote['sell_call'],
+                                         lote['buy_call'], vix / 100, tiempo)
+        for clave in COLUMNAS_VALORACION:
+            decimales = 4 if clave in ('delta', 'gamma') else 2
+            columnas[clave] = (np.round(valoracion[clave], decimales) + 0.0).tolist()
+
+    return columnas
+
+
+def _leer_registros(formato: str, cabecera: Optional[List[str]], lineas: List[str]) -> Iterator:
+    """
+    Convierte líneas crudas en dicts (o en la excepción de la línea)
+    """
+    if formato == 'jsonl':
+        for linea in lineas:
+            try:
+                registro = json.loads(linea)
+                if not isinstance(registro, dict):
+                    raise ValueError("Cada línea debe ser un objeto JSON")
+                yield registro
+            except ValueError as e:
+                yield e
+    else:
+        for valores in csv.reader(lineas):
+            if len(valores) != len(cabecera):
+                yield ValueError(f"Se esperaban {len(cabecera)} columnas y hay {len(valores)}")
+            else:
+                yield dict(zip(cabecera, valores))
+
+
+def _columnas_csv_validas(cabecera: List[str], lineas: List[str]) -> Optional[Dict]:
+    """
+    Camino rápido para bloques CSV sin errores: convierte y valida columnas completas
+    con NumPy. Devuelve None si alguna fila necesita el tratamiento fila a fila.
+    """
+    indices = {}
+    for posicion, nombre in enumerate(cabecera):
+        canonico = ALIAS_COLUMNAS.get(nombre.strip().lower())
+        if canonico is not None:
+            indices.setdefault(canonico, posicion)
+    if 'spx' not in indices or 'vix' not in indices:
+        return None
+
+    filas = list(csv.reader(lineas))
+    if any(len(fila) != len(cabecera) for fila in filas):
+        return None
+    crudas = list(zip(*filas))
+
+    def columna(nombre):
+        return crudas[indices[nombre]] if nombre in indices else None
+
+    try:
+        spx = np.array(columna('spx'), dtype=np.float64)
+        vix = np.array(columna('vix'), dtype=np.float64)
+        ala = np.array(columna('ala'), dtype=np.float64) if 'ala' in indices else np.full(len(filas), 25.0)
+        buffer = (np.array(columna('buffer'), dtype=np.float64) if 'buffer' in indices
+                  else np.full(len(filas), 10.0))
+    except ValueError:
+        return None
+
+    periodo = (np.char.lower(np.char.strip(np.array(columna('periodo'), dtype=str))) if 'periodo' in indices
+               else np.full(len(filas), 'diario'))
+    fecha = [f.strip() or None for f in columna('fecha')] if 'fecha' in indices else [None] * len(filas)
+
+    validos = (
+        np.isfinite(spx) & (spx > 0) & np.isfinite(vix) & (vix > 0)
+        & (ala > 0) & (ala == np.floor(ala)) & np.isfinite(buffer)
+        & np.isin(periodo, list(PERIODOS_DISPONIBLES))
+    )
+    if not validos.all():
+        return None
+
+    # Fechas: se valida cada valor distinto una sola vez
+    for valor in set(fecha) - {None}:
+        try:
+            if datetime.strptime(valor, '%Y-%m-%d').strftime('%Y-%m-%d') != valor:
+                return None
+        except ValueError:
+            return None
+
+    return {'spx': spx, 'vix': vix, 'ala': ala.astype(np.int64), 'periodo': periodo,
+            'buffer': buffer, 'fecha': fecha}
+
+
+def _formatear_columnas(primera_fila: int, entradas: Dict, columnas: Dict[str, list]) -> List[str]:
+    """
+    Serializa resultados columnares a líneas JSON sin pasar por json.dumps por fila
+    """
+    buffers = [int(b) if b.is_integer() else b for b in entradas['buffer'].tolist()]
+    fechas = ['null' if f is None else f'"{f}"' for f in entradas['fecha']]
+    claves = list(columnas)
+    valores = [columnas[c] for c in claves]
+
+    lineas = []
+    for i, (spx, vix, ala, periodo, buffer, fecha, *resultado) in enumerate(zip(
+            entradas['spx'].tolist(), entradas['vix'].tolist(), entradas['ala'].tolist(),
+            entradas['periodo'].tolist(), buffers, fechas, *valores)):
+        campos = ', '.join(f'"{c}": {v!r}' for c, v in zip(claves, resultado))
+        lineas.append(f'{{"fila": {primera_fila + i}, "spx": {spx!r}, "vix": {vix!r}, "ala": {ala}, '
+                      f'"periodo": "{periodo}", "buffer": {buffer!r}, "fecha": {fecha}, {campos}}}')
+    return lineas
+
+
+def procesar_bloque(tarea: Tuple) -> Tuple[str, int, int]:
+    """
+    Procesa un bloque de líneas crudas (se ejecuta en los procesos del pool)
+
+    Returns:
+        (texto JSONL del bloque, filas correctas, filas con error)
+    """
+    formato, cabecera, primera_fila, lineas, valorar = tarea
+
+    if formato == 'csv':
+        entradas = _columnas_csv_validas(cabecera, lineas)
+        if entradas is not None:
+            salida = _formatear_columnas(primera_fila, entradas, calcular_columnas(entradas, valorar))
+            return '\n'.join(salida) + '\n', len(lineas), 0
+
+    # Fila a fila: JSONL o bloques CSV con algún error
+    escenarios, posiciones, salida = [], [], [None] * len(lineas)
+    for i, registro in enumerate(_leer_registros(formato, cabecera, lineas)):
+        try:
+            if isinstance(registro, Exception):
+                raise registro
+            escenarios.append(_normalizar(registro))
+            posiciones.append(i)
+        except (ValueError, TypeError) as e:
+            salida[i] = json.dumps({'fila': primera_fila + i, 'error': str(e)}, ensure_ascii=False)
+
+    for i, resultado in zip(posiciones, calcular_escenarios(escenarios, valorar)):
+        salida[i] = json.dumps({'fila': primera_fila + i, **resultado})
+
+    return '\n'.join(salida) + '\n', len(escenarios), len(lineas) - len(escenarios)
+
+
+def _bloques(lineas: Iterable[str], tamano: int) -> Iterator[List[str]]:
+    """
+    Agrupa las líneas no vacías en bloques de 'tamano'
+    """
+    no_vacias = (linea for linea in lineas if linea.strip())
+    while True:
+        bloque = list(islice(no_vacias, tamano))
+        if not bloque:
+            return
+        yield bloque
+
+
+def procesar_flujo(entrada, salida, procesos: int = 1, valorar: bool = False,
+                   filas_por_bloque: int = FILAS_POR_BLOQUE, informe=None) -> Dict:
+    """
+    Lee escenarios de un flujo de texto y escribe los resultados JSONL en orden
+
+    Args:
+        entrada: Flujo de texto CSV (con cabecera) o JSONL
+        salida: Flujo de texto donde escribir el JSONL
+        procesos: Procesos en paralelo (1 = proceso actual)
+        valorar: Agregar valoración Black-Scholes
+        filas_por_bloque: Filas enviadas a cada tarea
+        informe: Flujo donde informar el progreso (ej: sys.stderr)
+
+    Returns:
+        Dict con filas correctas, errores, segundos y filas por segundo
+    """
+    lineas = iter(entrada)
+    primera = next((linea for linea in lineas if linea.strip()), None)
+    if primera is None:
+        return {'filas': 0, 'errores': 0, 'segundos': 0.0, 'filas_por_segundo': 0.0}
+
+    if primera.lstrip().startswith('{'):
+        formato, cabecera = 'jsonl', None
+        lineas = _encadenar(primera, lineas)
+    else:
+        formato, cabecera = 'csv', next(csv.reader([primera]))
+
+    inicio = ultimo_informe = time.perf_counter()
+    totales = {'filas': 0, 'errores': 0}
+    fila = 1
+
+    def escribir(parcial):
+        nonlocal ultimo_informe
+        texto, correctas, errores = parcial
+        salida.write(texto)
+        totales['filas'] += correctas
+        totales['errores'] += errores
+        ahora = time.perf_counter()
+        if informe is not None and ahora - ultimo_informe >= 1.0:
+            procesadas = totales['filas'] + totales['errores']
+            informe.write(f"⚡ {procesadas:,} filas | {procesadas / (ahora - inicio):,.0f} filas/s\n")
+            informe.flush()
+            ultimo_informe = ahora
+
+    if procesos <= 1:
+        for bloque in _bloques(lineas, filas_por_bloque):
+            escribir(procesar_bloque((formato, cabecera, fila, bloque, valorar)))
+            fila += len(bloque)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        ventana = procesos * BLOQUES_EN_VUELO_POR_PROCESO
+        pendientes = deque()
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for bloque in _bloques(lineas, filas_por_bloque):
+                pendientes.append(pool.submit(procesar_bloque, (formato, cabecera, fila, bloque, valorar)))
+                fila += len(bloque)
+                # Se escribe en orden de llegada al archivo, no de finalización
+                while len(pendientes) >= ventana:
+                    escribir(pendientes.popleft().result())
+            while pendientes:
+                escribir(pendientes.popleft().result())
+
+    segundos = time.perf_counter() - inicio
+    procesadas = totales['filas'] + totales['errores']
+    totales.update({
+        'segundos': round(segundos, 3),
+        'filas_por_segundo': round(procesadas / segundos, 1) if segundos > 0 else 0.0
+    })
+    return totales
+
+
+def _encadenar(primera: str, resto: Iterator[str]) -> Iterator[str]:
+    yield primera
+    yield from resto
+
+
+def main():
+    """
+    Función principal del cálculo por lotes por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Cálculo por lotes de iron condors (CSV/JSONL -> JSONL)")
+    parser.add_argument('entrada', nargs='?', default='-', help="Archivo CSV/JSONL ('-' = stdin)")
+    parser.add_argument('--salida', default='-', help="Archivo JSONL de salida ('-' = stdout)")
+    parser.add_argument('--procesos', type=int, default=1)
+    parser.add_argument('--bloque', type=int, default=FILAS_POR_BLOQUE, help="Filas por tarea")
+    parser.add_argument('--valorar', action='store_true', help="Agregar crédito, riesgo y griegas")
+    parser.add_argument('--silencioso', action='store_true', help="No informar el progreso en stderr")
+    args = parser.parse_args()
+
+    entrada = sys.stdin if args.entrada == '-' else open(args.entrada, newline='')
+    salida = sys.stdout if args.salida == '-' else open(args.salida, 'w')
+
+    try:
+        totales = procesar_flujo(entrada, salida, procesos=args.procesos, valorar=args.valorar,
+                                 filas_por_bloque=args.bloque,
+                                 informe=None if args.silencioso else sys.stderr)
+        salida.flush()
+        if not args.silencioso:
+            sys.stderr.write(f"✅ {totales['filas']:,} escenarios, {totales['errores']:,} errores en "
+                             f"{totales['segundos']:.2f}s ({totales['filas_por_segundo']:,.0f} filas/s)\n")
+
+    except Exception as e:
+        sys.stderr.write(f"❌ Error: {e}\n")
+        sys.exit(1)
+
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -128,45 +128,33 @@ def comparar_alas(agente):
     print("\n🔄 Comparando diferentes anchos de ala...")
     
     alas = [10, 15, 20, 25]
-    resultados = {}
     
-    # Calcular para cada ala
-    for ala in alas:
-        try:
-            print(f"   Calculando para ala de {ala} puntos...")
-            resultado = agente.ejecutar_calculo_completo(ala=ala)
-            resultados[ala] = resultado
-        except Exception as e:
-            print(f"   ❌ Error con ala {ala}: {e}")
-            resultados[ala] = None
+    # Un solo snapshot del mercado para todas las alas
+    try:
+        filas = agente.barrido_parametros(alas=alas, periodos=[agente.periodo_default], buffers=[10])
+    except Exception as e:
+        print(f"   ❌ Error en la comparación: {e}")
+        return
     
     # Mostrar comparación
     print("\n" + "="*80)
     print("📊 COMPARACIÓN DE DIFERENTES ALAS")
     print("="*80)
     
-    if resultados[25]:  # Usar datos del mercado del primer cálculo exitoso
-        datos = resultados[25]['datos_mercado']
-        print(f"\n📊 Datos del mercado (SPX: ${datos['spx_valor']:,.2f}, VIX: {datos['vix_valor']:.2f}%)")
+    print(f"\n📊 Datos del mercado (SPX: ${filas[0]['spx_valor']:,.2f}, VIX: {filas[0]['vix_valor']:.2f}%)")
     
     print("\n🎯 Comparación de strikes:")
     print(f"{'Ala':<5} {'Buy Put':<10} {'Sell Put':<10} {'Sell Call':<10} {'Buy Call':<10} {'Rango':<8}")
     print("-" * 60)
     
-    for ala in alas:
-        if resultados[ala]:
-            strikes = resultados[ala]['strikes']
-            print(f"{ala:<5} {strikes['buy_put']:<10} {strikes['sell_put']:<10} "
-                  f"{strikes['sell_call']:<10} {strikes['buy_call']:<10} {strikes['rango_profit']:<8}")
-        else:
-            print(f"{ala:<5} {'ERROR':<10} {'ERROR':<10} {'ERROR':<10} {'ERROR':<10} {'ERROR':<8}")
+    for fila in filas:
+        print(f"{fila['ala']:<5} {fila['buy_put']:<10} {fila['sell_put']:<10} "
+              f"{fila['sell_call']:<10} {fila['buy_call']:<10} {fila['rango_profit']:<8}")
     
     print("\n📊 Análisis:")
-    for ala in alas:
-        if resultados[ala]:
-            strikes = resultados[ala]['strikes']
-            print(f"   Ala {ala}: Rango de {strikes['rango_profit']} puntos "
-                  f"(${strikes['sell_put']:,} - ${strikes['sell_call']:,})")
+    for fila in filas:
+        print(f"   Ala {fila['ala']}: Rango de {fila['rango_profit']} puntos "
+              f"(${fila['sell_put']:,} - ${fila['sell_call']:,})")
 
 def mostrar_info_sistema(agente):
     """
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Diario de Cálculos - Iron Condor SPX
+Registro de solo agregado (SQLite en modo WAL) de cada snapshot del mercado y
+condor calculado, con escritura en segundo plano y consultas indexadas del historial
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+RUTA_DIARIO_DEFAULT = os.path.join(os.path.expanduser("~"), ".iron_condor", "diario_calculos.sqlite3")
+MAX_COLA = 10_000          # Registros pendientes antes de empezar a descartar
+FILAS_POR_TRANSACCION = 500
+
+COLUMNAS = [
+    'registrado', 'subyacente', 'fecha_datos', 'fecha_objetivo', 'fuente', 'spx', 'vix',
+    'ala', 'periodo', 'buffer', 'delta_objetivo', 'iv_final',
+    'buy_put', 'sell_put', 'sell_call', 'buy_call', 'rango_profit',
+    'credito_neto', 'riesgo_maximo', 'resultado'
+]
+
+ESQUEMA = [
+    "CREATE TABLE IF NOT EXISTS calculos ("
+    "id INTEGER PRIMARY KEY, registrado REAL NOT NULL, subyacente TEXT NOT NULL, "
+    "fecha_datos TEXT, fecha_objetivo TEXT, fuente TEXT, spx REAL, vix REAL, "
+    "ala INTEGER, periodo TEXT, buffer INTEGER, delta_objetivo REAL, iv_final REAL, "
+    "buy_put REAL, sell_put REAL, sell_call REAL, buy_call REAL, rango_profit REAL, "
+    "credito_neto REAL, riesgo_maximo REAL, resultado TEXT)",
+    # Consultas por parámetros dentro de un rango de fechas (ej: alas de 25, diario, último trimestre)
+    "CREATE INDEX IF NOT EXISTS idx_calculos_parametros ON calculos (subyacente, ala, periodo, registrado)",
+    "CREATE INDEX IF NOT EXISTS idx_calculos_fecha ON calculos (subyacente, registrado)",
+    # Solo agregado: las filas no se modifican ni se borran
+    "CREATE TRIGGER IF NOT EXISTS calculos_sin_update BEFORE UPDATE ON calculos "
+    "BEGIN SELECT RAISE(ABORT, 'El diario es de solo agregado'); END",
+    "CREATE TRIGGER IF NOT EXISTS calculos_sin_delete BEFORE DELETE ON calculos "
+    "BEGIN SELECT RAISE(ABORT, 'El diario es de solo agregado'); END"
+]
+
+# Los strikes listados de una cadena (ajustar_strikes_a_cadena) pueden no ser enteros
+COLUMNAS_STRIKE = ('buy_put', 'sell_put', 'sell_call', 'buy_call', 'rango_profit')
+
+_FIN = object()
+
+
+class DiarioCalculos:
+    """
+    Diario persistente de cálculos.
+
+    registrar() convierte el resultado en una fila y solo la encola (no espera al
+    disco); un hilo escritor la agrega a SQLite en transacciones por lotes.
+    """
+
+    def __init__(self, ruta: str = RUTA_DIARIO_DEFAULT, max_cola: int = MAX_COLA):
+        """
+        Args:
+            ruta: Archivo SQLite del diario
+            max_cola: Registros pendientes admitidos (los siguientes se descartan)
+        """
+        self.ruta = ruta
+        self.descartados = 0
+        self.escritos = 0
+        self._cola = queue.Queue(maxsize=max_cola)
+        self._lock_lectura = threading.Lock()
+        self._lectura = None
+        self._escritor = None
+        self._lock_escritor = threading.Lock()
+
+    def _conectar(self) -> sqlite3.Connection:
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        conexion = sqlite3.connect(self.ruta, timeout=5, check_same_thread=False)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        for sentencia in ESQUEMA:
+            conexion.execute(sentencia)
+        conexion.commit()
+        return conexion
+
+    # --- Escritura ---
+
+    def registrar(self, resultado: Dict, subyacente: str = 'SPX') -> bool:
+        """
+        Encola un resultado de ejecutar_calculo_completo para guardarlo
+
+        La fila se arma aquí y no en el hilo escritor: el llamador puede seguir
+        modificando su resultado sin afectar lo registrado.
+
+        Returns:
+            False si la cola estaba llena o el resultado no se pudo convertir
+        """
+        try:
+            fila = _fila(time.time(), subyacente, resultado)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"⚠️ Resultado no registrado en el diario: {e}")
+            return False
+
+        self._iniciar_escritor()
+        try:
+            self._cola.put_nowait(fila)
+            return True
+        except queue.Full:
+            self.descartados += 1
+            return False
+
+    def _iniciar_escritor(self):
+        if self._escritor is not None:
+            return
+        with self._lock_escritor:
+            if self._escritor is None:
+                self._escritor = threading.Thread(target=self._escribir, name='diario-calculos', daemon=True)
+                self._escritor.start()
+
+    def _escribir(self):
+        """
+        Bucle del hilo escritor: agrupa lo pendiente en una sola transacción
+        """
+        try:
+            conexion = self._conectar()
+        except sqlite3.Error as e:
+            print(f"⚠️ Diario no disponible: {e}")
+            conexion = None
+
+        sentencia = f"INSERT INTO calculos ({', '.join(COLUMNAS)}) VALUES ({', '.join('?' * len(COLUMNAS))})"
+        terminar = False
+        while not terminar:
+            lote = [self._cola.get()]
+            while len(lote) < FILAS_POR_TRANSACCION:
+                try:
+                    lote.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+
+            filas = [elemento for elemento in lote if elemento is not _FIN]
+            terminar = len(filas) < len(lote)
+
+            try:
+                if conexion is not None and filas:
+                    with conexion:
+                        conexion.executemany(sentencia, filas)
+                    self.escritos += len(filas)
+            except sqlite3.Error as e:
+                print(f"⚠️ No se pudo escribir el diario: {e}")
+            finally:
+                for _ in lote:
+                    self._cola.task_done()
+
+        if conexion is not None:
+            conexion.close()
+
+    def vaciar(self):
+        """
+        Espera a que todo lo encolado quede escrito en disco
+        """
+        if self._escritor is not None:
+            self._cola.join()
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente y detiene el hilo escritor
+        """
+        with self._lock_escritor:
+            if self._escritor is not None:
+                self._cola.put(_FIN)
+                self._escritor.join()
+                self._escritor = None
+        with self._lock_lectura:
+            if self._lectura is not None:
+                self._lectura.close()
+                self._lectura = None
+
+    # --- Consultas ---
+
+    def consultar(self, desde=None, hasta=None, ala: Optional[int] = None, periodo: Optional[str] = None,
+                  buffer: Optional[int] = None, subyacente: str = 'SPX', limite: Optional[int] = None,
+                  incluir_resultado: bool = False) -> List[Dict]:
+        """
+        Busca cálculos del historial (ordenados por fecha de registro)
+
+        Args:
+            desde / hasta: datetime, 'YYYY-MM-DD[ HH:MM]' o epoch (hasta es exclusivo)
+            ala, periodo, buffer: Filtros opcionales de parámetros
+            subyacente: Subyacente registrado
+            limite: Máximo de filas (las más recientes)
+            incluir_resultado: Agregar el resultado completo (JSON) de cada cálculo
+
+        Returns:
+            Lista de dicts (uno por cálculo)
+        """
+        condiciones, valores = ["subyacente = ?"], [subyacente]
+        for columna, valor in (('ala', ala), ('periodo', periodo), ('buffer', buffer)):
+            if valor is not None:
+                condiciones.append(f"{columna} = ?")
+                valores.append(valor)
+        if desde is not None:
+            condiciones.append("registrado >= ?")
+            valores.append(_a_epoch(desde))
+        if hasta is not None:
+            condiciones.append("registrado < ?")
+            valores.append(_a_epoch(hasta))
+
+        columnas = [c for c in COLUMNAS if incluir_resultado or c != 'resultado']
+        consulta = f"SELECT {', '.join(columnas)} FROM calculos WHERE {' AND '.join(condiciones)}"
+        if limite is not None:
+            consulta = f"SELECT * FROM ({consulta} ORDER BY registrado DESC LIMIT ?) ORDER BY registrado"
+            valores.append(int(limite))
+        else:
+            consulta += " ORDER BY registrado"
+
+        with self._lock_lectura:
+            if self._lectura is None:
+                self._lectura = self._conectar()
+            filas = self._lectura.execute(consulta, valores).fetchall()
+
+        resultados = [dict(zip(columnas, fila)) for fila in filas]
+        for r in resultados:
+            for columna in COLUMNAS_STRIKE:
+                r[columna] = _strike(r[columna])
+        if incluir_resultado:
+            for r in resultados:
+                r['resultado'] = json.loads(r['resultado']) if r['resultado'] else None
+        return resultados
+
+
+def _fila(registrado: float, subyacente: str, resultado: Dict) -> tuple:
+    """
+    Convierte un resultado del agente en una fila de la tabla
+    """
+    datos = resultado['datos_mercado']
+    parametros = resultado['parametros']
+    strikes = resultado['strikes']
+    valoracion = resultado.get('valoracion') or {}
+    return (
+        registrado, subyacente, datos.get('fecha_datos'), datos.get('fecha_objetivo'), datos.get('fuente_datos'),
+        float(datos['spx_valor']), float(datos['vix_valor']),
+        int(parametros['ala_elegida']), parametros['periodo_temporal'], int(parametros['buffer_agregado']),
+        parametros.get('delta_objetivo'), float(parametros['iv_puntos_calculado']),
+        float(strikes['buy_put']), float(strikes['sell_put']), float(strikes['sell_call']), float(strikes['buy_call']),
+        float(strikes['rango_profit']),
+        _opcional(valoracion.get('credito_neto')), _opcional(valoracion.get('riesgo_maximo')),
+        json.dumps(resultado, default=_a_json, ensure_ascii=False)
+    )
+
+
+def _strike(valor):
+    """
+    Strike leído de SQLite: entero si no tiene decimales
+    """
+    if valor is None:
+        return None
+    valor = float(valor)
+    return int(valor) if valor.is_integer() else valor
+
+
+def _opcional(valor) -> Optional[float]:
+    return None if valor is None else float(valor)
+
+
+def _a_json(valor):
+    """
+    Convierte tipos de NumPy a tipos nativos al serializar
+    """
+    if hasattr(valor, 'tolist'):
+        return valor.tolist()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def _a_epoch(valor) -> float:
+    """
+    Acepta datetime, texto ISO ('YYYY-MM-DD' o con hora) o epoch
+    """
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, datetime):
+        return valor.timestamp()
+    return datetime.fromisoformat(str(valor)).timestamp()
+
+
+_diario_compartido = None
+_lock_compartido = threading.Lock()
+
+
+def obtener_diario_compartido() -> DiarioCalculos:
+    """
+    Devuelve el diario compartido por los puntos de entrada (se vacía al salir).
+
+    Variables de entorno:
+        IRON_CONDOR_DIARIO_DB: Ruta del archivo SQLite
+    """
+    global _diario_compartido
+
+    with _lock_compartido:
+        if _diario_compartido is None:
+            _diario_compartido = DiarioCalculos(ruta=os.environ.get("IRON_CONDOR_DIARIO_DB", RUTA_DIARIO_DEFAULT))
+            atexit.register(_diario_compartido.cerrar)
+        return _diario_compartido
+
+
+def main():
+    """
+    Consulta del historial por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Historial de cálculos de iron condor")
+    parser.add_argument('--ruta', default=os.environ.get("IRON_CONDOR_DIARIO_DB", RUTA_DIARIO_DEFAULT))
+    parser.add_argument('--desde', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('--hasta', help="Fecha final exclusiva (YYYY-MM-DD)")
+    parser.add_argument('--ala', type=int)
+    parser.add_argument('--periodo', choices=['diario', 'semanal', 'mensual', 'anual'])
+    parser.add_argument('--buffer', type=int)
+    parser.add_argument('--limite', type=int, default=50, help="Últimos N cálculos (0 = todos)")
+    args = parser.parse_args()
+
+    try:
+        diario = DiarioCalculos(args.ruta)
+        inicio = time.perf_counter()
+        filas = diario.consultar(desde=args.desde, hasta=args.hasta, ala=args.ala, periodo=args.periodo,
+                                 buffer=args.buffer, limite=args.limite or None)
+        milisegundos = (time.perf_counter() - inicio) * 1000
+        diario.cerrar()
+    except (sqlite3.Error, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print("\n" + "="*100)
+    print("📒 HISTORIAL DE CÁLCULOS")
+    print("="*100)
+    print(f"{'Registrado':<20} {'SPX':>9} {'VIX':>6} {'Ala':>4} {'Período':<8} {'Buf':>4} "
+          f"{'Buy Put':>8} {'Sell Put':>8} {'Sell Call':>9} {'Buy Call':>8} {'Crédito':>8}")
+    print("-"*100)
+    for f in filas:
+        credito = '-' if f['credito_neto'] is None else f"{f['credito_neto']:.2f}"
+        print(f"{datetime.fromtimestamp(f['registrado']).strftime('%Y-%m-%d %H:%M:%S'):<20} "
+              f"{f['spx']:>9,.2f} {f['vix']:>6.2f} {f['ala']:>4} {f['periodo']:<8} {f['buffer']:>4} "
+              f"{f['buy_put']:>8} {f['sell_put']:>8} {f['sell_call']:>9} {f['buy_call']:>8} {credito:>8}")
+    print("="*100)
+    print(f"✅ {len(filas):,} cálculos en {milisegundos:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Escáner de Condors - Iron Condor SPX
+Recorre todas las combinaciones de strikes de una cadena de opciones local y
+devuelve los mejores iron condors por crédito/riesgo, probabilidad de ganancia
+o valor esperado
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import heapq
+import math
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from motor_vectorizado import DIAS_TRADING_ANIO, dias_horizonte
+from valoracion_black_scholes import cdf_normal, valorar_opciones
+
+CRITERIOS = ('credito_riesgo', 'prob_ganancia', 'valor_esperado')
+PRECIOS = ('natural', 'medio')
+MAX_CELDAS_BLOQUE = 1_000_000  # Combinaciones put × call evaluadas por bloque
+
+
+def _spreads_lado(bloque: Dict[str, np.ndarray], spot: float, es_call: bool,
+                  ancho_min: float, ancho_max: float, distancia_min: float, distancia_max: float,
+                  precio: str, oi_minimo: float, podar: bool, misma_ala: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Enumera los spreads verticales vendidos de un lado (matriz corto × largo)
+
+    Con misma_ala la poda solo compara spreads del mismo ancho: el spread de otro
+    ancho que domina a uno puede no tener pareja del otro lado.
+
+    Returns:
+        Columnas 'corto', 'largo', 'credito' y 'ancho' de los spreads válidos
+    """
+    strike, bid, ask = bloque['strike'], bloque['bid'], bloque['ask']
+    validos = np.isfinite(bid) & np.isfinite(ask)
+    if oi_minimo:
+        validos &= bloque['oi'] >= oi_minimo
+    strike, bid, ask = strike[validos], bid[validos], ask[validos]
+
+    if precio == 'medio':
+        venta = compra = 0.5 * (bid + ask)
+    else:
+        venta, compra = bid, ask
+
+    distancia = strike - spot if es_call else spot - strike
+    cortos = np.flatnonzero((distancia >= distancia_min) & (distancia <= distancia_max))
+
+    # Matriz corto × largo: el largo está más lejos del dinero que el corto
+    ancho = (strike[None, :] - strike[cortos, None]) if es_call else (strike[cortos, None] - strike[None, :])
+    credito = venta[cortos, None] - compra[None, :]
+    mascara = (ancho >= ancho_min) & (ancho <= ancho_max) & (credito > 0)
+
+    if podar and not misma_ala:
+        # Mismo corto: un ala más ancha sin más crédito está dominada
+        orden = slice(None) if es_call else slice(None, None, -1)
+        por_ancho = np.where(mascara, credito, -np.inf)[:, orden]
+        previo = np.maximum.accumulate(por_ancho, axis=1)
+        previo = np.concatenate([np.full((previo.shape[0], 1), -np.inf), previo[:, :-1]], axis=1)
+        mascara &= (por_ancho > previo)[:, orden]
+
+    filas, columnas = np.nonzero(mascara)
+    spreads = {
+        'corto': strike[cortos[filas]],
+        'largo': strike[columnas],
+        'credito': credito[filas, columnas],
+        'ancho': ancho[filas, columnas]
+    }
+
+    if podar and spreads['corto'].size:
+        spreads = _podar_dominados(spreads, spot, es_call, misma_ala)
+
+    return spreads
+
+
+def _podar_dominados(spreads: Dict[str, np.ndarray], spot: float, es_call: bool,
+                     misma_ala: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Elimina spreads dominados: otro spread igual o más alejado del dinero, con ala
+    igual o más estrecha (exactamente igual si misma_ala), cobra al menos el mismo crédito.
+
+    Un spread dominado nunca mejora el crédito/riesgo, la probabilidad de ganancia
+    ni el valor esperado del condor en el que participe.
+    """
+    distancia = spreads['corto'] - spot if es_call else spot - spreads['corto']
+    orden = np.argsort(-distancia, kind='stable')
+    ancho = spreads['ancho'][orden]
+    credito = spreads['credito'][orden]
+
+    dominado = np.zeros(orden.size, dtype=bool)
+    for limite in np.unique(ancho):
+        # Mejor crédito previo (más alejado del dinero) entre alas <= limite (o == limite)
+        comparables = ancho == limite if misma_ala else ancho <= limite
+        candidatos = np.where(comparables, credito, -np.inf)
+        previo = np.maximum.accumulate(candidatos)
+        previo = np.concatenate([[-np.inf], previo[:-1]])
+        dominado |= (ancho == limite) & (previo >= credito)
+
+    conservar = np.sort(orden[~dominado])
+    return {k: v[conservar] for k, v in spreads.items()}
+
+
+def _valor_modelo_spread(spot: float, corto: np.ndarray, largo: np.ndarray, es_call: bool,
+                         vol: float, tiempo: float) -> np.ndarray:
+    """
+    Pago esperado del spread al vencimiento bajo el modelo lognormal (tasa 0)
+    """
+    return (valorar_opciones(es_call, spot, corto, vol, tiempo)['precio']
+            - valorar_opciones(es_call, spot, largo, vol, tiempo)['precio'])
+
+
+def _prob_entre(spot: float, inferior, superior, vol: float, tiempo: float) -> np.ndarray:
+    """
+    Probabilidad lognormal de que el subyacente termine entre dos niveles
+    """
+    vol_raiz_t = vol * math.sqrt(tiempo)
+
+    def prob_mayor(nivel):
+        nivel = np.maximum(np.asarray(nivel, dtype=np.float64), 1e-12)
+        return cdf_normal((np.log(spot / nivel) - 0.5 * vol_raiz_t ** 2) / vol_raiz_t)
+
+    return prob_mayor(inferior) - prob_mayor(superior)
+
+
+def escanear_vencimiento(cadena, vencimiento: str, spot: float, vol_modelo: Optional[float] = None,
+                         criterio: str = 'credito_riesgo', top: int = 10,
+                         ancho_min: float = 5, ancho_max: float = 50,
+                         distancia_min: float = 0, distancia_max: float = math.inf,
+                         credito_minimo: float = 0.05, misma_ala: bool = False,
+                         precio: str = 'natural', oi_minimo: float = 0, podar: bool = False) -> List[Dict]:
+    """
+    Escanea todos los iron condors de un vencimiento
+
+    Args:
+        cadena: CadenaOpciones con bid/ask por strike
+        vencimiento: Vencimiento 'YYYY-MM-DD'
+        spot: Precio del subyacente
+        vol_modelo: Volatilidad en decimal para probabilidades y valor esperado
+                    (por defecto la IV del strike más cercano al spot)
+        criterio: 'credito_riesgo', 'prob_ganancia' o 'valor_esperado'
+        top: Número de condors a devolver
+        ancho_min, ancho_max: Ancho permitido de cada ala en puntos
+        distancia_min, distancia_max: Distancia permitida de los vendidos al spot
+        credito_minimo: Crédito neto mínimo del condor
+        misma_ala: True para exigir el mismo ancho en puts y calls
+        precio: 'natural' (vender al bid, comprar al ask) o 'medio'
+        oi_minimo: Open interest mínimo de cada pata
+        podar: True para descartar antes spreads dominados; conserva el mejor condor pero
+               no el resto del top (un condor dominado puede superar al siguiente)
+
+    Returns:
+        Lista de condors ordenada de mejor a peor
+    """
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Criterio debe ser uno de: {list(CRITERIOS)}")
+    if precio not in PRECIOS:
+        raise ValueError(f"Precio debe ser uno de: {list(PRECIOS)}")
+
+    tiempo = dias_horizonte(fecha_objetivo=vencimiento) / DIAS_TRADING_ANIO
+    opciones = dict(ancho_min=ancho_min, ancho_max=ancho_max, distancia_min=distancia_min,
+                    distancia_max=distancia_max, precio=precio, oi_minimo=oi_minimo, podar=podar,
+                    misma_ala=misma_ala)
+    puts = _spreads_lado(cadena.columnas(vencimiento, 'put'), spot, False, **opciones)
+    calls = _spreads_lado(cadena.columnas(vencimiento, 'call'), spot, True, **opciones)
+    if puts['corto'].size == 0 or calls['corto'].size == 0:
+        return []
+
+    if vol_modelo is None:
+        vol_modelo = _vol_atm(cadena, vencimiento, spot)
+
+    # El valor esperado es separable por lado: crédito menos pago esperado del spread
+    ve_put = puts['credito'] - _valor_modelo_spread(spot, puts['corto'], puts['largo'], False, vol_modelo, tiempo)
+    ve_call = calls['credito'] - _valor_modelo_spread(spot, calls['corto'], calls['largo'], True, vol_modelo, tiempo)
+
+    mejores = []
+    filas_bloque = max(1, MAX_CELDAS_BLOQUE // calls['corto'].size)
+
+    for inicio in range(0, puts['corto'].size, filas_bloque):
+        p = slice(inicio, inicio + filas_bloque)
+        credito = puts['credito'][p, None] + calls['credito'][None, :]
+        ancho = np.maximum(puts['ancho'][p, None], calls['ancho'][None, :])
+        riesgo = ancho - credito
+
+        validos = (riesgo > 0) & (credito >= credito_minimo)
+        if misma_ala:
+            validos &= puts['ancho'][p, None] == calls['ancho'][None, :]
+
+        if criterio == 'credito_riesgo':
+            puntaje = credito / np.where(validos, riesgo, 1.0)
+        elif criterio == 'valor_esperado':
+            puntaje = ve_put[p, None] + ve_call[None, :]
+        else:
+            puntaje = _prob_entre(spot, puts['corto'][p, None] - credito,
+                                  calls['corto'][None, :] + credito, vol_modelo, tiempo)
+        puntaje = np.where(validos, puntaje, -np.inf).reshape(-1)
+
+        # Solo los top del bloque compiten por entrar en el heap
+        k = min(top, puntaje.size)
+        for plano in np.argpartition(puntaje, puntaje.size - k)[-k:]:
+            valor = float(puntaje[plano])
+            if valor == -np.inf:
+                continue
+            fila, columna = divmod(int(plano), calls['corto'].size)
+            entrada = (valor, inicio + fila, columna)
+            if len(mejores) < top:
+                heapq.heappush(mejores, entrada)
+            elif entrada > mejores[0]:
+                heapq.heapreplace(mejores, entrada)
+
+    condors = []
+    for valor, i, j in sorted(mejores, reverse=True):
+        credito = float(puts['credito'][i] + calls['credito'][j])
+        riesgo = float(max(puts['ancho'][i], calls['ancho'][j]) - credito)
+        inferior = float(puts['corto'][i]) - credito
+        superior = float(calls['corto'][j]) + credito
+        condors.append({
+            'vencimiento': vencimiento,
+            'buy_put': _strike(puts['largo'][i]),
+            'sell_put': _strike(puts['corto'][i]),
+            'sell_call': _strike(calls['corto'][j]),
+            'buy_call': _strike(calls['largo'][j]),
+            'ancho_put': _strike(puts['ancho'][i]),
+            'ancho_call': _strike(calls['ancho'][j]),
+            'credito': round(credito, 2),
+            'riesgo_maximo': round(riesgo, 2),
+            'ratio_credito_riesgo': round(credito / riesgo, 4),
+            'breakeven_inferior': round(inferior, 2),
+            'breakeven_superior': round(superior, 2),
+            'prob_ganancia': round(float(_prob_entre(spot, inferior, superior, vol_modelo, tiempo)), 4),
+            'valor_esperado': round(float(ve_put[i] + ve_call[j]), 2),
+            'puntaje': valor
+        })
+
+    return condors
+
+
+def escanear_cadena(cadena, spot: float, vencimientos: Optional[List[str]] = None,
+                    top: int = 10, **kwargs) -> List[Dict]:
+    """
+    Escanea varios vencimientos y devuelve los mejores condors entre todos
+
+    Args:
+        cadena: CadenaOpciones
+        spot: Precio del subyacente
+        vencimientos: Vencimientos a escanear (por defecto el primero desde hoy)
+        top: Número de condors a devolver
+        **kwargs: Restricciones y criterio de escanear_vencimiento
+    """
+    if vencimientos is None:
+        primero = cadena.vencimiento_para(time.strftime('%Y-%m-%d'))
+        vencimientos = [primero] if primero else []
+
+    condors = []
+    for vencimiento in vencimientos:
+        condors.extend(escanear_vencimiento(cadena, vencimiento, spot, top=top, **kwargs))
+
+    return heapq.nlargest(top, condors, key=lambda c: c['puntaje'])
+
+
+def _vol_atm(cadena, vencimiento: str, spot: float) -> float:
+    """
+    IV del strike más cercano al spot (promedio de put y call)
+    """
+    valores = []
+    for tipo in ('put', 'call'):
+        bloque = cadena.columnas(vencimiento, tipo)
+        iv = bloque['iv']
+        if np.isfinite(iv).any():
+            cercano = np.nanargmin(np.where(np.isfinite(iv), np.abs(bloque['strike'] - spot), np.nan))
+            valores.append(float(iv[cercano]))
+
+    if not valores:
+        raise ValueError(f"La cadena no tiene IV para {vencimiento}; indique vol_modelo")
+    return sum(valores) / len(valores)
+
+
+def _strike(valor) -> float:
+    valor = float(valor)
+    return int(valor) if valor.is_integer() else valor
+
+
+def main():
+    """
+    Función principal del escáner por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Escáner de iron condors sobre una cadena de opciones")
+    parser.add_argument('--cadena', required=True, help="Snapshot CSV/Parquet de la cadena")
+    parser.add_argument('--spx', type=float, help="Valor del SPX (por defecto datos del mercado)")
+    parser.add_argument('--vencimiento', action='append', help="Vencimiento(s) YYYY-MM-DD")
+    parser.add_argument('--criterio', default='credito_riesgo', choices=list(CRITERIOS))
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--ancho-min', type=float, default=5)
+    parser.add_argument('--ancho-max', type=float, default=50)
+    parser.add_argument('--distancia-min', type=float, default=0)
+    parser.add_argument('--distancia-max', type=float, default=math.inf)
+    parser.add_argument('--credito-minimo', type=float, default=0.05)
+    parser.add_argument('--misma-ala', action='store_true')
+    parser.add_argument('--precio', default='natural', choices=list(PRECIOS))
+    parser.add_argument('--vol', type=float, help="Volatilidad del modelo en porcentaje (por defecto IV ATM)")
+    args = parser.parse_args()
+
+    from cadena_opciones import cargar_cadena
+
+    try:
+        cadena = cargar_cadena(args.cadena)
+        if args.spx is None:
+            from agente_iron_condor_final import AgenteIronCondorSPX
+
+            datos = AgenteIronCondorSPX().obtener_datos_mercado()
+            if not datos:
+                raise Exception("No se pudieron obtener datos del mercado")
+            args.spx = datos['spx_valor']
+
+        inicio = time.perf_counter()
+        condors = escanear_cadena(
+            cadena, args.spx, vencimientos=args.vencimiento, top=args.top, criterio=args.criterio,
+            vol_modelo=None if args.vol is None else args.vol / 100,
+            ancho_min=args.ancho_min, ancho_max=args.ancho_max,
+            distancia_min=args.distancia_min, distancia_max=args.distancia_max,
+            credito_minimo=args.credito_minimo, misma_ala=args.misma_ala, precio=args.precio
+        )
+        segundos = time.perf_counter() - inicio
+
+        print("\n" + "="*100)
+        print(f"🔎 ESCÁNER DE IRON CONDORS - SPX ${args.spx:,.2f} - criterio: {args.criterio}")
+        print("="*100)
+        print(f"{'Vencimiento':>11} {'Strikes':>25} {'Crédito':>8} {'Riesgo':>8} "
+              f"{'C/R':>7} {'P(G)':>7} {'VE':>7}")
+        print("-"*100)
+        for c in condors:
+            strikes = f"{c['buy_put']}/{c['sell_put']}/{c['sell_call']}/{c['buy_call']}"
+            print(f"{c['vencimiento']:>11} {strikes:>25} {c['credito']:>8.2f} {c['riesgo_maximo']:>8.2f} "
+                  f"{c['ratio_credito_riesgo']:>7.3f} {c['prob_ganancia']:>7.2%} {c['valor_esperado']:>7.2f}")
+        print("-"*100)
+        print(f"⏱️ {len(condors)} condors en {segundos:.3f}s")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
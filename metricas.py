@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Métricas - Iron Condor SPX
+Registro en proceso de contadores e histogramas de latencia por fase, exportable
+en formato de texto de Prometheus. Desactivado (sin costo) salvo que se defina
+IRON_CONDOR_METRICAS o se llame a activar()
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, Tuple
+
+# Límites de los buckets de latencia (segundos)
+BUCKETS_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+AYUDA = {
+    'iron_condor_fase_segundos': "Duración de cada fase del cálculo completo",
+    'iron_condor_render_segundos': "Duración del render de cada vista de la interfaz",
+    'iron_condor_cache_total': "Consultas al cache de cotizaciones por resultado (hit/miss)",
+    'iron_condor_descargas_total': "Cotizaciones pedidas al proveedor",
+    'iron_condor_errores_descarga_total': "Cotizaciones que el proveedor no pudo entregar",
+    'iron_condor_errores_total': "Cálculos terminados con excepción, por fase",
+    'iron_condor_reintentos_total': "Reintentos de descarga tras un fallo del proveedor",
+    'iron_condor_circuito_aperturas_total': "Veces que el cortacircuitos pasó a abierto",
+    'iron_condor_circuito_rechazos_total': "Descargas rechazadas con el circuito abierto",
+    'iron_condor_respaldos_total': "Resultados servidos con el último dato bueno",
+    'iron_condor_alertas_total': "Alertas de precio disparadas, por lado del condor"
+}
+
+
+class RegistroMetricas:
+    """
+    Contadores e histogramas identificados por nombre + etiquetas
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS_SEGUNDOS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+
+    def contar(self, nombre: str, valor: float = 1, etiquetas: Tuple = ()):
+        clave = (nombre, etiquetas)
+        with self._lock:
+            self._contadores[clave] = self._contadores.get(clave, 0) + valor
+
+    def observar(self, nombre: str, valor: float, etiquetas: Tuple = ()):
+        clave = (nombre, etiquetas)
+        posicion = bisect_left(self.buckets, valor)
+        with self._lock:
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                # [conteo por bucket (+Inf al final), suma, cantidad]
+                histograma = self._histogramas[clave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histograma[0][posicion] += 1
+            histograma[1] += valor
+            histograma[2] += 1
+
+    def instantanea(self) -> Dict:
+        """
+        Copia de los valores actuales: {'contadores': {...}, 'histogramas': {...}}
+        """
+        with self._lock:
+            return {
+                'contadores': {_nombre_serie(n, e): v for (n, e), v in self._contadores.items()},
+                'histogramas': {
+                    _nombre_serie(n, e): {'cantidad': h[2], 'suma': h[1], 'buckets': list(h[0])}
+                    for (n, e), h in self._histogramas.items()
+                }
+            }
+
+    def exportar_prometheus(self) -> str:
+        """
+        Texto en el formato de exposición de Prometheus
+        """
+        with self._lock:
+            contadores = sorted(self._contadores.items())
+            histogramas = sorted((clave, [list(h[0]), h[1], h[2]]) for clave, h in self._histogramas.items())
+
+        lineas = []
+        anterior = None
+        for (nombre, etiquetas), valor in contadores:
+            if nombre != anterior:
+                lineas += _cabecera(nombre, 'counter')
+                anterior = nombre
+            lineas.append(f"{nombre}{_etiquetas(etiquetas)} {_numero(valor)}")
+
+        for (nombre, etiquetas), (conteos, suma, cantidad) in histogramas:
+            if nombre != anterior:
+                lineas += _cabecera(nombre, 'histogram')
+                anterior = nombre
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + (float('inf'),), conteos):
+                acumulado += conteo
+                le = '+Inf' if limite == float('inf') else repr(limite)
+                lineas.append(f"{nombre}_bucket{_etiquetas(etiquetas + (('le', le),))} {acumulado}")
+            lineas.append(f"{nombre}_sum{_etiquetas(etiquetas)} {_numero(suma)}")
+            lineas.append(f"{nombre}_count{_etiquetas(etiquetas)} {cantidad}")
+
+        return "\n".join(lineas) + "\n" if lineas else ""
+
+    def reiniciar(self):
+        with self._lock:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+
+class _Medicion:
+    """
+    Context manager que observa la duración del bloque en un histograma
+    """
+
+    __slots__ = ('nombre', 'etiquetas', 'inicio')
+
+    def __init__(self, nombre: str, etiquetas: Tuple):
+        self.nombre = nombre
+        self.etiquetas = etiquetas
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        REGISTRO.observar(self.nombre, time.perf_counter() - self.inicio, self.etiquetas)
+        # Solo errores: st.rerun()/st.stop() y KeyboardInterrupt derivan de BaseException
+        if tipo is not None and issubclass(tipo, Exception):
+            REGISTRO.contar('iron_condor_errores_total', 1, self.etiquetas)
+        return False
+
+
+class _SinMedicion:
+    """
+    Context manager vacío usado cuando las métricas están desactivadas
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+
+REGISTRO = RegistroMetricas()
+_SIN_MEDICION = _SinMedicion()
+_activo = os.environ.get('IRON_CONDOR_METRICAS', '').lower() not in ('', '0', 'false', 'no')
+
+
+def activar(activo: bool = True):
+    """
+    Activa o desactiva la recolección de métricas en este proceso
+    """
+    global _activo
+    _activo = activo
+
+
+def activo() -> bool:
+    return _activo
+
+
+def contar(nombre: str, valor: float = 1, **etiquetas):
+    """
+    Incrementa un contador (no hace nada si las métricas están desactivadas)
+    """
+    if _activo:
+        REGISTRO.contar(nombre, valor, tuple(sorted(etiquetas.items())))
+
+
+def observar(nombre: str, valor: float, **etiquetas):
+    """
+    Registra un valor en un histograma
+    """
+    if _activo:
+        REGISTRO.observar(nombre, valor, tuple(sorted(etiquetas.items())))
+
+
+def medir(nombre: str, **etiquetas):
+    """
+    Mide la duración de un bloque:
+
+        with medir('iron_condor_fase_segundos', fase='strikes'):
+            ...
+
+    Si el bloque lanza una excepción también cuenta iron_condor_errores_total.
+    """
+    if not _activo:
+        return _SIN_MEDICION
+    return _Medicion(nombre, tuple(sorted(etiquetas.items())))
+
+
+def medido(nombre: str, **etiquetas):
+    """
+    Decorador equivalente a envolver la función completa con medir()
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(nombre, **etiquetas):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def exportar_prometheus() -> str:
+    return REGISTRO.exportar_prometheus()
+
+
+def _nombre_serie(nombre: str, etiquetas: Tuple) -> str:
+    return nombre + _etiquetas(etiquetas)
+
+
+def _etiquetas(etiquetas: Tuple) -> str:
+    if not etiquetas:
+        return ''
+    return '{' + ','.join(f'{clave}="{_escapar(valor)}"' for clave, valor in etiquetas) + '}'
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _cabecera(nombre: str, tipo: str):
+    lineas = [f"# HELP {nombre} {AYUDA[nombre]}"] if nombre in AYUDA else []
+    return lineas + [f"# TYPE {nombre} {tipo}"]
+
+
+def _numero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
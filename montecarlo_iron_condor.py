@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo - Iron Condor SPX
+Estima probabilidad de ganancia, P&L esperado y probabilidad de toque de los strikes
+vendidos simulando el SPX hasta el vencimiento (lognormal o bootstrap histórico)
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import math
+import sys
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from backtest_iron_condor import pnl_vencimiento
+from motor_vectorizado import DIAS_TRADING_ANIO, PERIODOS_DISPONIBLES, dias_horizonte
+
+TAMANO_BLOQUE_DEFAULT = 50_000  # Trayectorias por bloque (memoria acotada)
+PASOS_POR_DIA_DEFAULT = 8       # Observaciones intradía para detectar toques
+
+
+def resolucion_por_presupuesto(dias: int, n_trayectorias: int, presupuesto: int,
+                               pasos_por_dia: int = PASOS_POR_DIA_DEFAULT):
+    """
+    Pasos por día y trayectorias que entran en un presupuesto de normales (trayectorias × pasos)
+
+    Primero se resignan pasos intradía (hasta 1 por día) y después trayectorias: un
+    horizonte anual con 8 pasos diarios costaría 250 veces más que uno diario.
+
+    Returns:
+        (pasos_por_dia, n_trayectorias)
+    """
+    pasos_por_dia = max(1, min(pasos_por_dia, presupuesto // (n_trayectorias * dias)))
+    return pasos_por_dia, max(1, min(n_trayectorias, presupuesto // (dias * pasos_por_dia)))
+
+
+def _simular_bloque(tarea) -> Dict[str, float]:
+    """
+    Simula un bloque de trayectorias y devuelve solo estadísticos acumulables
+
+    La memoria es O(tamaño del bloque): las trayectorias se avanzan paso a paso
+    guardando únicamente el precio actual y sus mínimos/máximos.
+    """
+    (semilla, n, spx, sigma, dias, pasos_por_dia, strikes, credito, retornos) = tarea
+    rng = np.random.default_rng(semilla)
+
+    log_precio = np.full(n, math.log(spx))
+    minimo = log_precio.copy()
+    maximo = log_precio.copy()
+
+    if retornos is None:
+        pasos = dias * pasos_por_dia
+        dt = dias / DIAS_TRADING_ANIO / pasos
+        media = -0.5 * sigma ** 2 * dt
+        desvio = sigma * math.sqrt(dt)
+        for _ in range(pasos):
+            log_precio += media + desvio * rng.standard_normal(n)
+            np.minimum(minimo, log_precio, out=minimo)
+            np.maximum(maximo, log_precio, out=maximo)
+    else:
+        for _ in range(dias):
+            log_precio += retornos[rng.integers(0, retornos.size, n)]
+            np.minimum(minimo, log_precio, out=minimo)
+            np.maximum(maximo, log_precio, out=maximo)
+
+    spx_final = np.exp(log_precio)
+    pnl = pnl_vencimiento(spx_final, strikes['buy_put'], strikes['sell_put'],
+                          strikes['sell_call'], strikes['buy_call'], credito)
+    toque_put = minimo <= math.log(strikes['sell_put'])
+    toque_call = maximo >= math.log(strikes['sell_call'])
+
+    return {
+        'n': n,
+        'ganancia': float(np.count_nonzero(pnl > 0)),
+        'perdida_maxima': float(np.count_nonzero((spx_final <= strikes['buy_put']) |
+                                                 (spx_final >= strikes['buy_call']))),
+        'suma_pnl': float(pnl.sum()),
+        'suma_pnl2': float(np.square(pnl).sum()),
+        'toque_put': float(np.count_nonzero(toque_put)),
+        'toque_call': float(np.count_nonzero(toque_call)),
+        'toque': float(np.count_nonzero(toque_put | toque_call))
+    }
+
+
+def simular_iron_condor(spx_valor: float, vix_porcentaje: float, strikes: Dict,
+                        periodo: Optional[str] = None, fecha_objetivo: Optional[str] = None,
+                        n_trayectorias: int = 1_000_000, modelo: str = 'lognormal',
+                        retornos_historicos: Optional[np.ndarray] = None, credito: float = 0.0,
+                        pasos_por_dia: int = PASOS_POR_DIA_DEFAULT,
+                        tamano_bloque: int = TAMANO_BLOQUE_DEFAULT,
+                        procesos: int = 1, semilla: Optional[int] = None) -> Dict:
+    """
+    Simula el SPX hasta el vencimiento y evalúa el iron condor
+
+    Args:
+        spx_valor: Valor actual del SPX
+        vix_porcentaje: VIX en porcentaje (volatilidad del modelo lognormal)
+        strikes: Dict con buy_put, sell_put, sell_call, buy_call (de calcular_strikes)
+        periodo / fecha_objetivo: Definen el horizonte de la simulación
+        n_trayectorias: Número total de trayectorias
+        modelo: 'lognormal' o 'bootstrap'
+        retornos_historicos: Log-retornos diarios para el modelo bootstrap
+        credito: Prima neta recibida en puntos (0 = solo payoff al vencimiento)
+        pasos_por_dia: Pasos intradía del modelo lognormal
+        tamano_bloque: Trayectorias por bloque
+        procesos: Procesos en paralelo (1 = proceso actual)
+        semilla: Semilla maestra; cada bloque usa un flujo independiente derivado
+
+    Returns:
+        Dict con probabilidades, P&L esperado y su error estándar
+    """
+    if modelo not in ('lognormal', 'bootstrap'):
+        raise ValueError("Modelo debe ser 'lognormal' o 'bootstrap'")
+    if n_trayectorias < 1:
+        raise ValueError("n_trayectorias debe ser al menos 1")
+    if tamano_bloque < 1:
+        raise ValueError("tamano_bloque debe ser al menos 1")
+    if modelo == 'bootstrap':
+        if retornos_historicos is None or len(retornos_historicos) == 0:
+            raise ValueError("El modelo bootstrap necesita retornos_historicos")
+        retornos = np.asarray(retornos_historicos, dtype=np.float64)
+    else:
+        retornos = None
+
+    dias = dias_horizonte(periodo, fecha_objetivo)
+    strikes = {k: float(strikes[k]) for k in ('buy_put', 'sell_put', 'sell_call', 'buy_call')}
+    sigma = vix_porcentaje / 100
+
+    # Un flujo aleatorio independiente por bloque: el resultado no depende de 'procesos'
+    tamanos = [tamano_bloque] * (n_trayectorias // tamano_bloque)
+    if n_trayectorias % tamano_bloque:
+        tamanos.append(n_trayectorias % tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    tareas = [
+        (s, n, spx_valor, sigma, dias, pasos_por_dia, strikes, credito, retornos)
+        for s, n in zip(semillas, tamanos)
+    ]
+
+    inicio = time.perf_counter()
+    if procesos <= 1:
+        parciales = [_simular_bloque(t) for t in tareas]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            parciales = list(pool.map(_simular_bloque, tareas))
+
+    total = {k: sum(p[k] for p in parciales) for k in parciales[0]}
+    n = total['n']
+    pnl_esperado = total['suma_pnl'] / n
+    varianza = max(total['suma_pnl2'] / n - pnl_esperado ** 2, 0.0)
+    prob_ganancia = total['ganancia'] / n
+
+    return {
+        'modelo': modelo,
+        'trayectorias': int(n),
+        'dias_horizonte': dias,
+        'prob_ganancia': prob_ganancia,
+        'error_prob_ganancia': math.sqrt(prob_ganancia * (1 - prob_ganancia) / n),
+        'prob_perdida_maxima': total['perdida_maxima'] / n,
+        'pnl_esperado': pnl_esperado,
+        'error_pnl_esperado': math.sqrt(varianza / n),
+        'prob_toque_put': total['toque_put'] / n,
+        'prob_toque_call': total['toque_call'] / n,
+        'prob_toque': total['toque'] / n,
+        'credito': credito,
+        'segundos': round(time.perf_counter() - inicio, 3)
+    }
+
+
+def simular_resultado(resultado: Dict, **kwargs) -> Dict:
+    """
+    Simula el iron condor devuelto por AgenteIronCondorSPX.ejecutar_calculo_completo
+    """
+    datos = resultado['datos_mercado']
+    return simular_iron_condor(
+        datos['spx_valor'], datos['vix_valor'], resultado['strikes'],
+        periodo=resultado['parametros']['periodo_temporal'],
+        fecha_objetivo=datos.get('fecha_objetivo'),
+        **kwargs
+    )
+
+
+def main():
+    """
+    Función principal de la simulación por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Monte Carlo del Iron Condor SPX")
+    parser.add_argument('--spx', type=float, help="Valor del SPX (por defecto datos del mercado)")
+    parser.add_argument('--vix', type=float, help="VIX en porcentaje (por defecto datos del mercado)")
+    parser.add_argument('--ala', type=int, default=25)
+    parser.add_argument('--periodo', default='diario', choices=list(PERIODOS_DISPONIBLES))
+    parser.add_argument('--buffer', type=int, default=10)
+    parser.add_argument('--trayectorias', type=int, default=1_000_000)
+    parser.add_argument('--modelo', default='lognormal', choices=['lognormal', 'bootstrap'])
+    parser.add_argument('--historico', help="CSV con fecha, spx, vix para el modelo bootstrap")
+    parser.add_argument('--credito', type=float,
+                        help="Prima neta recibida en puntos (por defecto crédito Black-Scholes, vol = VIX)")
+    parser.add_argument('--procesos', type=int, default=1)
+    parser.add_argument('--semilla', type=int)
+    args = parser.parse_args()
+
+    from agente_iron_condor_final import AgenteIronCondorSPX
+
+    try:
+        agente = AgenteIronCondorSPX()
+        if args.spx is None or args.vix is None:
+            datos = agente.obtener_datos_mercado()
+            if not datos:
+                raise Exception("No se pudieron obtener datos del mercado")
+            args.spx = datos['spx_valor'] if args.spx is None else args.spx
+            args.vix = datos['vix_valor'] if args.vix is None else args.vix
+
+        iv = agente.calcular_iv_puntos(args.spx, args.vix, args.periodo, args.buffer)
+        strikes = agente.calcular_strikes(args.spx, iv['iv_final'], args.ala)
+        if args.credito is None:
+            from valoracion_black_scholes import tiempo_vencimiento, valorar_iron_condor
+            args.credito = float(valorar_iron_condor(
+                args.spx, strikes['buy_put'], strikes['sell_put'], strikes['sell_call'], strikes['buy_call'],
+                args.vix / 100, tiempo_vencimiento(args.periodo)
+            )['credito_neto'])
+
+        retornos = None
+        if args.modelo == 'bootstrap':
+            from backtest_iron_condor import cargar_historico
+            spx_historico = cargar_historico(args.historico)['spx']
+            retornos = np.diff(np.log(spx_historico))
+
+        r = simular_iron_condor(args.spx, args.vix, strikes, periodo=args.periodo,
+                                n_trayectorias=args.trayectorias, modelo=args.modelo,
+                                retornos_historicos=retornos, credito=args.credito,
+                                procesos=args.procesos, semilla=args.semilla)
+
+        print("\n" + "="*70)
+        print("🎲 MONTE CARLO IRON CONDOR SPX")
+        print("="*70)
+        print(f"📈 SPX: ${args.spx:,.2f} | 📉 VIX: {args.vix:.2f}% | ⏱️ {r['dias_horizonte']} día(s)")
+        print(f"🎯 Iron Condor: {strikes['buy_put']}/{strikes['sell_put']}/"
+              f"{strikes['sell_call']}/{strikes['buy_call']}")
+        print(f"🔢 {r['trayectorias']:,} trayectorias ({r['modelo']}) en {r['segundos']:.2f}s")
+        print(f"💵 Crédito: {r['credito']:.2f} puntos")
+        print(f"\n   💰 Probabilidad de ganancia: {r['prob_ganancia']:.2%} (±{r['error_prob_ganancia']:.2%})")
+        print(f"   📉 Probabilidad de pérdida máxima: {r['prob_perdida_maxima']:.2%}")
+        print(f"   📊 P&L esperado: {r['pnl_esperado']:.2f} puntos (±{r['error_pnl_esperado']:.2f})")
+        print(f"   ⬇️ Prob. de tocar Sell Put: {r['prob_toque_put']:.2%}")
+        print(f"   ⬆️ Prob. de tocar Sell Call: {r['prob_toque_call']:.2%}")
+        print(f"   ⚠️ Prob. de tocar algún strike vendido: {r['prob_toque']:.2%}")
+        print("="*70)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Motor Vectorizado - Iron Condor SPX
+Versión por lotes de calcular_iv_puntos + calcular_strikes sobre arrays de NumPy,
+con resultados idénticos bit a bit a la versión escalar del agente
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import numpy as np
+from datetime import datetime
+from typing import Dict, Optional
+
+# Mismos factores temporales que AgenteIronCondorSPX.periodos_disponibles
+PERIODOS_DISPONIBLES = {
+    'diario': 252,
+    'semanal': 52,
+    'mensual': 12,
+    'anual': 1
+}
+DIAS_TRADING_ANIO = 252
+
+
+def redondear_2_decimales(valores: np.ndarray) -> np.ndarray:
+    """
+    Equivalente vectorizado de round(x, 2) de Python.
+
+    np.round escala por 100 y puede caer del lado equivocado en los empates
+    (ej: 2.675); esos pocos casos se resuelven con el round() de Python.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    escalado = valores * 100
+    redondeado = np.round(escalado) / 100
+
+    fraccion = np.abs(escalado - np.trunc(escalado))
+    dudosos = np.abs(fraccion - 0.5) < 1e-6
+    if dudosos.any():
+        indices = np.flatnonzero(dudosos)
+        plano = redondeado.reshape(-1)
+        origen = valores.reshape(-1)
+        plano[indices] = [round(float(v), 2) for v in origen[indices]]
+
+    return redondeado
+
+
+def redondear_multiplo_5_superior(valores: np.ndarray) -> np.ndarray:
+    """
+    Redondea al múltiplo de 5 superior (vectorizado)
+    """
+    return (np.ceil(np.asarray(valores, dtype=np.float64) / 5) * 5).astype(np.int64)
+
+
+def redondear_multiplo_5_inferior(valores: np.ndarray) -> np.ndarray:
+    """
+    Redondea al múltiplo de 5 inferior (vectorizado)
+    """
+    return (np.floor(np.asarray(valores, dtype=np.float64) / 5) * 5).astype(np.int64)
+
+
+def factores_tiempo(periodo, periodos_disponibles: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """
+    Convierte nombres de período (escalar o array) en factores temporales
+    """
+    periodos_disponibles = periodos_disponibles or PERIODOS_DISPONIBLES
+    nombres = np.asarray(periodo)
+
+    unicos, inversos = np.unique(nombres, return_inverse=True)
+    desconocidos = [str(p) for p in unicos if p not in periodos_disponibles]
+    if desconocidos:
+        raise ValueError(f"Período debe ser uno de: {list(periodos_disponibles.keys())}")
+
+    factores = np.array([periodos_disponibles[p] for p in unicos], dtype=np.int64)
+    return factores[inversos].reshape(nombres.shape)
+
+
+def dias_horizonte(periodo: Optional[str] = None, fecha_objetivo: Optional[str] = None) -> int:
+    """
+    Días de trading hasta el vencimiento
+
+    Args:
+        periodo: 'diario', 'semanal', 'mensual', 'anual'
+        fecha_objetivo: Fecha 'YYYY-MM-DD' (tiene prioridad sobre el período)
+    """
+    if fecha_objetivo and fecha_objetivo != 'Actual':
+        hoy = np.datetime64(datetime.now().strftime('%Y-%m-%d'))
+        return max(1, int(np.busday_count(hoy, np.datetime64(fecha_objetivo))))
+
+    return max(1, round(DIAS_TRADING_ANIO / PERIODOS_DISPONIBLES[periodo or 'diario']))
+
+
+def calcular_strikes_lote(spx_valor, vix_porcentaje, ala, periodo='diario', buffer=10,
+                          periodos_disponibles: Optional[Dict[str, int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Calcula IV en puntos y strikes del iron condor para muchos escenarios a la vez
+
+    Args:
+        spx_valor: Valores del SPX (escalar o array)
+        vix_porcentaje: VIX en porcentaje (escalar o array)
+        ala: Ancho del ala (escalar o array)
+        periodo: 'diario', 'semanal', 'mensual', 'anual' (escalar o array)
+        buffer: Buffer de seguridad en puntos (escalar o array)
+        periodos_disponibles: Factores temporales por período
+
+    Returns:
+        Dict de columnas (arrays con la forma común de las entradas)
+    """
+    spx, vix, alas, buffers = np.broadcast_arrays(
+        np.asarray(spx_valor, dtype=np.float64),
+        np.asarray(vix_porcentaje, dtype=np.float64),
+        np.asarray(ala, dtype=np.int64),
+        np.asarray(buffer)
+    )
+    factor = np.broadcast_to(factores_tiempo(periodo, periodos_disponibles), spx.shape)
+
+    # Mismo orden de operaciones que calcular_iv_puntos
+    vix_decimal = vix / 100
+    iv_anual = spx * vix_decimal
+    iv_periodo = iv_anual / np.sqrt(factor)
+    iv_final = redondear_2_decimales(iv_periodo + buffers)
+
+    # Mismo orden de operaciones que calcular_strikes
+    sell_put = redondear_multiplo_5_superior(spx - iv_final)
+    buy_put = sell_put - alas
+    sell_call = redondear_multiplo_5_inferior(spx + iv_final)
+    buy_call = sell_call + alas
+
+    distancia_put = spx - sell_put
+    distancia_call = sell_call - spx
+
+    return {
+        'spx_valor': spx,
+        'vix_valor': vix,
+        'iv_anual': redondear_2_decimales(iv_anual),
+        'iv_periodo': redondear_2_decimales(iv_periodo),
+        'iv_final': iv_final,
+        'factor_tiempo': factor,
+        'buffer_aplicado': buffers,
+        'sell_put': sell_put,
+        'buy_put': buy_put,
+        'sell_call': sell_call,
+        'buy_call': buy_call,
+        'ancho_ala': alas,
+        'rango_profit': sell_call - sell_put,
+        'distancia_spx_sell_put': distancia_put,
+        'distancia_spx_sell_call': distancia_call,
+        'simetria': np.abs(distancia_put - distancia_call)
+    }
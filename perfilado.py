@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Perfilado - Iron Condor SPX
+Perfilado opcional (determinista con cProfile o por muestreo) de las funciones
+del cálculo y de la interfaz, activado por variable de entorno o bandera de CLI.
+Cada ejecución perfilada se guarda en su propio archivo con pilas "folded"
+(compatibles con flamegraph.pl, speedscope e inferno)
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import contextvars
+import cProfile
+import inspect
+import itertools
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Dict, Optional
+
+MODOS = ('determinista', 'muestreo')
+DIRECTORIO_DEFAULT = os.path.join(os.path.expanduser("~"), ".iron_condor", "perfiles")
+INTERVALO_MUESTREO = 0.001  # Segundos entre muestras
+PROFUNDIDAD_MAXIMA = 64     # Al reconstruir pilas desde cProfile
+
+_config = {
+    'modo': None,
+    'directorio': os.environ.get('IRON_CONDOR_PERFIL_DIR', DIRECTORIO_DEFAULT),
+    'tasa': float(os.environ.get('IRON_CONDOR_PERFIL_TASA', 1.0)),
+    'intervalo': INTERVALO_MUESTREO
+}
+_solicitud = contextvars.ContextVar('iron_condor_perfil_solicitud', default=None)
+_en_curso = contextvars.ContextVar('iron_condor_perfil_en_curso', default=False)
+_lock_determinista = threading.Lock()
+_secuencia = itertools.count(1)
+
+
+def configurar(modo: Optional[str] = None, directorio: Optional[str] = None, tasa: Optional[float] = None,
+               intervalo: Optional[float] = None):
+    """
+    Activa el perfilado para todo el proceso (equivalente a las variables de entorno)
+
+    Args:
+        modo: 'determinista', 'muestreo' o None para desactivar
+        directorio: Carpeta donde se guardan los perfiles
+        tasa: Fracción de llamadas perfiladas (ej: 0.01 = una de cada cien)
+        intervalo: Segundos entre muestras en modo muestreo
+    """
+    if modo is not None and modo not in MODOS:
+        raise ValueError(f"Modo de perfilado debe ser uno de: {list(MODOS)}")
+    _config['modo'] = modo
+    if directorio is not None:
+        _config['directorio'] = directorio
+    if tasa is not None:
+        _config['tasa'] = tasa
+    if intervalo is not None:
+        _config['intervalo'] = intervalo
+
+
+def _modo_entorno() -> Optional[str]:
+    valor = os.environ.get('IRON_CONDOR_PERFIL', '').strip().lower()
+    if valor in ('', '0', 'false', 'no'):
+        return None
+    # IRON_CONDOR_PERFIL=1 usa el modo determinista
+    return valor if valor in MODOS else 'determinista'
+
+
+_config['modo'] = _modo_entorno()
+
+
+@contextmanager
+def perfilar_solicitud(modo: str = 'determinista'):
+    """
+    Perfila solo las funciones decoradas que se ejecuten dentro de este contexto
+    (ej: una petición concreta de la API), sin afectar al resto del proceso.
+
+    Es una ContextVar: el trabajo enviado a un pool de hilos solo la ve si se
+    ejecuta con contextvars.copy_context().run (run_in_executor no copia el contexto).
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de perfilado debe ser uno de: {list(MODOS)}")
+    token = _solicitud.set(modo)
+    try:
+        yield
+    finally:
+        _solicitud.reset(token)
+
+
+def perfilado(nombre: Optional[str] = None):
+    """
+    Decorador: perfila cada llamada si el perfilado está activo para el proceso o
+    para la solicitud actual. Desactivado, solo agrega dos comprobaciones por llamada.
+
+    Solo funciones síncronas: una corrutina cede el hilo en cada await y el perfil
+    mezclaría las demás tareas del event loop.
+    """
+    def decorador(funcion):
+        if inspect.iscoroutinefunction(funcion):
+            raise TypeError(f"perfilado no admite corrutinas: {funcion.__qualname__}")
+        etiqueta = nombre or funcion.__name__
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            modo = _solicitud.get() or _config['modo']
+            if modo is None or _en_curso.get():
+                return funcion(*args, **kwargs)
+            if _solicitud.get() is None and _config['tasa'] < 1 and random.random() >= _config['tasa']:
+                return funcion(*args, **kwargs)
+            with perfilar(etiqueta, modo):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+@contextmanager
+def perfilar(nombre: str, modo: str = 'determinista'):
+    """
+    Perfila el bloque y guarda el resultado en archivos propios de esta ejecución:
+    <nombre>-<fecha>-<pid>-<n>.folded (y .prof en modo determinista)
+
+    El modo muestreo toma las pilas del hilo que entra al bloque, con lo que esté
+    ejecutando: si otras tareas comparten ese hilo (un event loop con awaits dentro
+    del bloque), sus muestras también quedan en el perfil.
+    """
+    token = _en_curso.set(True)
+    try:
+        if modo == 'muestreo':
+            muestreador = _Muestreador(threading.get_ident(), _config['intervalo'])
+            muestreador.start()
+            try:
+                yield
+            finally:
+                muestreador.detener()
+                _guardar(nombre, muestreador.pilas, None)
+            return
+
+        # cProfile admite un solo perfil activo a la vez: si hay otro en curso, no se perfila
+        if not _lock_determinista.acquire(blocking=False):
+            yield
+            return
+        perfil = cProfile.Profile()
+        try:
+            try:
+                perfil.enable()
+            except ValueError:
+                # Otra herramienta de perfilado ya está activa
+                perfil = None
+            yield
+        finally:
+            if perfil is not None:
+                perfil.disable()
+            _lock_determinista.release()
+            if perfil is not None:
+                _guardar(nombre, _pstats_a_folded(perfil), perfil)
+    finally:
+        _en_curso.reset(token)
+
+
+class _Muestreador(threading.Thread):
+    """
+    Toma la pila de un único hilo cada 'intervalo' segundos
+    """
+
+    def __init__(self, hilo: int, intervalo: float):
+        super().__init__(name='iron-condor-perfil', daemon=True)
+        self.hilo = hilo
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self._fin = threading.Event()
+
+    def run(self):
+        while not self._fin.wait(self.intervalo):
+            marco = sys._current_frames().get(self.hilo)
+            pila = []
+            while marco is not None:
+                pila.append(_nombre_funcion(marco.f_code.co_filename, marco.f_lineno,
+                                            getattr(marco.f_code, 'co_qualname', marco.f_code.co_name)))
+                marco = marco.f_back
+            if pila:
+                self.pilas[';'.join(reversed(pila))] += 1
+
+    def detener(self):
+        self._fin.set()
+        self.join()
+
+
+def _nombre_funcion(archivo: str, linea: int, funcion: str) -> str:
+    return f"{os.path.basename(archivo)}:{funcion}"
+
+
+def _pstats_a_folded(perfil: cProfile.Profile) -> Counter:
+    """
+    Reconstruye pilas aproximadas (en microsegundos) a partir del grafo llamador-llamado
+    de cProfile, repartiendo el tiempo de cada función entre sus llamadores
+    """
+    import pstats
+
+    estadisticas = pstats.Stats(perfil).stats
+    llamados = {}
+    for funcion, (_, _, _, _, llamadores) in estadisticas.items():
+        for llamador, arista in llamadores.items():
+            llamados.setdefault(llamador, []).append((funcion, arista[3]))
+
+    pilas = Counter()
+
+    def recorrer(funcion, peso, pila):
+        _, _, propio, acumulado, _ = estadisticas[funcion]
+        pila = pila + [_nombre_funcion(*funcion)]
+        if acumulado > 0:
+            micro = int(round(propio * peso / acumulado * 1e6))
+            if micro:
+                pilas[';'.join(pila)] += micro
+        if len(pila) >= PROFUNDIDAD_MAXIMA or acumulado <= 0:
+            return
+        for hijo, arista in llamados.get(funcion, []):
+            if hijo in estadisticas and _nombre_funcion(*hijo) not in pila:
+                subpeso = peso * arista / acumulado
+                if subpeso >= 1e-6:
+                    recorrer(hijo, subpeso, pila)
+
+    for funcion, (_, _, _, acumulado, llamadores) in estadisticas.items():
+        if not any(llamador in estadisticas for llamador in llamadores):
+            recorrer(funcion, acumulado, [])
+
+    return pilas
+
+
+def _guardar(nombre: str, pilas: Counter, perfil: Optional[cProfile.Profile]) -> Optional[str]:
+    """
+    Escribe el archivo .folded (y el .prof de pstats) de una ejecución
+    """
+    try:
+        os.makedirs(_config['directorio'], exist_ok=True)
+        base = os.path.join(
+            _config['directorio'],
+            f"{nombre}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_secuencia)}"
+        )
+        with open(base + '.folded', 'w') as archivo:
+            for pila, valor in sorted(pilas.items()):
+                archivo.write(f"{pila} {valor}\n")
+        if perfil is not None:
+            perfil.dump_stats(base + '.prof')
+        print(f"🔬 Perfil guardado: {base}.folded", file=sys.stderr)
+        return base + '.folded'
+    except OSError as e:
+        print(f"⚠️ No se pudo guardar el perfil: {e}", file=sys.stderr)
+        return None
+
+
+def resumen(ruta: str, limite: int = 15) -> Dict[str, float]:
+    """
+    Funciones con más tiempo propio (hoja de cada pila) de un archivo .folded
+
+    Returns:
+        Dict {función: fracción del total}, ordenado de mayor a menor
+    """
+    propios = Counter()
+    with open(ruta) as archivo:
+        for linea in archivo:
+            pila, _, valor = linea.rstrip('\n').rpartition(' ')
+            propios[pila.rsplit(';', 1)[-1]] += int(valor)
+    total = sum(propios.values()) or 1
+    return {funcion: valor / total for funcion, valor in propios.most_common(limite)}
+
+
+if __name__ == "__main__":
+    # Uso: python3 perfilado.py perfil.folded  -> funciones con más tiempo propio
+    for ruta in sys.argv[1:]:
+        print(f"\n🔬 {ruta}")
+        for funcion, fraccion in resumen(ruta).items():
+            print(f"   {fraccion:6.1%}  {funcion}")
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Proveedores de Datos de Mercado - Iron Condor SPX
+Fuentes intercambiables de cotizaciones para el agente: Yahoo Finance en vivo,
+un servicio HTTP/JSON propio, datos sintéticos reproducibles y reproducción de
+históricos desde CSV/Parquet
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import asyncio
+import csv
+import json
+import random
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+TIMEOUT_DEFAULT = 10  # Segundos por solicitud
+
+_ejecutor = None
+_lock_ejecutor = threading.Lock()
+
+
+def _obtener_ejecutor():
+    """
+    Pool de hilos compartido para descargas en paralelo
+    (concurrent.futures se importa solo cuando se descarga en vivo)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _ejecutor
+
+    with _lock_ejecutor:
+        if _ejecutor is None:
+            _ejecutor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='cotizaciones')
+        return _ejecutor
+
+
+def _errores_timeout(simbolos: List[str], timeout: Optional[float], inicio: float) -> Dict[str, Dict]:
+    latencia_ms = round((time.perf_counter() - inicio) * 1000, 1)
+    return {s: {'error': f"Timeout tras {timeout:.3g}s", 'latencia_ms': latencia_ms} for s in simbolos}
+
+
+class ProveedorDatosMercado(ABC):
+    """
+    Interfaz común de las fuentes de cotizaciones usadas por AgenteIronCondorSPX
+    """
+
+    nombre = 'base'
+    descripcion = 'Proveedor base'
+    usar_cache = False  # Solo los datos en vivo se guardan en el cache compartido
+
+    @abstractmethod
+    def obtener_cierres(self, simbolos: List[str]) -> Dict[str, float]:
+        """
+        Obtiene el último cierre de cada símbolo
+
+        Args:
+            simbolos: Lista de tickers (ej: ['^GSPC', '^VIX'])
+
+        Returns:
+            Dict {ticker: cierre}; lanza excepción si algún símbolo no está disponible
+        """
+
+    def obtener_cotizaciones(self, simbolos: List[str], timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        """
+        Obtiene los cierres en una sola solicitud, informando latencia y errores por símbolo
+
+        Args:
+            simbolos: Lista de tickers
+            timeout: Plazo máximo en segundos (None = sin límite)
+
+        Returns:
+            Dict {ticker: {'valor', 'latencia_ms'}} o {ticker: {'error', 'latencia_ms'}}
+        """
+        inicio = time.perf_counter()
+        try:
+            cierres = self.obtener_cierres(simbolos)
+            error = None
+        except Exception as e:
+            cierres = {}
+            error = str(e)
+        latencia_ms = round((time.perf_counter() - inicio) * 1000, 1)
+
+        cotizaciones = {}
+        for simbolo in simbolos:
+            if simbolo in cierres:
+                cotizaciones[simbolo] = {'valor': cierres[simbolo], 'latencia_ms': latencia_ms}
+            else:
+                cotizaciones[simbolo] = {'error': error or 'Sin datos', 'latencia_ms': latencia_ms}
+
+        return cotizaciones
+
+    async def obtener_cotizaciones_async(self, simbolos: List[str],
+                                         timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        """
+        Versión asyncio de obtener_cotizaciones (mismo formato de resultado).
+
+        Por defecto ejecuta la versión síncrona en el pool compartido de descargas;
+        al vencer el plazo o cancelarse la tarea el event loop queda libre de inmediato
+        aunque el hilo termine su solicitud en segundo plano.
+        """
+        inicio = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        futuro = loop.run_in_executor(_obtener_ejecutor(), self.obtener_cotizaciones, simbolos, timeout)
+        try:
+            return await asyncio.wait_for(futuro, timeout)
+        except asyncio.TimeoutError:
+            return _errores_timeout(simbolos, timeout, inicio)
+
+
+class ProveedorYFinance(ProveedorDatosMercado):
+    """
+    Datos en tiempo real de Yahoo Finance
+    """
+
+    nombre = 'yfinance'
+    descripcion = 'Yahoo Finance (tiempo real)'
+    usar_cache = True
+
+    def obtener_cierres(self, simbolos: List[str]) -> Dict[str, float]:
+        cotizaciones = self.obtener_cotizaciones(simbolos, timeout=None)
+
+        errores = {s: c['error'] for s, c in cotizaciones.items() if 'error' in c}
+        if errores:
+            raise RuntimeError(f"Error obteniendo {errores}")
+
+        return {s: c['valor'] for s, c in cotizaciones.items()}
+
+    def obtener_cotizaciones(self, simbolos: List[str], timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        """
+        Descarga todos los símbolos en paralelo con un plazo máximo común
+        """
+        from concurrent.futures import wait
+
+        inicio = time.perf_counter()
+        ejecutor = _obtener_ejecutor()
+        futuros = {simbolo: ejecutor.submit(self._descargar_cierre, simbolo, timeout) for simbolo in simbolos}
+        wait(futuros.values(), timeout=timeout)
+
+        cotizaciones = {}
+        for simbolo, futuro in futuros.items():
+            if not futuro.done():
+                futuro.cancel()
+                cotizaciones[simbolo] = {
+                    'error': f"Timeout tras {timeout}s",
+                    'latencia_ms': round((time.perf_counter() - inicio) * 1000, 1)
+                }
+                continue
+
+            try:
+                cotizaciones[simbolo] = futuro.result()
+            except Exception as e:
+                cotizaciones[simbolo] = {
+                    'error': str(e),
+                    'latencia_ms': round((time.perf_counter() - inicio) * 1000, 1)
+                }
+
+        return cotizaciones
+
+    async def obtener_cotizaciones_async(self, simbolos: List[str],
+                                         timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        """
+        Una tarea por símbolo en el pool compartido, esperadas desde el event loop.
+
+        No es E/S asíncrona nativa: yfinance es bloqueante y usa su propia sesión HTTP
+        (sin el pool de conexiones de ProveedorHTTP). Al vencer el plazo o cancelarse
+        la tarea solo se evitan las descargas que no empezaron; las que ya están en
+        curso terminan en segundo plano y ocupan su hilo hasta el timeout de yfinance.
+        """
+        if not simbolos:
+            return {}
+        inicio = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        ejecutor = _obtener_ejecutor()
+        tareas = {simbolo: loop.run_in_executor(ejecutor, self._descargar_cierre, simbolo, timeout)
+                  for simbolo in simbolos}
+        try:
+            await asyncio.wait(tareas.values(), timeout=timeout)
+        finally:
+            # Cancelación o plazo vencido: las descargas que aún no empezaron no se ejecutan
+            for tarea in tareas.values():
+                tarea.cancel()
+
+        cotizaciones = {}
+        for simbolo, tarea in tareas.items():
+            if tarea.cancelled():
+                cotizaciones.update(_errores_timeout([simbolo], timeout, inicio))
+            elif tarea.exception() is not None:
+                cotizaciones[simbolo] = {
+                    'error': str(tarea.exception()),
+                    'latencia_ms': round((time.perf_counter() - inicio) * 1000, 1)
+                }
+            else:
+                cotizaciones[simbolo] = tarea.result()
+
+        return cotizaciones
+
+    def _descargar_cierre(self, simbolo: str, timeout: Optional[float]) -> Dict:
+        """
+        Descarga el último cierre de un símbolo midiendo su latencia
+        """
+        # Importación diferida: yfinance solo es necesario para datos en vivo
+        import yfinance as yf
+
+        inicio = time.perf_counter()
+        datos = yf.Ticker(simbolo).history(period="5d", timeout=timeout or TIMEOUT_DEFAULT)
+        if datos.empty:
+            raise ValueError(f"Sin datos para {simbolo}")
+
+        return {
+            'valor': round(float(datos['Close'].iloc[-1]), 2),
+            'latencia_ms': round((time.perf_counter() - inicio) * 1000, 1)
+        }
+
+
+class ProveedorSintetico(ProveedorDatosMercado):
+    """
+    Datos simulados realistas, reproducibles con una semilla
+    """
+
+    nombre = 'sintetico'
+    descripcion = 'Datos Simulados (Demo)'
+
+    # Valores base realistas (aproximados a septiembre 2025)
+    BASES_DEFAULT = {
+        '^GSPC': 5650.0,
+        '^VIX': 18.5,
+        '^VIX9D': 17.0,
+        '^VIX3M': 20.0,
+        '^VIX1D': 15.0
+    }
+
+    def __init__(self, semilla: Optional[int] = None, bases: Optional[Dict[str, float]] = None,
+                 variacion_spx: float = 0.01, variacion_vix: float = 0.05):
+        """
+        Args:
+            semilla: Semilla del generador (None = no reproducible)
+            bases: Valor base por ticker
+            variacion_spx: Variación relativa máxima del subyacente (±1%)
+            variacion_vix: Variación relativa máxima de los índices de volatilidad (±5%)
+        """
+        self.bases = dict(self.BASES_DEFAULT)
+        if bases:
+            self.bases.update(bases)
+        self.variacion_spx = variacion_spx
+        self.variacion_vix = variacion_vix
+        self._random = random.Random(semilla)
+        self._lock = threading.Lock()
+
+    def obtener_cierres(self, simbolos: List[str]) -> Dict[str, float]:
+        cierres = {}
+
+        with self._lock:
+            for simbolo in simbolos:
+                if simbolo not in self.bases:
+                    raise KeyError(f"Sin valor base para {simbolo}")
+
+                variacion = self.variacion_vix if 'VIX' in simbolo else self.variacion_spx
+                cierres[simbolo] = round(
+                    self.bases[simbolo] * (1 + self._random.uniform(-variacion, variacion)), 2
+                )
+
+        return cierres
+
+
+class ProveedorReplay(ProveedorDatosMercado):
+    """
+    Reproduce cotizaciones grabadas en un archivo CSV o Parquet.
+
+    El archivo tiene una columna por ticker (o los alias 'spx'/'vix') y,
+    opcionalmente, una columna 'fecha'. Cada llamada avanza una fila.
+    """
+
+    nombre = 'replay'
+
+    ALIAS = {
+        'spx': '^GSPC',
+        'vix': '^VIX',
+        'vix9d': '^VIX9D',
+        'vix3m': '^VIX3M',
+        'vix1d': '^VIX1D'
+    }
+
+    def __init__(self, ruta: str, ciclico: bool = True):
+        """
+        Args:
+            ruta: Archivo .csv o .parquet
+            ciclico: Volver a la primera fila al llegar al final
+        """
+        self.ruta = ruta
+        self.ciclico = ciclico
+        self.descripcion = f"Replay ({ruta})"
+        self.columnas = self._cargar(ruta)
+        self.filas = len(self.fechas) if self.fechas else len(next(iter(self.columnas.values()), []))
+        self._posicion = 0
+        self._lock = threading.Lock()
+
+        if self.filas == 0:
+            raise ValueError(f"El archivo {ruta} no contiene cotizaciones")
+
+    def _cargar(self, ruta: str) -> Dict[str, List[float]]:
+        """
+        Carga el archivo completo en columnas (listas de float) una sola vez
+        """
+        if ruta.endswith('.parquet'):
+            import pandas as pd
+            tabla = pd.read_parquet(ruta)
+            registros = {str(c): tabla[c].tolist() for c in tabla.columns}
+        else:
+            with open(ruta, newline='') as archivo:
+                lector = csv.DictReader(archivo)
+                registros = {c: [] for c in lector.fieldnames}
+                for fila in lector:
+                    for columna, valor in fila.items():
+                        registros[columna].append(valor)
+
+        self.fechas = [str(f) for f in registros.pop('fecha', [])]
+
+        columnas = {}
+        for columna, valores in registros.items():
+            ticker = self.ALIAS.get(columna.lower(), columna)
+            columnas[ticker] = [float(v) for v in valores]
+
+        return columnas
+
+    def obtener_cierres(self, simbolos: List[str]) -> Dict[str, float]:
+        with self._lock:
+            if self._posicion >= self.filas:
+                if not self.ciclico:
+                    raise IndexError(f"Replay agotado ({self.filas} filas)")
+                self._posicion = 0
+            fila = self._posicion
+            self._posicion += 1
+
+        cierres = {}
+        for simbolo in simbolos:
+            if simbolo not in self.columnas:
+                raise KeyError(f"{simbolo} no está en {self.ruta}")
+            cierres[simbolo] = self.columnas[simbolo][fila]
+
+        return cierres
+
+    def reiniciar(self):
+        """
+        Vuelve a la primera fila del archivo
+        """
+        with self._lock:
+            self._posicion = 0
+
+
+class PoolConexionesHTTP:
+    """
+    Conexiones HTTP/1.1 persistentes (asyncio, sin dependencias externas) que se
+    reutilizan entre las solicitudes concurrentes de un mismo event loop
+    """
+
+    def __init__(self, max_conexiones_por_host: int = 10):
+        """
+        Args:
+            max_conexiones_por_host: Solicitudes simultáneas a un mismo servidor (el resto espera turno)
+        """
+        self.max_conexiones_por_host = max_conexiones_por_host
+        self.conexiones_abiertas = 0
+        # Las conexiones pertenecen a un event loop:
+        # {loop: {(host, puerto, tls): (semáforo, [(reader, writer) libres])}}
+        self._hosts = weakref.WeakKeyDictionary()
+
+    async def get(self, url: str) -> Tuple[int, bytes]:
+        """
+        GET sobre una conexión libre (o una nueva)
+
+        Returns:
+            (código de estado, cuerpo)
+        """
+        from urllib.parse import urlsplit
+
+        partes = urlsplit(url)
+        tls = partes.scheme == 'https'
+        host = partes.hostname
+        puerto = partes.port or (443 if tls else 80)
+        ruta = (partes.path or '/') + (f"?{partes.query}" if partes.query else '')
+        hosts = self._hosts.setdefault(asyncio.get_running_loop(), {})
+        if (host, puerto, tls) not in hosts:
+            hosts[(host, puerto, tls)] = (asyncio.Semaphore(self.max_conexiones_por_host), [])
+        turno, libres = hosts[(host, puerto, tls)]
+
+        async with turno:
+            return await self._get(libres, host, puerto, tls, ruta)
+
+    async def _get(self, libres: List, host: str, puerto: int, tls: bool, ruta: str) -> Tuple[int, bytes]:
+        # Una conexión libre pudo haber sido cerrada por el servidor: se reintenta una vez con otra nueva
+        for intento in range(2):
+            reutilizada = bool(libres)
+            if reutilizada:
+                reader, writer = libres.pop()
+            else:
+                reader, writer = await asyncio.open_connection(host, puerto, ssl=True if tls else None)
+                self.conexiones_abiertas += 1
+
+            try:
+                estado, cuerpo, reutilizable = await self._intercambiar(reader, writer, host, ruta)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reutilizada and intento == 0:
+                    continue
+                raise
+            except BaseException:
+                # Cancelación o plazo vencido a mitad de la respuesta: la conexión no se puede reutilizar
+                writer.close()
+                raise
+
+            if reutilizable:
+                libres.append((reader, writer))
+            else:
+                writer.close()
+            return estado, cuerpo
+
+    async def _intercambiar(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            host: str, ruta: str) -> Tuple[int, bytes, bool]:
+        writer.write(
+            f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n"
+            f"Connection: keep-alive\r\n\r\n".encode('latin-1')
+        )
+        await writer.drain()
+
+        version, estado = (await reader.readuntil(b'\r\n')).split()[:2]
+        cabeceras = {}
+        while True:
+            linea = await reader.readuntil(b'\r\n')
+            if linea == b'\r\n':
+                break
+            nombre, _, valor = linea.decode('latin-1').partition(':')
+            cabeceras[nombre.strip().lower()] = valor.strip().lower()
+
+        if cabeceras.get('transfer-encoding') == 'chunked':
+            trozos = []
+            while True:
+                tamano = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if tamano == 0:
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    break
+                trozos.append(await reader.readexactly(tamano))
+                await reader.readexactly(2)
+            cuerpo = b''.join(trozos)
+        elif 'content-length' in cabeceras:
+            cuerpo = await reader.readexactly(int(cabeceras['content-length']))
+        else:
+            # Sin longitud: el cuerpo termina al cerrar la conexión
+            return int(estado), await reader.read(), False
+
+        reutilizable = version == b'HTTP/1.1' and cabeceras.get('connection') != 'close'
+        return int(estado), cuerpo, reutilizable
+
+
+class ProveedorHTTP(ProveedorDatosMercado):
+    """
+    Cotizaciones desde un servicio HTTP/JSON propio:
+
+        GET <url>?simbolos=^GSPC,^VIX  ->  {"^GSPC": 5800.12, "^VIX": 18.4}
+
+    La versión asyncio usa un pool de conexiones persistentes compartido por
+    todas las solicitudes concurrentes del proveedor.
+    """
+
+    nombre = 'http'
+    usar_cache = True
+
+    def __init__(self, url: str, pool: Optional[PoolConexionesHTTP] = None):
+        self.url = url
+        self.descripcion = f"HTTP ({url})"
+        self.pool = pool or PoolConexionesHTTP()
+
+    def obtener_cierres(self, simbolos: List[str]) -> Dict[str, float]:
+        return self._pedir(simbolos, TIMEOUT_DEFAULT)
+
+    def obtener_cotizaciones(self, simbolos: List[str], timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        inicio = time.perf_counter()
+        try:
+            cierres = self._pedir(simbolos, timeout)
+            error = None
+        except Exception as e:
+            cierres = {}
+            error = str(e)
+        return self._cotizaciones(simbolos, cierres, error, inicio)
+
+    async def obtener_cotizaciones_async(self, simbolos: List[str],
+                                         timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        inicio = time.perf_counter()
+        try:
+            estado, cuerpo = await asyncio.wait_for(self.pool.get(self._url(simbolos)), timeout)
+            if estado != 200:
+                raise RuntimeError(f"HTTP Error {estado}")
+            cierres = self._cierres(simbolos, json.loads(cuerpo))
+            error = None
+        except asyncio.TimeoutError:
+            return _errores_timeout(simbolos, timeout, inicio)
+        except Exception as e:
+            cierres = {}
+            error = str(e)
+        return self._cotizaciones(simbolos, cierres, error, inicio)
+
+    def _pedir(self, simbolos: List[str], timeout: Optional[float]) -> Dict[str, float]:
+        from urllib.request import urlopen
+
+        with urlopen(self._url(simbolos), timeout=timeout) as respuesta:
+            return self._cierres(simbolos, json.loads(respuesta.read()))
+
+    def _url(self, simbolos: List[str]) -> str:
+        from urllib.parse import quote
+
+        separador = '&' if '?' in self.url else '?'
+        return f"{self.url}{separador}simbolos={quote(','.join(simbolos))}"
+
+    @staticmethod
+    def _cierres(simbolos: List[str], contenido: Dict) -> Dict[str, float]:
+        return {s: round(float(contenido[s]), 2) for s in simbolos if s in contenido}
+
+    @staticmethod
+    def _cotizaciones(simbolos: List[str], cierres: Dict[str, float], error: Optional[str],
+                      inicio: float) -> Dict[str, Dict]:
+        latencia_ms = round((time.perf_counter() - inicio) * 1000, 1)
+        return {
+            simbolo: ({'valor': cierres[simbolo], 'latencia_ms': latencia_ms} if simbolo in cierres
+                      else {'error': error or f"Sin datos para {simbolo}", 'latencia_ms': latencia_ms})
+            for simbolo in simbolos
+        }
+
+
+PROVEEDORES = ('yfinance', 'sintetico', 'replay', 'http')
+
+
+def crear_proveedor(nombre: str = 'yfinance', ruta: Optional[str] = None,
+                    semilla: Optional[int] = None) -> ProveedorDatosMercado:
+    """
+    Crea un proveedor por nombre (para opciones de línea de comandos)
+
+    Args:
+        nombre: 'yfinance', 'sintetico', 'replay' o 'http'
+        ruta: Archivo del proveedor replay o URL del proveedor http
+        semilla: Semilla del proveedor sintético
+    """
+    if nombre == 'yfinance':
+        return ProveedorYFinance()
+    if nombre == 'sintetico':
+        return ProveedorSintetico(semilla=semilla)
+    if nombre == 'replay':
+        if not ruta:
+            raise ValueError("El proveedor replay necesita la ruta del archivo")
+        return ProveedorReplay(ruta)
+    if nombre == 'http':
+        if not ruta:
+            raise ValueError("El proveedor http necesita la URL del servicio")
+        return ProveedorHTTP(ruta)
+    raise ValueError(f"Proveedor debe ser uno de: {list(PROVEEDORES)}")
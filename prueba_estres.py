@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Prueba de Estrés - Iron Condor SPX
+Revalúa un iron condor sobre una malla de choques de precio del SPX × choques
+del VIX en una sola evaluación vectorizada de Black-Scholes (broadcasting de
+NumPy), para mapas de calor en la app web y reportes por lotes
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import csv
+import sys
+import time
+from typing import Dict
+
+import numpy as np
+
+from motor_vectorizado import DIAS_TRADING_ANIO
+from valoracion_black_scholes import tiempo_vencimiento, valorar_iron_condor
+
+PUNTOS_DEFAULT = 200          # Puntos por eje de la malla
+RANGO_SPOT_DEFAULT = 0.05     # Choques del SPX de -5% a +5%
+RANGO_VOL_DEFAULT = (-8.0, 12.0)  # Choques del VIX en puntos
+VIX_MINIMO = 1.0              # Piso del VIX estresado (en puntos)
+
+
+def malla_estres(spx_valor: float, vix_valor: float, strikes: Dict, tiempo: float,
+                 rango_spot: float = RANGO_SPOT_DEFAULT, rango_vol=RANGO_VOL_DEFAULT,
+                 puntos_spot: int = PUNTOS_DEFAULT, puntos_vol: int = PUNTOS_DEFAULT,
+                 dias_transcurridos: float = 0, tasa: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    P&L de un iron condor corto para cada combinación de choque de SPX y de VIX
+
+    Args:
+        spx_valor: SPX actual
+        vix_valor: VIX actual en puntos (ej: 18.2)
+        strikes: Dict con buy_put, sell_put, sell_call, buy_call
+        tiempo: Tiempo al vencimiento en años
+        rango_spot: Choque máximo relativo del SPX (0.05 = ±5%)
+        rango_vol: (mínimo, máximo) choque del VIX en puntos
+        puntos_spot, puntos_vol: Tamaño de la malla
+        dias_transcurridos: Días de trading que pasan antes del choque (theta)
+        tasa: Tasa libre de riesgo continua
+
+    Returns:
+        Dict con los ejes ('choques_spot', 'spot', 'choques_vol', 'vix'), el crédito
+        inicial y 'pnl' (matriz puntos_vol × puntos_spot, en puntos del SPX)
+    """
+    choques_spot = np.linspace(-rango_spot, rango_spot, puntos_spot)
+    choques_vol = np.linspace(rango_vol[0], rango_vol[1], puntos_vol)
+    spot = spx_valor * (1 + choques_spot)
+    vix = np.maximum(vix_valor + choques_vol, VIX_MINIMO)
+    tiempo_estres = max(tiempo - dias_transcurridos / DIAS_TRADING_ANIO, 0.0)
+
+    patas = (strikes['buy_put'], strikes['sell_put'], strikes['sell_call'], strikes['buy_call'])
+    inicial = valorar_iron_condor(spx_valor, *patas, vix_valor / 100, tiempo, tasa)
+    # Filas = VIX, columnas = SPX: una sola evaluación de Black-Scholes para toda la malla
+    estresado = valorar_iron_condor(spot[np.newaxis, :], *patas, vix[:, np.newaxis] / 100, tiempo_estres, tasa)
+
+    # Condor vendido: ganancia = crédito recibido - costo de recomprarlo
+    credito_inicial = float(inicial['credito_neto'])
+    return {
+        'choques_spot': choques_spot,
+        'spot': spot,
+        'choques_vol': choques_vol,
+        'vix': vix,
+        'credito_inicial': credito_inicial,
+        'pnl': credito_inicial - estresado['credito_neto']
+    }
+
+
+def malla_estres_resultado(resultado: Dict, **kwargs) -> Dict[str, np.ndarray]:
+    """
+    malla_estres para el resultado de AgenteIronCondorSPX.ejecutar_calculo_completo
+    """
+    datos = resultado['datos_mercado']
+    return malla_estres(
+        datos['spx_valor'], datos['vix_valor'], resultado['strikes'],
+        tiempo_vencimiento(resultado['parametros']['periodo_temporal'], datos.get('fecha_objetivo')),
+        **kwargs
+    )
+
+
+def resumir_malla(malla: Dict) -> Dict:
+    """
+    Peor y mejor escenario de la malla (floats, para mostrar o serializar)
+    """
+    pnl = malla['pnl']
+    peor = np.unravel_index(np.argmin(pnl), pnl.shape)
+    mejor = np.unravel_index(np.argmax(pnl), pnl.shape)
+    return {
+        'credito_inicial': round(malla['credito_inicial'], 2),
+        'pnl_minimo': round(float(pnl[peor]), 2),
+        'spot_pnl_minimo': round(float(malla['spot'][peor[1]]), 2),
+        'vix_pnl_minimo': round(float(malla['vix'][peor[0]]), 2),
+        'pnl_maximo': round(float(pnl[mejor]), 2),
+        'fraccion_con_ganancia': round(float(np.mean(pnl > 0)), 4)
+    }
+
+
+def malla_a_json(malla: Dict, decimales: int = 2) -> Dict:
+    """
+    Malla como listas (para la API HTTP)
+    """
+    return {
+        'choques_spot': np.round(malla['choques_spot'], 6).tolist(),
+        'spot': np.round(malla['spot'], decimales).tolist(),
+        'choques_vol': np.round(malla['choques_vol'], 4).tolist(),
+        'vix': np.round(malla['vix'], 4).tolist(),
+        'pnl': np.round(malla['pnl'], decimales).tolist(),
+        'resumen': resumir_malla(malla)
+    }
+
+
+def guardar_csv(malla: Dict, ruta: str):
+    """
+    Escribe la malla en formato largo: una fila por escenario (spot, vix, pnl)
+    """
+    with open(ruta, 'w', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['choque_spot', 'spot', 'choque_vix', 'vix', 'pnl'])
+        for i, (choque_vol, vix) in enumerate(zip(malla['choques_vol'], malla['vix'])):
+            for j, (choque_spot, spot) in enumerate(zip(malla['choques_spot'], malla['spot'])):
+                escritor.writerow([f"{choque_spot:.4f}", f"{spot:.2f}", f"{choque_vol:.2f}", f"{vix:.2f}",
+                                   f"{malla['pnl'][i, j]:.2f}"])
+
+
+def main():
+    """
+    Prueba de estrés por línea de comandos (sin conexión: SPX y VIX explícitos)
+    """
+    from agente_iron_condor_final import AgenteIronCondorSPX
+
+    parser = argparse.ArgumentParser(description="Malla de estrés SPX × VIX de un iron condor")
+    parser.add_argument('--spx', type=float, required=True)
+    parser.add_argument('--vix', type=float, required=True)
+    parser.add_argument('--ala', type=int, default=25, choices=[10, 15, 20, 25])
+    parser.add_argument('--periodo', default='diario', choices=['diario', 'semanal', 'mensual', 'anual'])
+    parser.add_argument('--buffer', type=int, default=10)
+    parser.add_argument('--rango-spot', type=float, default=RANGO_SPOT_DEFAULT * 100, help="Choque máximo del SPX (%%)")
+    parser.add_argument('--vol-min', type=float, default=RANGO_VOL_DEFAULT[0], help="Choque mínimo del VIX (puntos)")
+    parser.add_argument('--vol-max', type=float, default=RANGO_VOL_DEFAULT[1], help="Choque máximo del VIX (puntos)")
+    parser.add_argument('--puntos', type=int, default=PUNTOS_DEFAULT, help="Puntos por eje")
+    parser.add_argument('--dias', type=float, default=0, help="Días transcurridos antes del choque")
+    parser.add_argument('--csv', help="Guardar la malla completa (formato largo)")
+    args = parser.parse_args()
+
+    try:
+        if args.puntos < 2:
+            raise ValueError("--puntos debe ser al menos 2")
+        agente = AgenteIronCondorSPX(usar_cache=False)
+        datos = {'spx_valor': args.spx, 'vix_valor': args.vix, 'fecha_datos': 'Manual',
+                 'fecha_objetivo': 'Actual', 'fuente_datos': 'Manual'}
+        resultado = agente.ejecutar_calculo_completo(ala=args.ala, periodo=args.periodo, buffer=args.buffer,
+                                                     datos_mercado=datos)
+        inicio = time.perf_counter()
+        malla = malla_estres_resultado(resultado, rango_spot=args.rango_spot / 100,
+                                       rango_vol=(args.vol_min, args.vol_max),
+                                       puntos_spot=args.puntos, puntos_vol=args.puntos,
+                                       dias_transcurridos=args.dias)
+        milisegundos = (time.perf_counter() - inicio) * 1000
+        if args.csv:
+            guardar_csv(malla, args.csv)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    resumen = resumir_malla(malla)
+    strikes = resultado['strikes']
+    print("\n" + "="*70)
+    print("🌡️ PRUEBA DE ESTRÉS SPX × VIX")
+    print("="*70)
+    print(f"   🎯 Condor: {strikes['buy_put']}/{strikes['sell_put']} - {strikes['sell_call']}/{strikes['buy_call']}")
+    print(f"   💰 Crédito inicial: {resumen['credito_inicial']:.2f} pts")
+    print(f"   📉 Peor escenario: {resumen['pnl_minimo']:+.2f} pts "
+          f"(SPX {resumen['spot_pnl_minimo']:,.0f}, VIX {resumen['vix_pnl_minimo']:.1f})")
+    print(f"   📈 Mejor escenario: {resumen['pnl_maximo']:+.2f} pts")
+    print(f"   ✅ Escenarios con ganancia: {resumen['fraccion_con_ganancia']:.1%}")
+
+    # Vista reducida: 5 choques del VIX × 7 choques del SPX
+    filas = np.linspace(0, len(malla['vix']) - 1, 5).round().astype(int)
+    columnas = np.linspace(0, len(malla['spot']) - 1, 7).round().astype(int)
+    print("\n   VIX \\ SPX " + "".join(f"{malla['choques_spot'][j]:>+9.1%}" for j in columnas))
+    for i in filas:
+        print(f"   {malla['vix'][i]:>9.1f} " + "".join(f"{malla['pnl'][i, j]:>9.2f}" for j in columnas))
+
+    print(f"\n   ⚡ Malla de {malla['pnl'].shape[0]}×{malla['pnl'].shape[1]} en {milisegundos:.1f} ms")
+    if args.csv:
+        print(f"   💾 Guardada en {args.csv}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Resiliencia - Iron Condor SPX
+Reintentos acotados con backoff y jitter, cortacircuitos que falla rápido tras
+errores repetidos y un servidor local de cotizaciones con fallas inyectables
+para probar el comportamiento ante caídas y límites de tasa
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from metricas import contar
+from proveedores_datos import ProveedorDatosMercado, TIMEOUT_DEFAULT
+
+INTENTOS_DEFAULT = 3
+ESPERA_BASE = 0.2           # Segundos antes del primer reintento
+ESPERA_MAXIMA = 2.0
+UMBRAL_FALLOS = 5           # Fallos consecutivos que abren el circuito
+ENFRIAMIENTO = 30.0         # Segundos con el circuito abierto antes de volver a probar
+
+
+class PoliticaReintentos:
+    """
+    Reintentos con backoff exponencial y "full jitter" (espera aleatoria entre 0 y
+    el tope exponencial), para no sincronizar a varios clientes contra la fuente
+    """
+
+    def __init__(self, intentos: int = INTENTOS_DEFAULT, espera_base: float = ESPERA_BASE,
+                 espera_maxima: float = ESPERA_MAXIMA, semilla: Optional[int] = None):
+        if intentos < 1:
+            raise ValueError("Se necesita al menos un intento")
+        self.intentos = intentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self._random = random.Random(semilla)
+
+    def esperas(self) -> Iterator[float]:
+        """
+        Espera antes de cada reintento (intentos - 1 valores)
+        """
+        for intento in range(self.intentos - 1):
+            yield self._random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+
+
+class Cortacircuitos:
+    """
+    Circuito cerrado -> abierto tras 'umbral_fallos' fallos seguidos; abierto
+    rechaza al instante durante 'enfriamiento' segundos; luego deja pasar una
+    única prueba (semiabierto) que lo cierra o lo vuelve a abrir
+    """
+
+    CERRADO, ABIERTO, SEMIABIERTO = 'cerrado', 'abierto', 'semiabierto'
+
+    def __init__(self, umbral_fallos: int = UMBRAL_FALLOS, enfriamiento: float = ENFRIAMIENTO):
+        self.umbral_fallos = umbral_fallos
+        self.enfriamiento = enfriamiento
+        self.aperturas = 0
+        self._fallos = 0
+        self._abierto_desde = None
+        self._prueba_en_curso = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            return self._estado()
+
+    def _estado(self) -> str:
+        if self._abierto_desde is None:
+            return self.CERRADO
+        if time.monotonic() - self._abierto_desde < self.enfriamiento:
+            return self.ABIERTO
+        return self.SEMIABIERTO
+
+    def permitir(self) -> bool:
+        """
+        True si se puede llamar a la fuente ahora
+        """
+        with self._lock:
+            estado = self._estado()
+            if estado == self.CERRADO:
+                return True
+            if estado == self.SEMIABIERTO and not self._prueba_en_curso:
+                self._prueba_en_curso = True
+                return True
+            return False
+
+    def registrar_exito(self):
+        with self._lock:
+            self._fallos = 0
+            self._abierto_desde = None
+            self._prueba_en_curso = False
+
+    def registrar_fallo(self):
+        with self._lock:
+            self._fallos += 1
+            if self._prueba_en_curso or (self._abierto_desde is None and self._fallos >= self.umbral_fallos):
+                self._abierto_desde = time.monotonic()
+                self.aperturas += 1
+                contar('iron_condor_circuito_aperturas_total')
+            self._prueba_en_curso = False
+
+    def liberar_prueba(self):
+        """
+        Descarta la prueba del semiabierto sin contarla como éxito ni fallo
+        """
+        with self._lock:
+            self._prueba_en_curso = False
+
+    def segundos_para_reintentar(self) -> float:
+        with self._lock:
+            if self._abierto_desde is None:
+                return 0.0
+            return max(0.0, self.enfriamiento - (time.monotonic() - self._abierto_desde))
+
+
+class ProveedorResiliente(ProveedorDatosMercado):
+    """
+    Envuelve otro proveedor con reintentos dentro del plazo de la solicitud y un
+    cortacircuitos compartido. Conserva el nombre y el uso de cache del original.
+
+    Solo los símbolos requeridos se reintentan y cuentan como fallo de la fuente:
+    un extra opcional que la fuente no publica (ej: ^VIX1D) devuelve su error sin
+    abrir el circuito. Si no llega ningún símbolo, la que falla es la fuente.
+    """
+
+    def __init__(self, proveedor: ProveedorDatosMercado, politica: Optional[PoliticaReintentos] = None,
+                 circuito: Optional[Cortacircuitos] = None, requeridos: Optional[List[str]] = None):
+        """
+        Args:
+            proveedor: Proveedor original
+            politica: Reintentos (por defecto PoliticaReintentos())
+            circuito: Cortacircuitos, compartible entre proveedores
+            requeridos: Símbolos imprescindibles (None = todos los solicitados)
+        """
+        self.proveedor = proveedor
+        self.politica = politica or PoliticaReintentos()
+        self.circuito = circuito or Cortacircuitos()
+        self.requeridos = None if requeridos is None else set(requeridos)
+
+    @property
+    def nombre(self) -> str:
+        return self.proveedor.nombre
+
+    @property
+    def descripcion(self) -> str:
+        return self.proveedor.descripcion
+
+    @property
+    def usar_cache(self) -> bool:
+        return self.proveedor.usar_cache
+
+    def obtener_cierres(self, simbolos: List[str]) -> Dict[str, float]:
+        cotizaciones = self.obtener_cotizaciones(simbolos)
+        errores = {s: c['error'] for s, c in cotizaciones.items() if 'error' in c}
+        if errores:
+            raise RuntimeError(f"Error obteniendo {errores}")
+        return {s: c['valor'] for s, c in cotizaciones.items()}
+
+    def obtener_cotizaciones(self, simbolos: List[str], timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        """
+        Reintenta solo los símbolos con error, sin superar nunca el plazo 'timeout'
+        """
+        if not self.circuito.permitir():
+            return self._rechazar(simbolos)
+
+        limite = time.monotonic() + (timeout if timeout is not None else TIMEOUT_DEFAULT)
+        resultado = {}
+        pendientes = list(simbolos)
+        esperas = self.politica.esperas()
+
+        try:
+            while True:
+                cotizaciones = self.proveedor.obtener_cotizaciones(
+                    pendientes, timeout=max(limite - time.monotonic(), 0.001)
+                )
+                resultado.update((simbolo, cotizaciones[simbolo]) for simbolo in pendientes)
+                pendientes = self._pendientes(pendientes, cotizaciones)
+                if not pendientes:
+                    break
+
+                espera = next(esperas, None)
+                if espera is None or time.monotonic() + espera >= limite:
+                    break
+                contar('iron_condor_reintentos_total')
+                time.sleep(espera)
+        except Exception:
+            self.circuito.registrar_fallo()
+            raise
+        except BaseException:
+            # Interrupción: no es un fallo de la fuente, pero libera la prueba del semiabierto
+            self.circuito.liberar_prueba()
+            raise
+
+        return self._cerrar_intento(resultado, pendientes)
+
+    async def obtener_cotizaciones_async(self, simbolos: List[str],
+                                         timeout: Optional[float] = TIMEOUT_DEFAULT) -> Dict[str, Dict]:
+        """
+        Igual que obtener_cotizaciones, esperando los reintentos sin bloquear el event loop
+        """
+        if not self.circuito.permitir():
+            return self._rechazar(simbolos)
+
+        limite = time.monotonic() + (timeout if timeout is not None else TIMEOUT_DEFAULT)
+        resultado = {}
+        pendientes = list(simbolos)
+        esperas = self.politica.esperas()
+
+        try:
+            while True:
+                cotizaciones = await self.proveedor.obtener_cotizaciones_async(
+                    pendientes, timeout=max(limite - time.monotonic(), 0.001)
+                )
+                resultado.update((simbolo, cotizaciones[simbolo]) for simbolo in pendientes)
+                pendientes = self._pendientes(pendientes, cotizaciones)
+                if not pendientes:
+                    break
+
+                espera = next(esperas, None)
+                if espera is None or time.monotonic() + espera >= limite:
+                    break
+                contar('iron_condor_reintentos_total')
+                await asyncio.sleep(espera)
+        except Exception:
+            self.circuito.registrar_fallo()
+            raise
+        except BaseException:
+            # Una cancelación no es un fallo de la fuente: libera la prueba del semiabierto
+            self.circuito.liberar_prueba()
+            raise
+
+        return self._cerrar_intento(resultado, pendientes)
+
+    def _rechazar(self, simbolos: List[str]) -> Dict[str, Dict]:
+        contar('iron_condor_circuito_rechazos_total')
+        error = f"Circuito abierto: reintento en {self.circuito.segundos_para_reintentar():.0f}s"
+        return {s: {'error': error, 'latencia_ms': 0.0} for s in simbolos}
+
+    def _pendientes(self, simbolos: List[str], cotizaciones: Dict[str, Dict]) -> List[str]:
+        """
+        Símbolos a reintentar: los requeridos con error, o todos si no llegó ninguno
+        """
+        fallidos = [s for s in simbolos if 'error' in cotizaciones[s]]
+        if self.requeridos is None or len(fallidos) == len(simbolos):
+            return fallidos
+        return [s for s in fallidos if s in self.requeridos]
+
+    def _cerrar_intento(self, resultado: Dict[str, Dict], pendientes: List[str]) -> Dict[str, Dict]:
+        # Cada cotización conserva la latencia de su propia descarga
+        if pendientes:
+            self.circuito.registrar_fallo()
+        else:
+            self.circuito.registrar_exito()
+        return resultado
+
+
+class ServidorFallas:
+    """
+    Servidor HTTP local que imita la fuente de cotizaciones (formato de
+    ProveedorHTTP) e inyecta latencia, errores 500, límites 429 o una caída total.
+    Los atributos se pueden cambiar mientras corre.
+    """
+
+    def __init__(self, latencia: float = 0.0, tasa_error: float = 0.0, tasa_limite: float = 0.0,
+                 caido: bool = False, semilla: Optional[int] = None):
+        self.latencia = latencia
+        self.tasa_error = tasa_error
+        self.tasa_limite = tasa_limite
+        self.caido = caido
+        self.peticiones = 0
+        self._random = random.Random(semilla)
+        self._servidor = None
+        self._hilo = None
+
+    def iniciar(self, host: str = '127.0.0.1', puerto: int = 0) -> str:
+        """
+        Levanta el servidor en segundo plano y devuelve su URL
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from proveedores_datos import ProveedorSintetico
+
+        fallas = self
+        sintetico = ProveedorSintetico(semilla=self._random.randrange(2 ** 32))
+
+        class Manejador(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Conexiones persistentes, como la fuente real
+
+            def do_GET(self):
+                from urllib.parse import parse_qs, urlsplit
+
+                fallas.peticiones += 1
+                if fallas.latencia:
+                    time.sleep(fallas.latencia)
+
+                sorteo = fallas._random.random()
+                if fallas.caido:
+                    return self._responder(503, '{"error": "Servicio no disponible"}')
+                if sorteo < fallas.tasa_limite:
+                    return self._responder(429, '{"error": "Demasiadas solicitudes"}')
+                if sorteo < fallas.tasa_limite + fallas.tasa_error:
+                    return self._responder(500, '{"error": "Error interno"}')
+
+                import json
+                simbolos = parse_qs(urlsplit(self.path).query).get('simbolos', [''])[0].split(',')
+                try:
+                    self._responder(200, json.dumps(sintetico.obtener_cierres([s for s in simbolos if s])))
+                except KeyError as e:
+                    self._responder(404, json.dumps({'error': str(e)}))
+
+            def _responder(self, estado, cuerpo):
+                datos = cuerpo.encode('utf-8')
+                self.send_response(estado)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def log_message(self, *args):
+                pass
+
+        class Servidor(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128  # Muchos clientes concurrentes (ej: agente asyncio)
+
+        self._servidor = Servidor((host, puerto), Manejador)
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, name='servidor-fallas', daemon=True)
+        self._hilo.start()
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}/cotizaciones"
+
+    def detener(self):
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+
+def simular_caida(peticiones: int = 200, latencia: float = 0.05, tasa_error: float = 0.2,
+                  caida: tuple = (0.4, 0.7), resiliente: bool = True, timeout: float = 2.0,
+                  intervalo: float = 0.02, semilla: int = 7) -> Dict:
+    """
+    Ejecuta cálculos cada 'intervalo' segundos contra el servidor con fallas; durante
+    la fracción 'caida' de las peticiones el servidor queda totalmente caído
+
+    Returns:
+        Dict con latencias p50/p99/máxima (ms) y conteo de datos frescos, de respaldo y fallidos
+    """
+    from agente_iron_condor_final import AgenteIronCondorSPX
+    from proveedores_datos import ProveedorHTTP
+
+    servidor = ServidorFallas(latencia=latencia, tasa_error=tasa_error, semilla=semilla)
+    url = servidor.iniciar()
+    proveedor = ProveedorHTTP(url)
+    if resiliente:
+        proveedor = ProveedorResiliente(proveedor, PoliticaReintentos(semilla=semilla),
+                                        Cortacircuitos(enfriamiento=1.0))
+    agente = AgenteIronCondorSPX(proveedor=proveedor, usar_cache=False)
+    agente.timeout_segundos = timeout
+    if not resiliente:
+        agente.antiguedad_maxima_respaldo = 0
+
+    latencias = []
+    conteo = {'frescos': 0, 'respaldo': 0, 'fallidos': 0}
+    try:
+        for i in range(peticiones):
+            servidor.caido = caida[0] <= i / peticiones < caida[1]
+            inicio = time.perf_counter()
+            datos = agente.obtener_datos_mercado()
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if not datos:
+                conteo['fallidos'] += 1
+            elif datos.get('respaldo'):
+                conteo['respaldo'] += 1
+            else:
+                conteo['frescos'] += 1
+            time.sleep(intervalo)
+    finally:
+        servidor.detener()
+
+    latencias.sort()
+    return dict(
+        conteo,
+        latencia_p50_ms=round(latencias[len(latencias) // 2], 1),
+        latencia_p99_ms=round(latencias[int(len(latencias) * 0.99) - 1], 1),
+        latencia_maxima_ms=round(latencias[-1], 1),
+        peticiones_servidor=servidor.peticiones,
+        aperturas_circuito=proveedor.circuito.aperturas if resiliente else 0
+    )
+
+
+def main():
+    """
+    Compara el agente con y sin la capa de resiliencia ante una fuente que falla
+    """
+    parser = argparse.ArgumentParser(description="Simulación de caídas de la fuente de cotizaciones")
+    parser.add_argument('--peticiones', type=int, default=200)
+    parser.add_argument('--latencia', type=float, default=0.05, help="Latencia de cada respuesta (s)")
+    parser.add_argument('--tasa-error', type=float, default=0.2, help="Fracción de respuestas 500")
+    parser.add_argument('--timeout', type=float, default=2.0, help="Plazo por obtención de datos (s)")
+    args = parser.parse_args()
+
+    # La caída total provoca mensajes de error por cada obtención sin respaldo
+    print("🔌 Simulando fuente inestable con caída total entre el 40% y el 70% de las peticiones...")
+    try:
+        resultados = {
+            'Sin resiliencia': simular_caida(args.peticiones, args.latencia, args.tasa_error,
+                                             resiliente=False, timeout=args.timeout),
+            'Con resiliencia': simular_caida(args.peticiones, args.latencia, args.tasa_error,
+                                             resiliente=True, timeout=args.timeout)
+        }
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print("\n" + "="*100)
+    print("🛡️ RESILIENCIA DE LA OBTENCIÓN DE DATOS")
+    print("="*100)
+    print(f"{'Modo':<18} {'Frescos':>8} {'Respaldo':>9} {'Fallidos':>9} {'p50':>9} {'p99':>9} {'Máx':>9} "
+          f"{'Pet. fuente':>12} {'Aperturas':>10}")
+    print("-"*100)
+    for modo, r in resultados.items():
+        print(f"{modo:<18} {r['frescos']:>8} {r['respaldo']:>9} {r['fallidos']:>9} "
+              f"{r['latencia_p50_ms']:>7.1f}ms {r['latencia_p99_ms']:>7.1f}ms {r['latencia_maxima_ms']:>7.1f}ms "
+              f"{r['peticiones_servidor']:>12} {r['aperturas_circuito']:>10}")
+    print("="*100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Selección por Delta - Iron Condor SPX
+Elige los strikes vendidos por delta objetivo (ej: 10-16Δ) en lugar del movimiento
+en puntos del VIX, usando las IV de la cadena o el VIX como volatilidad
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from motor_vectorizado import DIAS_TRADING_ANIO, dias_horizonte
+from valoracion_black_scholes import valorar_opciones
+
+ITERACIONES_BISECCION = 60
+DESVIOS_BRACKET = 12  # Amplitud del intervalo inicial en desvíos estándar
+
+
+def _delta(es_call, spot, strike, vol, tiempo, tasa, dividendo) -> np.ndarray:
+    return valorar_opciones(es_call, spot, strike, vol, tiempo, tasa, dividendo)['delta']
+
+
+def resolver_strike_delta(spot, delta_objetivo, vol: Union[float, np.ndarray, Callable], tiempo,
+                          es_call, tasa: float = 0.0, dividendo: float = 0.0,
+                          iteraciones: int = ITERACIONES_BISECCION) -> np.ndarray:
+    """
+    Strike continuo cuyo |delta| es igual al objetivo (bisección vectorizada)
+
+    Resuelve muchos casos a la vez (ej: varios vencimientos o cotizaciones).
+
+    Args:
+        spot: Precio del subyacente
+        delta_objetivo: |Delta| buscado (ej: 0.16)
+        vol: Volatilidad en decimal, o función strike -> vol (sonrisa de la cadena)
+        tiempo: Tiempo al vencimiento en años
+        es_call: True para call, False para put
+        tasa, dividendo: Tasas continuas
+
+    Returns:
+        Array de strikes (sin redondear)
+    """
+    spot, objetivo, tiempo, es_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(delta_objetivo, dtype=np.float64),
+        np.asarray(tiempo, dtype=np.float64),
+        np.asarray(es_call, dtype=bool)
+    )
+    obtener_vol = vol if callable(vol) else (lambda strike: vol)
+    vol_referencia = np.asarray(obtener_vol(spot), dtype=np.float64)
+
+    # Intervalo en log-strike que contiene la solución: |delta| es monótono en el strike
+    amplitud = DESVIOS_BRACKET * vol_referencia * np.sqrt(np.maximum(tiempo, 1e-8))
+    bajo = np.log(spot) - amplitud
+    alto = np.log(spot) + amplitud
+
+    for _ in range(iteraciones):
+        medio = 0.5 * (bajo + alto)
+        strike = np.exp(medio)
+        delta_abs = np.abs(_delta(es_call, spot, strike, obtener_vol(strike), tiempo, tasa, dividendo))
+
+        # Call: |delta| baja al subir el strike. Put: |delta| sube al subir el strike.
+        subir = np.where(es_call, delta_abs > objetivo, delta_abs < objetivo)
+        bajo = np.where(subir, medio, bajo)
+        alto = np.where(subir, alto, medio)
+
+    return np.exp(0.5 * (bajo + alto))
+
+
+def _indice_mas_cercano(deltas: np.ndarray, objetivo: float) -> int:
+    """
+    Posición del candidato cuyo |delta| está más cerca del objetivo
+    """
+    return int(np.argmin(np.abs(np.abs(deltas) - objetivo)))
+
+
+def seleccionar_por_delta_vix(spot: float, vix_porcentaje: float, delta_objetivo: float = 0.16,
+                              tiempo: Optional[float] = None, periodo: Optional[str] = None,
+                              fecha_objetivo: Optional[str] = None, multiplo: int = 5,
+                              tasa: float = 0.0) -> Dict:
+    """
+    Strikes vendidos por delta usando el VIX como volatilidad y strikes múltiplos de 5
+
+    Returns:
+        Dict con sell_put, sell_call y sus deltas
+    """
+    if tiempo is None:
+        tiempo = dias_horizonte(periodo, fecha_objetivo) / DIAS_TRADING_ANIO
+    vol = vix_porcentaje / 100
+
+    continuos = resolver_strike_delta(spot, delta_objetivo, vol, tiempo, np.array([False, True]), tasa)
+    resultado = {'delta_objetivo': delta_objetivo, 'tiempo_anios': tiempo, 'iv_put': vol, 'iv_call': vol}
+
+    for lado, es_call, continuo in (('put', False, continuos[0]), ('call', True, continuos[1])):
+        candidatos = np.array([np.floor(continuo / multiplo), np.ceil(continuo / multiplo)]) * multiplo
+        deltas = _delta(es_call, spot, candidatos, vol, tiempo, tasa, 0.0)
+        indice = _indice_mas_cercano(deltas, delta_objetivo)
+        resultado[f'sell_{lado}'] = int(candidatos[indice])
+        resultado[f'delta_{lado}'] = float(deltas[indice])
+
+    return resultado
+
+
+def seleccionar_por_delta_cadena(cadena, spot: float, delta_objetivo: float = 0.16,
+                                 vencimientos: Optional[List[str]] = None,
+                                 vol_respaldo: Optional[float] = None, tasa: float = 0.0,
+                                 oi_minimo: float = 0) -> Dict[str, Dict]:
+    """
+    Strikes listados más cercanos al delta objetivo para uno o varios vencimientos
+
+    Evalúa el delta de todos los strikes de cada vencimiento en una sola operación
+    vectorizada con la IV de la cadena (vol_respaldo donde falte).
+
+    Args:
+        cadena: CadenaOpciones
+        spot: Precio del subyacente
+        delta_objetivo: |Delta| buscado
+        vencimientos: Vencimientos a resolver (por defecto todos)
+        vol_respaldo: Volatilidad en decimal para strikes sin IV (ej: VIX / 100)
+        tasa: Tasa libre de riesgo continua
+        oi_minimo: Open interest mínimo
+
+    Returns:
+        Dict {vencimiento: {'sell_put', 'delta_put', 'iv_put', 'sell_call', 'delta_call', 'iv_call'}}
+    """
+    resultados = {}
+
+    for vencimiento in vencimientos or cadena.vencimientos():
+        tiempo = dias_horizonte(fecha_objetivo=vencimiento) / DIAS_TRADING_ANIO
+        resultado = {'delta_objetivo': delta_objetivo, 'tiempo_anios': tiempo}
+
+        for lado, es_call in (('put', False), ('call', True)):
+            bloque = cadena.columnas(vencimiento, lado)
+            mascara = bloque['oi'] >= oi_minimo if oi_minimo else np.ones(bloque['strike'].size, dtype=bool)
+            strikes = bloque['strike'][mascara]
+            iv = bloque['iv'][mascara]
+            if vol_respaldo is not None:
+                iv = np.where(np.isnan(iv), vol_respaldo, iv)
+
+            validos = ~np.isnan(iv)
+            if not validos.any():
+                raise ValueError(f"Sin IV para las opciones {lado} de {vencimiento}")
+            strikes, iv = strikes[validos], iv[validos]
+
+            deltas = _delta(es_call, spot, strikes, iv, tiempo, tasa, 0.0)
+            indice = _indice_mas_cercano(deltas, delta_objetivo)
+            strike = float(strikes[indice])
+
+            resultado[f'sell_{lado}'] = int(strike) if strike.is_integer() else strike
+            resultado[f'delta_{lado}'] = float(deltas[indice])
+            resultado[f'iv_{lado}'] = float(iv[indice])
+
+        resultados[vencimiento] = resultado
+
+    return resultados
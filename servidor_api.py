@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Servidor API - Iron Condor SPX
+Servicio HTTP/JSON liviano (asyncio, sin dependencias externas) que expone el
+cálculo del agente para clientes automáticos, con endpoint por lotes
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import math
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import metricas
+from agente_iron_condor_final import AgenteIronCondorSPX
+from perfilado import MODOS as MODOS_PERFIL, configurar as configurar_perfil, perfilar_solicitud
+from proveedores_datos import PROVEEDORES, crear_proveedor
+
+HOST_DEFAULT = '127.0.0.1'
+PUERTO_DEFAULT = 8765
+VENTANA_DEFAULT = 1.0       # Segundos que se comparte un mismo snapshot del mercado
+MAX_CUERPO = 8 * 1024 * 1024
+MAX_LOTE = 10_000
+MAX_LOTE_ESTRES = 100
+MAX_PUNTOS_ESTRES = 500     # Puntos por eje de la malla de estrés
+
+ESTADOS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+
+class ErrorAPI(Exception):
+    """
+    Error con código HTTP para devolver al cliente
+    """
+
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class SnapshotCompartido:
+    """
+    Snapshot del mercado compartido por todos los clientes durante una ventana.
+
+    Las peticiones concurrentes que encuentran el snapshot vencido esperan una
+    única descarga en curso en lugar de lanzar una cada una.
+    """
+
+    def __init__(self, agente: AgenteIronCondorSPX, ventana_segundos: float = VENTANA_DEFAULT):
+        self.agente = agente
+        self.ventana_segundos = ventana_segundos
+        self.descargas = 0
+        self._datos = None
+        self._obtenido = 0.0
+        self._en_curso = None
+
+    async def obtener(self) -> Dict:
+        """
+        Devuelve el snapshot vigente o espera la descarga en curso
+        """
+        if self._datos is not None and time.monotonic() - self._obtenido < self.ventana_segundos:
+            return self._datos
+
+        if self._en_curso is None:
+            self._en_curso = asyncio.ensure_future(self._descargar())
+        datos = await asyncio.shield(self._en_curso)
+
+        if not datos:
+            raise ErrorAPI(503, "No se pudieron obtener datos del mercado")
+        return datos
+
+    async def _descargar(self) -> Optional[Dict]:
+        try:
+            datos = await self.agente.obtener_datos_mercado_async()
+            self.descargas += 1
+            if datos:
+                self._datos, self._obtenido = datos, time.monotonic()
+            return datos
+        finally:
+            self._en_curso = None
+
+
+class ServidorIronCondor:
+    """
+    Endpoints JSON (GET con query string o POST con cuerpo JSON):
+
+        /salud      Estado del servicio
+        /iv_puntos  calcular_iv_puntos (spx, vix, periodo, buffer)
+        /strikes    calcular_strikes (spx, iv_puntos o vix, ala)
+        /calculo    ejecutar_calculo_completo (ala, periodo, buffer, fecha_objetivo, delta_objetivo)
+        /lote       Varios /calculo sobre un mismo snapshot: {"parametros": [{...}, ...]}
+        /estres     Malla de P&L SPX × VIX del condor de /calculo (rango_spot %, vol_min, vol_max,
+                    puntos, dias, malla=0 para solo el resumen); acepta lotes como /lote
+        /metricas   Métricas del proceso en formato de texto de Prometheus
+    """
+
+    def __init__(self, agente: AgenteIronCondorSPX, ventana_segundos: float = VENTANA_DEFAULT):
+        self.agente = agente
+        self.snapshot = SnapshotCompartido(agente, ventana_segundos)
+        self.peticiones = 0
+        self.rutas = {
+            '/salud': self.salud,
+            '/iv_puntos': self.iv_puntos,
+            '/strikes': self.strikes,
+            '/calculo': self.calculo,
+            '/lote': self.lote,
+            '/estres': self.estres,
+            '/metricas': self.metricas
+        }
+
+    async def iniciar(self, host: str = HOST_DEFAULT, puerto: int = PUERTO_DEFAULT) -> asyncio.AbstractServer:
+        """
+        Abre el socket y devuelve el servidor asyncio (puerto 0 = puerto libre)
+        """
+        return await asyncio.start_server(self._atender, host, puerto)
+
+    # --- HTTP ---
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Atiende una conexión HTTP/1.1 con keep-alive
+        """
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                metodo, objetivo, version = linea.decode('latin-1').split()
+
+                cabeceras = {}
+                while True:
+                    cabecera = await reader.readline()
+                    if cabecera in (b'\r\n', b'\n', b''):
+                        break
+                    clave, _, valor = cabecera.decode('latin-1').partition(':')
+                    cabeceras[clave.strip().lower()] = valor.strip()
+
+                largo = int(cabeceras.get('content-length', 0))
+                if largo > MAX_CUERPO:
+                    await self._responder(writer, 413, {'error': "Cuerpo demasiado grande"}, False)
+                    break
+                cuerpo = await reader.readexactly(largo) if largo else b''
+
+                estado, respuesta = await self._despachar(metodo, objetivo, cuerpo)
+                mantener = version == 'HTTP/1.1' and cabeceras.get('connection', '').lower() != 'close'
+                await self._responder(writer, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _responder(self, writer: asyncio.StreamWriter, estado: int, respuesta, mantener: bool):
+        if isinstance(respuesta, str):
+            cuerpo, tipo = respuesta.encode('utf-8'), 'text/plain; version=0.0.4'
+        elif isinstance(respuesta, bytes):
+            # JSON ya serializado fuera del event loop (respuestas grandes como /estres)
+            cuerpo, tipo = respuesta, 'application/json'
+        else:
+            cuerpo, tipo = _serializar(respuesta), 'application/json'
+        cabeceras = (
+            f"HTTP/1.1 {estado} {ESTADOS.get(estado, '')}\r\n"
+            f"Content-Type: {tipo}; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        writer.write(cabeceras.encode('latin-1') + cuerpo)
+        await writer.drain()
+
+    async def _despachar(self, metodo: str, objetivo: str, cuerpo: bytes) -> Tuple[int, Dict]:
+        """
+        Resuelve la ruta y convierte excepciones en respuestas JSON con su código
+        """
+        self.peticiones += 1
+        url = urlsplit(objetivo)
+        manejador = self.rutas.get(url.path.rstrip('/') or '/')
+
+        try:
+            if manejador is None:
+                raise ErrorAPI(404, f"Ruta desconocida: {url.path}")
+            if metodo not in ('GET', 'POST'):
+                raise ErrorAPI(405, f"Método no permitido: {metodo}")
+
+            parametros = dict(parse_qsl(url.query))
+            if cuerpo:
+                try:
+                    contenido = json.loads(cuerpo)
+                except json.JSONDecodeError as e:
+                    raise ErrorAPI(400, f"JSON inválido: {e}")
+                if isinstance(contenido, list):
+                    contenido = {'parametros': contenido}
+                if not isinstance(contenido, dict):
+                    raise ErrorAPI(400, "El cuerpo debe ser un objeto JSON")
+                parametros.update(contenido)
+
+            # ?perfil=determinista|muestreo perfila solo esta petición
+            modo_perfil = parametros.pop('perfil', None)
+            if modo_perfil:
+                if modo_perfil not in MODOS_PERFIL:
+                    raise ErrorAPI(400, f"Modo de perfilado debe ser uno de: {list(MODOS_PERFIL)}")
+                with perfilar_solicitud(modo_perfil):
+                    return 200, await manejador(parametros)
+            return 200, await manejador(parametros)
+
+        except ErrorAPI as e:
+            return e.estado, {'error': str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    # --- Endpoints ---
+
+    async def salud(self, parametros: Dict) -> Dict:
+        return {
+            'estado': 'ok',
+            'proveedor': self.agente.proveedor.descripcion,
+            'peticiones': self.peticiones,
+            'descargas_mercado': self.snapshot.descargas,
+            'ventana_segundos': self.snapshot.ventana_segundos
+        }
+
+    async def metricas(self, parametros: Dict) -> str:
+        return metricas.exportar_prometheus()
+
+    async def iv_puntos(self, parametros: Dict) -> Dict:
+        spx, vix = await self._spx_vix(parametros)
+        return await self._en_ejecutor(
+            self.agente.calcular_iv_puntos, spx, vix, parametros.get('periodo'), _numero(parametros, 'buffer', int, 10)
+        )
+
+    async def strikes(self, parametros: Dict) -> Dict:
+        spx, vix = await self._spx_vix(parametros, necesita_vix='iv_puntos' not in parametros)
+        return await self._en_ejecutor(self._strikes, parametros, spx, vix)
+
+    async def calculo(self, parametros: Dict) -> Dict:
+        datos = await self.snapshot.obtener()
+        return await self._en_ejecutor(self._calcular, parametros, datos)
+
+    async def lote(self, parametros: Dict) -> Dict:
+        lote = parametros.get('parametros')
+        if not isinstance(lote, list):
+            raise ErrorAPI(400, "Se espera 'parametros' con una lista de objetos")
+        if len(lote) > MAX_LOTE:
+            raise ErrorAPI(413, f"Máximo {MAX_LOTE} cálculos por lote")
+
+        datos = await self.snapshot.obtener()
+        resultados = await self._en_ejecutor(self._calcular_lote, lote, datos)
+        return {'datos_mercado': datos, 'resultados': resultados}
+
+    async def estres(self, parametros: Dict) -> bytes:
+        lote = parametros.get('parametros')
+        if lote is not None:
+            if not isinstance(lote, list):
+                raise ErrorAPI(400, "Se espera 'parametros' con una lista de objetos")
+            if len(lote) > MAX_LOTE_ESTRES:
+                raise ErrorAPI(413, f"Máximo {MAX_LOTE_ESTRES} mallas por lote")
+
+        # El snapshot solo hace falta si algún escenario no trae su propio SPX y VIX
+        escenarios = lote if lote is not None else [parametros]
+        if all(isinstance(p, dict) and _numero(p, 'spx', float, None) is not None
+               and _numero(p, 'vix', float, None) is not None for p in escenarios):
+            datos = {'fecha_datos': 'Manual', 'fuente_datos': 'Manual'}
+        else:
+            datos = await self.snapshot.obtener()
+
+        # Una malla de 500×500 son ~2 MB de JSON: se serializa en el pool junto con el cálculo
+        if lote is None:
+            return await self._en_ejecutor(_serializado, self._estres, parametros, datos)
+        return await self._en_ejecutor(_serializado, self._estres_lote, lote, datos)
+
+    # --- Cálculo ---
+
+    async def _en_ejecutor(self, funcion, *args):
+        """
+        Ejecuta un cálculo en el pool de hilos: el event loop sigue atendiendo conexiones.
+        Se copia el contexto para que el hilo vea el ?perfil= de la petición.
+        """
+        contexto = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(None, contexto.run, funcion, *args)
+
+    def _strikes(self, parametros: Dict, spx: float, vix: Optional[float]) -> Dict:
+        iv_puntos = _numero(parametros, 'iv_puntos', float, None)
+        if iv_puntos is None:
+            iv_puntos = self.agente.calcular_iv_puntos(
+                spx, vix, periodo=parametros.get('periodo'), buffer=_numero(parametros, 'buffer', int, 10)
+            )['iv_final']
+        return self.agente.calcular_strikes(spx, iv_puntos, _numero(parametros, 'ala', int, 25))
+
+    def _calcular(self, parametros: Dict, datos: Dict) -> Dict:
+        fecha_objetivo = parametros.get('fecha_objetivo') or None
+        return self.agente.ejecutar_calculo_completo(
+            fecha_objetivo=fecha_objetivo,
+            ala=_numero(parametros, 'ala', int, 25),
+            periodo=parametros.get('periodo'),
+            buffer=_numero(parametros, 'buffer', int, 10),
+            datos_mercado=dict(datos, fecha_objetivo=fecha_objetivo or 'Actual'),
+            delta_objetivo=_numero(parametros, 'delta_objetivo', float, None)
+        )
+
+    def _calcular_lote(self, lote: List[Dict], datos: Dict) -> List[Dict]:
+        """
+        Calcula cada conjunto de parámetros; un error no interrumpe el resto del lote
+        """
+        resultados = []
+        for parametros in lote:
+            try:
+                if not isinstance(parametros, dict):
+                    raise TypeError("Cada elemento del lote debe ser un objeto")
+                resultado = self._calcular(parametros, datos)
+                resultado.pop('datos_mercado')
+                resultados.append(resultado)
+            except Exception as e:
+                resultados.append({'error': str(e), 'parametros': parametros})
+        return resultados
+
+    def _estres(self, parametros: Dict, datos: Dict) -> Dict:
+        """
+        Condor de /calculo (con SPX y VIX propios si se indican) y su malla de estrés
+        """
+        from prueba_estres import PUNTOS_DEFAULT, RANGO_SPOT_DEFAULT, RANGO_VOL_DEFAULT, \
+            malla_a_json, malla_estres_resultado, resumir_malla
+
+        puntos = _numero(parametros, 'puntos', int, PUNTOS_DEFAULT)
+        if not 2 <= puntos <= MAX_PUNTOS_ESTRES:
+            raise ErrorAPI(400, f"'puntos' debe estar entre 2 y {MAX_PUNTOS_ESTRES}")
+
+        spx = _numero(parametros, 'spx', float, None)
+        vix = _numero(parametros, 'vix', float, None)
+        datos = dict(datos,
+                     spx_valor=datos['spx_valor'] if spx is None else spx,
+                     vix_valor=datos['vix_valor'] if vix is None else vix)
+        resultado = self._calcular(parametros, datos)
+
+        malla = malla_estres_resultado(
+            resultado,
+            rango_spot=_numero(parametros, 'rango_spot', float, RANGO_SPOT_DEFAULT * 100) / 100,
+            rango_vol=(_numero(parametros, 'vol_min', float, RANGO_VOL_DEFAULT[0]),
+                       _numero(parametros, 'vol_max', float, RANGO_VOL_DEFAULT[1])),
+            puntos_spot=puntos,
+            puntos_vol=puntos,
+            dias_transcurridos=_numero(parametros, 'dias', float, 0)
+        )
+        incluir_malla = str(parametros.get('malla', '1')).lower() not in ('0', 'false', 'no')
+        respuesta = malla_a_json(malla) if incluir_malla else {'resumen': resumir_malla(malla)}
+        respuesta.update({
+            'spx_valor': datos['spx_valor'],
+            'vix_valor': datos['vix_valor'],
+            'strikes': {pata: resultado['strikes'][pata] for pata in ('buy_put', 'sell_put', 'sell_call', 'buy_call')}
+        })
+        return respuesta
+
+    def _estres_lote(self, lote: List[Dict], datos: Dict) -> Dict:
+        resultados = []
+        for parametros in lote:
+            try:
+                if not isinstance(parametros, dict):
+                    raise TypeError("Cada elemento del lote debe ser un objeto")
+                resultados.append(self._estres(parametros, datos))
+            except Exception as e:
+                resultados.append({'error': str(e), 'parametros': parametros})
+        return {'resultados': resultados}
+
+    async def _spx_vix(self, parametros: Dict, necesita_vix: bool = True) -> Tuple[float, float]:
+        """
+        SPX y VIX de los parámetros, o del snapshot compartido si no se indican
+        """
+        spx = _numero(parametros, 'spx', float, None)
+        vix = _numero(parametros, 'vix', float, None)
+        if spx is None or (vix is None and necesita_vix):
+            datos = await self.snapshot.obtener()
+            spx = datos['spx_valor'] if spx is None else spx
+            vix = datos['vix_valor'] if vix is None else vix
+        return spx, vix
+
+
+def _numero(parametros: Dict, clave: str, tipo, defecto):
+    """
+    Lee un parámetro numérico (los de la query string llegan como texto)
+    """
+    valor = parametros.get(clave)
+    if valor is None or valor == '':
+        return defecto
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        numero = math.nan
+    if not math.isfinite(numero) or (tipo is int and not numero.is_integer()):
+        raise ErrorAPI(400, f"Parámetro '{clave}' inválido: {valor!r}")
+    return tipo(numero)
+
+
+def _serializar(respuesta) -> bytes:
+    return json.dumps(respuesta, default=_a_json, ensure_ascii=False).encode('utf-8')
+
+
+def _serializado(funcion, *args) -> bytes:
+    """
+    Llama a la función y devuelve su respuesta ya serializada (para el pool de hilos)
+    """
+    return _serializar(funcion(*args))
+
+
+def _a_json(valor):
+    """
+    Convierte tipos de NumPy a tipos nativos al serializar
+    """
+    if hasattr(valor, 'tolist'):
+        return valor.tolist()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+async def prueba_carga(host: str, puerto: int, ruta: str = '/calculo?ala=25',
+                       clientes: int = 50, peticiones: int = 2000) -> Dict:
+    """
+    Generador de carga local: 'clientes' conexiones keep-alive repartiéndose 'peticiones'
+
+    Returns:
+        Dict con peticiones por segundo, latencias p50/p99 (ms) y errores
+    """
+    latencias = []
+    errores = 0
+    pendientes = iter(range(peticiones))
+
+    async def cliente():
+        nonlocal errores
+        reader, writer = await asyncio.open_connection(host, puerto)
+        solicitud = f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1')
+        try:
+            for _ in pendientes:
+                inicio = time.perf_counter()
+                writer.write(solicitud)
+                estado = (await reader.readline()).split()[1]
+                largo = 0
+                while True:
+                    cabecera = await reader.readline()
+                    if cabecera in (b'\r\n', b''):
+                        break
+                    if cabecera.lower().startswith(b'content-length:'):
+                        largo = int(cabecera.split(b':')[1])
+                await reader.readexactly(largo)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                errores += estado != b'200'
+        finally:
+            writer.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(clientes)))
+    segundos = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'peticiones': len(latencias),
+        'segundos': round(segundos, 3),
+        'peticiones_por_segundo': round(len(latencias) / segundos, 1),
+        'latencia_p50_ms': round(latencias[len(latencias) // 2], 2),
+        'latencia_p99_ms': round(latencias[int(len(latencias) * 0.99) - 1], 2),
+        'errores': errores
+    }
+
+
+async def _ejecutar(args):
+    agente = AgenteIronCondorSPX(proveedor=crear_proveedor(args.proveedor, args.replay, args.semilla))
+    servidor_api = ServidorIronCondor(agente, ventana_segundos=args.ventana)
+    servidor = await servidor_api.iniciar(args.host, 0 if args.prueba_carga else args.puerto)
+    host, puerto = servidor.sockets[0].getsockname()[:2]
+
+    async with servidor:
+        if args.prueba_carga:
+            print(f"🔥 Prueba de carga: {args.prueba_carga:,} peticiones, {args.clientes} clientes "
+                  f"({agente.proveedor.descripcion})")
+            r = await prueba_carga(host, puerto, args.ruta, args.clientes, args.prueba_carga)
+            print(f"   ⚡ {r['peticiones_por_segundo']:,.0f} pet/s | p50 {r['latencia_p50_ms']:.2f} ms | "
+                  f"p99 {r['latencia_p99_ms']:.2f} ms | errores {r['errores']} | "
+                  f"descargas del mercado {servidor_api.snapshot.descargas}")
+            return
+
+        print(f"🌐 API Iron Condor en http://{host}:{puerto} ({agente.proveedor.descripcion})")
+        print(f"   Endpoints: {', '.join(servidor_api.rutas)}")
+        await servidor.serve_forever()
+
+
+def main():
+    """
+    Función principal del servidor por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="API HTTP/JSON del Iron Condor SPX")
+    parser.add_argument('--host', default=HOST_DEFAULT)
+    parser.add_argument('--puerto', type=int, default=PUERTO_DEFAULT)
+    parser.add_argument('--proveedor', default='yfinance', choices=list(PROVEEDORES))
+    parser.add_argument('--replay', help="CSV/Parquet de cotizaciones para el proveedor replay")
+    parser.add_argument('--semilla', type=int, help="Semilla del proveedor sintético")
+    parser.add_argument('--ventana', type=float, default=VENTANA_DEFAULT,
+                        help="Segundos que se comparte un snapshot del mercado")
+    parser.add_argument('--prueba-carga', type=int, metavar='N',
+                        help="Levanta el servidor en un puerto libre y le envía N peticiones")
+    parser.add_argument('--clientes', type=int, default=50)
+    parser.add_argument('--ruta', default='/calculo?ala=25', help="Ruta usada en la prueba de carga")
+    parser.add_argument('--metricas', action='store_true', help="Recolectar métricas (expuestas en /metricas)")
+    parser.add_argument('--perfil', choices=list(MODOS_PERFIL),
+                        help="Perfilar todas las peticiones (por petición: ?perfil=<modo>)")
+    parser.add_argument('--tasa-perfil', type=float, default=1.0,
+                        help="Fracción de cálculos perfilados con --perfil (ej: 0.01)")
+    args = parser.parse_args()
+
+    if args.perfil:
+        configurar_perfil(args.perfil, tasa=args.tasa_perfil)
+
+    if args.metricas:
+        metricas.activar()
+
+    try:
+        asyncio.run(_ejecutar(args))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Agente: alcance de la fase 'total' en las versiones síncrona y asyncio
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import metricas
+from agente_iron_condor_final import AgenteIronCondorSPX
+from proveedores_datos import ProveedorSintetico
+
+DEMORA = 0.2
+
+
+@pytest.fixture
+def agente_lento():
+    anterior = metricas.activo()
+    metricas.activar(True)
+    metricas.REGISTRO.reiniciar()
+    agente = AgenteIronCondorSPX(proveedor=ProveedorSintetico(semilla=1), usar_cache=False)
+    obtener, obtener_async = agente.obtener_datos_mercado, agente.obtener_datos_mercado_async
+
+    def lento(*args, **kwargs):
+        time.sleep(DEMORA)
+        return obtener(*args, **kwargs)
+
+    async def lento_async(*args, **kwargs):
+        await asyncio.sleep(DEMORA)
+        return await obtener_async(*args, **kwargs)
+
+    agente.obtener_datos_mercado, agente.obtener_datos_mercado_async = lento, lento_async
+    yield agente
+    metricas.activar(anterior)
+    metricas.REGISTRO.reiniciar()
+
+
+def _fase(fase):
+    return metricas.REGISTRO.instantanea()['histogramas'][f'iron_condor_fase_segundos{{fase="{fase}"}}']
+
+
+@pytest.mark.parametrize('asincrono', [False, True])
+def test_total_incluye_la_descarga(agente_lento, asincrono):
+    if asincrono:
+        asyncio.run(agente_lento.ejecutar_calculo_completo_async(ala=25))
+    else:
+        agente_lento.ejecutar_calculo_completo(ala=25)
+
+    total, descarga = _fase('total'), _fase('datos_mercado')
+    assert total['cantidad'] == descarga['cantidad'] == 1
+    assert total['suma'] >= descarga['suma'] >= DEMORA
+
+
+def test_error_de_parametros_cuenta_en_total(agente_lento):
+    with pytest.raises(ValueError):
+        asyncio.run(agente_lento.ejecutar_calculo_completo_async(ala=7))
+    assert _fase('total')['cantidad'] == 1
+
+
+def test_perfil_cubre_descarga_y_validacion(tmp_path, monkeypatch):
+    import pstats
+
+    import perfilado
+
+    monkeypatch.setitem(perfilado._config, 'directorio', str(tmp_path))
+    agente = AgenteIronCondorSPX(proveedor=ProveedorSintetico(semilla=1), usar_cache=False)
+
+    with perfilado.perfilar_solicitud('determinista'):
+        agente.ejecutar_calculo_completo(ala=25)
+        asyncio.run(agente.ejecutar_calculo_completo_async(ala=25))
+
+    # El .folded descarta pilas de menos de 1 µs: las llamadas se comprueban en el .prof
+    completo, = tmp_path.glob('ejecutar_calculo_completo-*.prof')
+    funciones = {funcion for _, _, funcion in pstats.Stats(str(completo)).stats}
+    assert {'obtener_datos_mercado', '_validar_parametros'} <= funciones
+    # La versión asyncio solo perfila el cálculo
+    assert len(list(tmp_path.glob('calculo-*.folded'))) == 1
+
+
+def test_barrido_ajusta_a_la_cadena_como_el_calculo():
+    from datetime import datetime, timedelta
+
+    import numpy as np
+
+    from cadena_opciones import CadenaOpciones
+
+    agente = AgenteIronCondorSPX(proveedor=ProveedorSintetico(semilla=1), usar_cache=False)
+    datos = agente.obtener_datos_mercado()
+    vencimiento = (datetime.now() + timedelta(days=3)).strftime('%Y-%m-%d')
+    strikes = np.arange(4000, 7500, 25.0)  # Solo múltiplos de 25: obliga a ajustar
+    agente.cadena_opciones = CadenaOpciones({
+        'strike': np.concatenate([strikes, strikes]),
+        'vencimiento': np.full(2 * strikes.size, vencimiento),
+        'tipo': np.repeat(['put', 'call'], strikes.size)
+    })
+
+    filas = agente.barrido_parametros(alas=[10, 25], periodos=['diario', 'semanal'], buffers=[0, 15],
+                                      datos_mercado=datos)
+    assert len(filas) == 8
+    for fila in filas:
+        esperado = agente.ejecutar_calculo_completo(ala=fila['ala'], periodo=fila['periodo'],
+                                                    buffer=fila['buffer'], datos_mercado=datos)['strikes']
+        assert {k: fila[k] for k in ('buy_put', 'sell_put', 'sell_call', 'buy_call', 'vencimiento')} == \
+            {k: esperado[k] for k in ('buy_put', 'sell_put', 'sell_call', 'buy_call', 'vencimiento')}
+        assert fila['sell_put'] % 25 == 0 and fila['buy_call'] % 25 == 0
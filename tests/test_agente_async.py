@@ -0,0 +1,91 @@
+"""
+API asyncio del agente: mismo resultado que la versión síncrona, muchas descargas
+concurrentes en un solo event loop sobre el pool de conexiones, plazos y cancelación
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agente_iron_condor_final import AgenteIronCondorSPX
+from proveedores_datos import PoolConexionesHTTP, ProveedorHTTP, ProveedorSintetico
+from resiliencia import ServidorFallas
+
+COLUMNAS_STRIKES = ('sell_put', 'buy_put', 'sell_call', 'buy_call', 'rango_profit')
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorFallas(semilla=3)
+    servidor.url = servidor.iniciar()
+    yield servidor
+    servidor.detener()
+
+
+def _agente_http(servidor, max_conexiones=10):
+    proveedor = ProveedorHTTP(servidor.url, PoolConexionesHTTP(max_conexiones_por_host=max_conexiones))
+    return AgenteIronCondorSPX(proveedor=proveedor, usar_cache=False)
+
+
+def test_async_igual_al_sincrono():
+    sincrono = AgenteIronCondorSPX(proveedor=ProveedorSintetico(semilla=7), usar_cache=False)
+    asincrono = AgenteIronCondorSPX(proveedor=ProveedorSintetico(semilla=7), usar_cache=False)
+
+    esperado = sincrono.ejecutar_calculo_completo(ala=20, periodo='semanal', buffer=5)
+    resultado = asyncio.run(asincrono.ejecutar_calculo_completo_async(ala=20, periodo='semanal', buffer=5))
+
+    for clave in ('spx_valor', 'vix_valor'):
+        assert resultado['datos_mercado'][clave] == esperado['datos_mercado'][clave]
+    assert resultado['parametros'] == esperado['parametros']
+    assert resultado['valoracion'] == esperado['valoracion']
+    assert {c: resultado['strikes'][c] for c in COLUMNAS_STRIKES} == \
+        {c: esperado['strikes'][c] for c in COLUMNAS_STRIKES}
+
+    # El cálculo puro sigue siendo síncrono sobre un snapshot obtenido en el loop
+    datos = asyncio.run(asincrono.obtener_datos_mercado_async())
+    assert asincrono.ejecutar_calculo_completo(ala=20, datos_mercado=datos)['strikes']['sell_put'] > 0
+
+
+def test_calculos_concurrentes_comparten_el_pool(servidor):
+    servidor.latencia = 0.1
+    agente = _agente_http(servidor, max_conexiones=4)
+
+    async def lote():
+        return await asyncio.gather(*(agente.ejecutar_calculo_completo_async(ala=25) for _ in range(16)))
+
+    inicio = time.perf_counter()
+    resultados = asyncio.run(lote())
+    segundos = time.perf_counter() - inicio
+
+    assert all(r is not None and r['strikes']['sell_put'] > 0 for r in resultados)
+    # 16 solicitudes de 0.1s en 4 conexiones: ~0.4s, lejos de los 1.6s en serie
+    assert segundos < 1.2
+    assert servidor.peticiones == 16
+    assert agente.proveedor.pool.conexiones_abiertas <= 4
+
+
+def test_plazo_vencido_libera_el_loop(servidor):
+    servidor.latencia = 0.5
+    agente = _agente_http(servidor)
+    agente.timeout_segundos = 0.1
+
+    inicio = time.perf_counter()
+    assert asyncio.run(agente.obtener_datos_mercado_async()) is None
+    assert time.perf_counter() - inicio < 0.4
+
+
+def test_cancelar_la_tarea_cancela_la_descarga(servidor):
+    servidor.latencia = 0.5
+    agente = _agente_http(servidor)
+
+    async def cancelar():
+        tarea = asyncio.ensure_future(agente.ejecutar_calculo_completo_async(ala=25))
+        await asyncio.sleep(0.05)
+        tarea.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tarea
+
+    inicio = time.perf_counter()
+    asyncio.run(cancelar())
+    assert time.perf_counter() - inicio < 0.4
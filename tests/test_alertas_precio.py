@@ -0,0 +1,65 @@
+"""
+Alertas de precio: índice ordenado de niveles y ciclo disparo/rearme
+"""
+
+import pytest
+
+from alertas_precio import BAJADA, SUBIDA, IndiceNiveles, MotorAlertas
+
+
+def test_indice_bajada_extrae_niveles_cruzados():
+    indice = IndiceNiveles(BAJADA)
+    for ident, nivel in enumerate([90, 110, 100, 100], start=1):
+        indice.agregar(nivel, ident)
+
+    assert indice.extraer_cruzados(101) == [2]
+    assert sorted(indice.extraer_cruzados(100)) == [3, 4]
+    assert indice.extraer_cruzados(95) == []
+    assert len(indice) == 1
+
+
+def test_indice_subida_extrae_niveles_cruzados():
+    indice = IndiceNiveles(SUBIDA)
+    for ident, nivel in enumerate([90, 110, 100], start=1):
+        indice.agregar(nivel, ident)
+
+    assert indice.extraer_cruzados(100) == [3, 1]
+    assert indice.extraer_cruzados(105) == []
+    assert indice.quitar(110, 2) and not indice.quitar(110, 2)
+    assert len(indice) == 0
+
+
+def test_disparo_y_rearme_por_histeresis():
+    motor = MotorAlertas(histeresis=5)
+    ident = motor.agregar_alerta(100, BAJADA, lado='put')
+
+    disparos = [len(motor.actualizar(p, momento=0)) for p in (101, 100, 100, 99, 104, 105, 100)]
+    assert disparos == [0, 1, 0, 0, 0, 0, 1]
+    assert motor.actualizar(100, momento=0) == []
+
+    motor.actualizar(110, momento=0)
+    evento, = motor.actualizar(99.5, momento=0)
+    assert evento['id'] == ident and evento['precio'] == 99.5 and 'armada' not in evento
+    assert motor.disparadas == 3
+
+
+def test_posicion_dispara_put_y_call():
+    motor = MotorAlertas(histeresis=5)
+    motor.agregar_posicion({'sell_put': 5700, 'sell_call': 5900}, distancias=(10, 0))
+    assert [e['distancia'] for e in motor.actualizar(5705)] == [10]
+    assert sorted((e['lado'], e['distancia']) for e in motor.actualizar(5905)) == [('call', 0), ('call', 10)]
+
+
+def test_quitar_alerta_desarmada():
+    motor = MotorAlertas(histeresis=5)
+    ident = motor.agregar_alerta(100, SUBIDA)
+    motor.actualizar(100)
+    assert motor.quitar_alerta(ident)
+    assert len(motor) == 0
+    assert all(len(indice) == 0 for indice in motor._indices.values())
+
+
+@pytest.mark.parametrize('histeresis', [0, -1])
+def test_histeresis_no_positiva(histeresis):
+    with pytest.raises(ValueError):
+        MotorAlertas(histeresis=histeresis)
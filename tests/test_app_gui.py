@@ -0,0 +1,159 @@
+"""
+GUI: hilo de trabajo único, resultados de generaciones viejas descartados y
+recálculo con debounce (sin pantalla: una raíz falsa hace de event loop de Tk)
+"""
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agente_iron_condor_final import AgenteIronCondorSPX
+from app_iron_condor_gui import DEBOUNCE_MS, IronCondorGUI
+from proveedores_datos import ProveedorSintetico
+
+
+class RaizFalsa:
+    """
+    Guarda los callbacks de after() y los ejecuta al llamar procesar()
+    """
+
+    def __init__(self):
+        self.pendientes = {}
+        self.destruida = False
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def after(self, ms, funcion, *args):
+        with self._lock:
+            ident = next(self._ids)
+            self.pendientes[ident] = (ms, funcion, args)
+            return ident
+
+    def after_cancel(self, ident):
+        with self._lock:
+            self.pendientes.pop(ident, None)
+
+    def procesar(self):
+        with self._lock:
+            pendientes, self.pendientes = list(self.pendientes.values()), {}
+        for _, funcion, args in pendientes:
+            funcion(*args)
+
+    def destroy(self):
+        self.destruida = True
+
+
+class Variable:
+    def __init__(self, valor):
+        self.valor = valor
+
+    def get(self):
+        return self.valor
+
+
+class Etiqueta:
+    def config(self, **opciones):
+        self.texto = opciones.get('text')
+
+
+@pytest.fixture
+def gui():
+    # Mismo estado que IronCondorGUI.__init__, sin crear widgets
+    ventana = IronCondorGUI.__new__(IronCondorGUI)
+    ventana.root = RaizFalsa()
+    ventana.agente = AgenteIronCondorSPX(proveedor=ProveedorSintetico(semilla=1), usar_cache=False)
+    ventana.ejecutor = ThreadPoolExecutor(max_workers=1)
+    ventana.tarea = None
+    ventana.generacion = 0
+    ventana.recalculo_programado = None
+    ventana.datos_mercado = None
+    ventana.inicio_descarga = None
+    ventana.ala_var, ventana.periodo_var, ventana.buffer_var = Variable('25'), Variable('diario'), Variable('10')
+    ventana.status_label = Etiqueta()
+    yield ventana
+    ventana.ejecutor.shutdown(wait=True)
+
+
+def _bloquear(gui):
+    """
+    Ocupa el hilo de trabajo hasta que se active el evento devuelto
+    """
+    liberar, ocupado = threading.Event(), threading.Event()
+
+    def esperar():
+        ocupado.set()
+        liberar.wait(5)
+        return 'vieja'
+
+    recibidos = []
+    gui._enviar(esperar, recibidos.append)
+    ocupado.wait(5)
+    return liberar, recibidos
+
+
+def test_solo_se_muestra_la_ultima_generacion(gui):
+    liberar, recibidos = _bloquear(gui)
+    ejecutadas = []
+    gui._enviar(lambda: ejecutadas.append('pendiente'), recibidos.append)
+    gui._enviar(lambda: 'nueva', recibidos.append)
+
+    liberar.set()
+    gui.tarea.result(timeout=5)
+    gui.root.procesar()
+
+    assert ejecutadas == []          # La pendiente se canceló antes de empezar
+    assert recibidos == ['nueva']    # La que estaba en curso llegó tarde y se descartó
+
+
+def test_errores_van_al_manejador_de_error(gui, monkeypatch):
+    errores = []
+    monkeypatch.setattr(gui, '_mostrar_error', errores.append)
+
+    def fallar():
+        raise ValueError("sin datos")
+
+    gui._enviar(fallar, lambda valor: None)
+    gui.tarea.result(timeout=5)
+    gui.root.procesar()
+    assert errores == ['sin datos']
+
+
+def test_debounce_reprograma_un_solo_recalculo(gui, monkeypatch):
+    recalculos = []
+    monkeypatch.setattr(gui, '_recalcular', lambda: recalculos.append(1))
+
+    for _ in range(5):
+        gui._programar_recalculo()
+
+    assert [ms for ms, _, _ in gui.root.pendientes.values()] == [DEBOUNCE_MS]
+    gui.root.procesar()
+    assert recalculos == [1]
+
+
+def test_recalculo_reutiliza_el_snapshot(gui, monkeypatch):
+    descargas = []
+    obtener = gui.agente.obtener_datos_mercado
+    monkeypatch.setattr(gui.agente, 'obtener_datos_mercado', lambda: descargas.append(1) or obtener())
+
+    primero = gui._ejecutar_calculo(25, 'diario', 10, True)
+    gui._ejecutar_calculo(10, 'semanal', 0, False)
+    gui._ejecutar_calculo(25, 'diario', 10, True)  # Dentro de REFRESCO_MINIMO_S: sin descargar
+
+    assert len(descargas) == 1
+    assert gui.datos_mercado is primero['datos_mercado']
+
+
+def test_cerrar_cancela_lo_pendiente(gui):
+    liberar, recibidos = _bloquear(gui)
+    ejecutadas = []
+    gui._enviar(lambda: ejecutadas.append(1), recibidos.append)
+    pendiente = gui.tarea
+
+    gui.cerrar()
+    liberar.set()
+    gui.root.procesar()
+
+    assert pendiente.cancelled() and ejecutadas == [] and recibidos == []
+    assert gui.root.destruida
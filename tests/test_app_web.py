@@ -0,0 +1,72 @@
+"""
+App web: agente como recurso compartido, cotizaciones por minuto y resultados memoizados
+"""
+
+import pytest
+
+import app_iron_condor_web as web
+from agente_iron_condor_final import AgenteIronCondorSPX
+from proveedores_datos import ProveedorSintetico
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(web, 'obtener_diario_compartido', lambda: None)
+    monkeypatch.setattr(web, 'AgenteIronCondorSPX', lambda diario: AgenteIronCondorSPX(
+        proveedor=ProveedorSintetico(semilla=1), diario=diario))
+    funciones = (web.get_agente, web.obtener_snapshot, web.calcular_iron_condor, web.barrido_snapshot)
+    for funcion in funciones:
+        funcion.clear()
+    yield web
+    for funcion in funciones:
+        funcion.clear()
+
+
+def _contar(monkeypatch, objeto, metodo):
+    llamadas = []
+    original = getattr(objeto, metodo)
+
+    def contado(*args, **kwargs):
+        llamadas.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(objeto, metodo, contado)
+    return llamadas
+
+
+def test_agente_compartido(app):
+    assert app.get_agente() is app.get_agente()
+
+
+def test_una_descarga_por_minuto(app, monkeypatch):
+    descargas = _contar(monkeypatch, app.get_agente(), 'obtener_datos_mercado')
+
+    primero = app.obtener_snapshot(100)
+    assert app.obtener_snapshot(100) == primero
+    assert len(descargas) == 1
+    app.obtener_snapshot(101)
+    assert len(descargas) == 2
+
+
+def test_los_fallos_no_se_cachean(app, monkeypatch):
+    agente = app.get_agente()
+    obtener = agente.obtener_datos_mercado
+    monkeypatch.setattr(agente, 'obtener_datos_mercado', lambda: None)
+    with pytest.raises(Exception, match="No se pudieron obtener"):
+        app.obtener_snapshot(7)
+
+    monkeypatch.setattr(agente, 'obtener_datos_mercado', obtener)
+    assert app.obtener_snapshot(7)['spx_valor'] > 0
+
+
+def test_resultados_memoizados_por_snapshot_y_parametros(app, monkeypatch):
+    calculos = _contar(monkeypatch, app.get_agente(), 'ejecutar_calculo_completo')
+    datos = app.obtener_snapshot(1)
+
+    primero = app.calcular_iron_condor(datos, 25, 'diario', 10)
+    assert app.calcular_iron_condor(datos, 25, 'diario', 10)['strikes'] == primero['strikes']
+    assert len(calculos) == 1
+
+    app.calcular_iron_condor(datos, 10, 'diario', 10)
+    app.calcular_iron_condor(app.obtener_snapshot(2), 25, 'diario', 10)
+    assert len(calculos) == 3
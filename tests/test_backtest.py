@@ -0,0 +1,47 @@
+"""
+Backtest: P&L neto al vencimiento (crédito de entrada menos liquidación)
+"""
+
+import numpy as np
+import pytest
+
+from backtest_iron_condor import evaluar_configuraciones
+from motor_vectorizado import DIAS_TRADING_ANIO, calcular_strikes_lote
+from valoracion_black_scholes import valorar_iron_condor
+
+
+def _historico(spx):
+    n = len(spx)
+    return {
+        'fechas': np.datetime64('2026-01-05') + np.arange(n),
+        'spx': np.array(spx, dtype=np.float64),
+        'vix': np.full(n, 18.0)
+    }
+
+
+def _credito(spx, ala, buffer):
+    strikes = calcular_strikes_lote(spx, 18.0, ala, 'diario', buffer)
+    return float(valorar_iron_condor(spx, strikes['buy_put'], strikes['sell_put'], strikes['sell_call'],
+                                     strikes['buy_call'], 0.18, 1 / DIAS_TRADING_ANIO)['credito_neto'])
+
+
+def test_trayectoria_conocida():
+    # Día 0 → 1: sin movimiento (gana el crédito); día 1 → 2: caída total (pierde el ala)
+    historico = _historico([5800.0, 5800.0, 5000.0])
+    fila, = evaluar_configuraciones(historico, 'diario', np.array([25]), np.array([10]))
+
+    credito = _credito(5800.0, 25, 10)
+    assert credito > 0
+    assert fila['operaciones'] == 2
+    assert fila['credito_medio'] == pytest.approx(credito)
+    assert fila['pnl_total'] == pytest.approx(credito + (credito - 25))
+    assert fila['pnl_peor'] == pytest.approx(credito - 25)
+    assert fila['frecuencia_perdida_maxima'] == 0.5
+
+
+def test_ranking_premia_el_credito():
+    historico = _historico([5800.0] * 10)
+    filas = evaluar_configuraciones(historico, 'diario', np.array([25, 25]), np.array([0, 40]))
+    # Sin rupturas, el buffer menor cobra más prima y gana más
+    assert filas[0]['tasa_ruptura'] == filas[1]['tasa_ruptura'] == 0
+    assert filas[0]['pnl_medio'] > filas[1]['pnl_medio'] > 0
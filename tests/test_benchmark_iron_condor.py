@@ -0,0 +1,70 @@
+"""
+Benchmarks: fixture grabado, medición y detección de regresiones contra una referencia
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+import benchmark_iron_condor as bench
+
+
+def test_fixture_grabado_sin_red():
+    filas = bench.cargar_fixture()
+    assert len(filas) == 250
+    assert all(spx > 1000 and 5 < vix < 100 for spx, vix in filas)
+
+
+def test_micro_benchmarks_sobre_el_fixture(monkeypatch):
+    monkeypatch.setattr(bench, 'TIEMPO_MINIMO_S', 0.001)
+    resultados = bench.ejecutar_benchmarks(['calcular_iv_puntos', 'calcular_strikes', 'ejecutar_calculo_completo'],
+                                           repeticiones=2)
+    for resultado in resultados.values():
+        assert 'error' not in resultado
+        assert 0 < resultado['minimo_us'] <= resultado['mediana_us']
+        assert resultado['repeticiones'] == 2 and resultado['iteraciones'] >= 1
+
+
+def test_preparacion_fallida_se_informa(monkeypatch):
+    def sin_dependencia(fixture):
+        raise ModuleNotFoundError("No module named 'streamlit'", name='streamlit')
+
+    monkeypatch.setitem(bench.BENCHMARKS, 'app_web_rerender', sin_dependencia)
+    assert bench.ejecutar_benchmarks(['app_web_rerender']) == {
+        'app_web_rerender': {'error': "Dependencia no instalada: streamlit"}
+    }
+
+
+def test_comparar_aplica_umbral_general_y_propio():
+    referencia = {'a': {'minimo_us': 10.0}, 'b': {'minimo_us': 10.0}, 'c': {'minimo_us': 10.0},
+                  'd': {'error': 'x'}}
+    actuales = {'a': {'minimo_us': 12.0}, 'b': {'minimo_us': 13.0}, 'c': {'minimo_us': 13.0},
+                'd': {'minimo_us': 1.0}, 'e': {'minimo_us': 1.0}}
+
+    filas = {f['nombre']: f for f in bench.comparar(actuales, referencia, 0.25, {'c': 0.5})}
+    assert set(filas) == {'a', 'b', 'c'}
+    assert [filas[n]['regresion'] for n in 'abc'] == [False, True, False]
+    assert filas['b']['cambio'] == pytest.approx(0.3)
+
+
+def test_umbrales_por_benchmark():
+    assert bench._leer_umbrales(['calcular_strikes=0.1']) == {'calcular_strikes': 0.1}
+    for valor in ('desconocido=0.1', 'calcular_strikes'):
+        with pytest.raises(ValueError):
+            bench._leer_umbrales([valor])
+
+
+def test_referencia_por_defecto_es_el_ultimo_otro_commit(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, 'DIRECTORIO_RESULTADOS', str(tmp_path))
+    assert bench.cargar_referencia(None, 'abc1234') is None
+
+    for i, commit in enumerate(('viejo', 'nuevo', 'abc1234')):
+        ruta = tmp_path / f"{commit}.json"
+        ruta.write_text(json.dumps({'commit': commit}))
+        os.utime(ruta, (time.time() + i, time.time() + i))
+
+    assert bench.cargar_referencia(None, 'abc1234')['commit'] == 'nuevo'
+    assert bench.cargar_referencia('viejo', 'abc1234')['commit'] == 'viejo'
+    assert bench.cargar_referencia(str(tmp_path / 'abc1234.json'), 'abc1234')['commit'] == 'abc1234'
@@ -0,0 +1,82 @@
+"""
+Cache de datos de mercado: vigencia (TTL), desalojo LRU y lectura desde SQLite
+"""
+
+import pytest
+
+import cache_datos_mercado
+from cache_datos_mercado import CacheDatosMercado
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    ahora = [1_000_000.0]
+    monkeypatch.setattr(cache_datos_mercado.time, 'time', lambda: ahora[0])
+    return ahora
+
+
+@pytest.mark.parametrize('en_disco', [False, True])
+def test_ttl_vence_la_cotizacion(tmp_path, reloj, en_disco):
+    cache = CacheDatosMercado(ruta=str(tmp_path / 'cache.sqlite3') if en_disco else None, ttl_segundos=60)
+    cache.guardar('^GSPC', 5800.0)
+
+    reloj[0] += 60
+    assert cache.obtener('^GSPC') == {'valor': 5800.0, 'guardado': 1_000_000.0}
+    reloj[0] += 0.5
+    assert cache.obtener('^GSPC') is None
+
+
+def test_lru_desaloja_la_menos_usada():
+    cache = CacheDatosMercado(ruta=None, max_entradas=2)
+    cache.guardar('a', 1.0)
+    cache.guardar('b', 2.0)
+    assert cache.obtener('a')['valor'] == 1.0  # 'a' pasa a ser la más reciente
+    cache.guardar('c', 3.0)
+
+    assert cache.obtener('b') is None
+    assert cache.obtener('a')['valor'] == 1.0 and cache.obtener('c')['valor'] == 3.0
+
+
+def test_lectura_desde_sqlite_entre_instancias(tmp_path, reloj):
+    ruta = str(tmp_path / 'cache.sqlite3')
+    CacheDatosMercado(ruta=ruta, ttl_segundos=60).guardar('^VIX', 18.4)
+
+    otra = CacheDatosMercado(ruta=ruta, ttl_segundos=60)
+    assert otra._memoria == {}
+    assert otra.obtener('^VIX') == {'valor': 18.4, 'guardado': 1_000_000.0}
+    assert '^VIX' in otra._memoria  # Promovida a memoria tras leer el disco
+
+    reloj[0] += 61
+    assert CacheDatosMercado(ruta=ruta, ttl_segundos=60).obtener('^VIX') is None
+
+
+def test_disco_acotado_a_max_entradas(tmp_path, reloj):
+    ruta = str(tmp_path / 'cache.sqlite3')
+    cache = CacheDatosMercado(ruta=ruta, max_entradas=2)
+    for i, clave in enumerate(('a', 'b', 'c')):
+        reloj[0] += 1
+        cache.guardar(clave, float(i))
+
+    lector = CacheDatosMercado(ruta=ruta)
+    assert [lector.obtener(c) is not None for c in ('a', 'b', 'c')] == [False, True, True]
+
+
+def test_agente_reutiliza_el_cache(tmp_path):
+    from agente_iron_condor_final import AgenteIronCondorSPX
+    from proveedores_datos import ProveedorSintetico
+
+    class ProveedorContado(ProveedorSintetico):
+        usar_cache = True
+        llamadas = 0
+
+        def obtener_cierres(self, simbolos):
+            ProveedorContado.llamadas += 1
+            return super().obtener_cierres(simbolos)
+
+    cache = CacheDatosMercado(ruta=str(tmp_path / 'cache.sqlite3'))
+    primero = AgenteIronCondorSPX(proveedor=ProveedorContado(semilla=1), cache=cache).obtener_datos_mercado()
+    segundo = AgenteIronCondorSPX(proveedor=ProveedorContado(semilla=2), cache=cache).obtener_datos_mercado()
+
+    assert ProveedorContado.llamadas == 1
+    assert segundo['desde_cache'] and not primero['desde_cache']
+    assert segundo['spx_valor'] == primero['spx_valor']
@@ -0,0 +1,77 @@
+"""
+Cadena de opciones: índice por vencimiento y ajuste a strikes listados
+"""
+
+import numpy as np
+import pytest
+
+from cadena_opciones import CadenaOpciones, cargar_cadena
+
+PUTS = [5600, 5650, 5675, 5700, 5725]
+CALLS = [5850, 5875, 5900, 5950, 5962.5]
+
+
+@pytest.fixture
+def cadena():
+    # Filas desordenadas a propósito: el índice las ordena por (vencimiento, tipo, strike)
+    filas = ([(k, '2030-01-10', 'P', 100) for k in reversed(PUTS)]
+             + [(k, '2030-01-10', 'call', 10 if k == 5900 else 100) for k in CALLS]
+             + [(5800, '2030-01-03', 'put', 5), (5800, '2030-01-03', 'call', 50)])
+    strike, vencimiento, tipo, oi = zip(*filas)
+    return CadenaOpciones({'strike': strike, 'vencimiento': vencimiento, 'tipo': tipo, 'oi': oi})
+
+
+def test_indice_por_vencimiento_y_tipo(cadena):
+    assert cadena.vencimientos() == ['2030-01-03', '2030-01-10']
+    assert len(cadena) == len(PUTS) + len(CALLS) + 2
+    assert cadena.strikes('2030-01-10', 'put').tolist() == PUTS
+    assert cadena.strikes('2030-01-10').tolist() == sorted(PUTS + CALLS)
+    assert cadena.columnas('2030-01-03')['oi'].tolist() == [50]  # Máximo OI entre put y call
+
+    assert cadena.vencimiento_para('2030-01-01') == '2030-01-03'
+    assert cadena.vencimiento_para('2030-01-04') == '2030-01-10'
+    assert cadena.vencimiento_para('2030-01-11') is None
+    with pytest.raises(KeyError):
+        cadena.columnas('2030-02-01')
+
+
+def test_ajuste_por_direccion(cadena):
+    valores = [5590, 5655, 5662.5, 5700, 5730]
+    assert cadena.ajustar_strikes(valores, '2030-01-10', 'superior', 'put')[:4].tolist() == [5600, 5675, 5675, 5700]
+    assert np.isnan(cadena.ajustar_strikes(5730, '2030-01-10', 'superior', 'put'))
+    assert cadena.ajustar_strikes(valores, '2030-01-10', 'inferior', 'put')[1:].tolist() == [5650, 5650, 5700, 5725]
+    # Empate: gana el inferior
+    assert cadena.ajustar_strikes(valores, '2030-01-10', 'cercano', 'put').tolist() == [5600, 5650, 5650, 5700, 5725]
+
+
+def test_ajuste_escalar_y_oi_minimo(cadena):
+    assert cadena.ajustar_strike(5890, '2030-01-10', 'superior', 'call') == 5900
+    assert isinstance(cadena.ajustar_strike(5890, '2030-01-10', 'superior', 'call'), int)
+    assert cadena.ajustar_strike(5890, '2030-01-10', 'superior', 'call', oi_minimo=50) == 5950
+    assert cadena.ajustar_strike(5955, '2030-01-10', 'superior', 'call') == 5962.5
+    assert cadena.ajustar_strike(5970, '2030-01-10', 'superior', 'call') is None
+    with pytest.raises(ValueError):
+        cadena.ajustar_strikes(5900, '2030-01-10', 'arriba')
+
+
+def test_agente_ajusta_manteniendo_el_ala(cadena):
+    from agente_iron_condor_final import AgenteIronCondorSPX
+
+    agente = AgenteIronCondorSPX(usar_cache=False)
+    agente.cadena_opciones = cadena
+    teoricos = agente.calcular_strikes(5790.0, 110.0, 25)  # 5680 / 5655 / 5900 / 5925
+
+    ajustados = agente.ajustar_strikes_a_cadena(teoricos, '2030-01-05')
+    assert ajustados['vencimiento'] == '2030-01-10'
+    assert (ajustados['buy_put'], ajustados['sell_put']) == (5675, 5700)
+    assert (ajustados['sell_call'], ajustados['buy_call']) == (5900, 5950)
+    assert ajustados['strikes_teoricos']['sell_put'] == teoricos['sell_put']
+
+
+def test_cargar_cadena_una_vez_por_version(tmp_path):
+    ruta = tmp_path / 'cadena.csv'
+    ruta.write_text("Strike,Expiration,Type,Open_Interest\n5700,2030-01-10,put,10\n5900,2030-01-10,call,20\n")
+
+    primera = cargar_cadena(str(ruta))
+    assert cargar_cadena(str(ruta)) is primera
+    assert primera.strikes('2030-01-10', 'call').tolist() == [5900]
@@ -0,0 +1,55 @@
+"""
+Cálculo por lotes: el camino rápido NumPy y el fila a fila producen la misma salida
+"""
+
+import io
+import json
+
+import pytest
+
+import calculo_lotes
+from calculo_lotes import procesar_bloque, procesar_flujo
+
+CABECERA = ['spx', 'vix', 'ala', 'periodo', 'buffer', 'fecha']
+VALIDAS = [
+    '5812.37,18.2,25,diario,10,',
+    '5800,12.5,10,Semanal,0,',
+    '4999.99,35.01,15, mensual ,7.5,',
+    '6100.5,22,20,anual,-5,',
+    '5795.25,16.75,25,diario,15,2030-01-02',
+]
+
+
+@pytest.mark.parametrize('valorar', [False, True])
+def test_camino_rapido_igual_al_fila_a_fila(monkeypatch, valorar):
+    assert calculo_lotes._columnas_csv_validas(CABECERA, VALIDAS) is not None
+    rapido = procesar_bloque(('csv', CABECERA, 1, VALIDAS, valorar))
+
+    monkeypatch.setattr(calculo_lotes, '_columnas_csv_validas', lambda cabecera, lineas: None)
+    fila_a_fila = procesar_bloque(('csv', CABECERA, 1, VALIDAS, valorar))
+
+    assert rapido == fila_a_fila
+    assert rapido[1:] == (len(VALIDAS), 0)
+
+
+def test_bloque_mixto_en_orden_con_varios_procesos():
+    invalidas = {3: '5800,abc,25,diario,10,', 7: '5800,18,12.5,diario,10,', 12: '5800,18,25,horario,10,',
+                 16: '5800,18,25,diario', 21: '5800,18,25,diario,10,2030-13-01'}
+    lineas = []
+    for fila in range(1, 26):
+        lineas.append(invalidas.get(fila, VALIDAS[fila % len(VALIDAS)]))
+    entrada = io.StringIO('\n'.join([','.join(CABECERA)] + lineas) + '\n')
+
+    salida = io.StringIO()
+    totales = procesar_flujo(entrada, salida, procesos=2, filas_por_bloque=4)
+    filas = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+
+    assert (totales['filas'], totales['errores']) == (25 - len(invalidas), len(invalidas))
+    assert [f['fila'] for f in filas] == list(range(1, 26))
+    assert {f['fila'] for f in filas if 'error' in f} == set(invalidas)
+
+    # Cada fila válida coincide con su cálculo en un bloque de una sola línea
+    for f in filas:
+        if 'error' not in f:
+            texto, _, _ = procesar_bloque(('csv', CABECERA, f['fila'], [lineas[f['fila'] - 1]], False))
+            assert json.loads(texto) == f
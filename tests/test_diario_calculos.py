@@ -0,0 +1,71 @@
+"""
+Diario de cálculos: ida y vuelta por SQLite
+"""
+
+import pytest
+
+from agente_iron_condor_final import AgenteIronCondorSPX
+from diario_calculos import DiarioCalculos
+
+DATOS = {'spx_valor': 5800.0, 'vix_valor': 18.0, 'fecha_datos': '2026-10-16 10:00:00',
+         'fecha_objetivo': 'Actual', 'fuente_datos': 'Replay (fixtures/spx_vix.csv)'}
+
+
+@pytest.fixture
+def diario(tmp_path):
+    diario = DiarioCalculos(str(tmp_path / 'diario.sqlite3'))
+    yield diario
+    diario.cerrar()
+
+
+def _resultado(**kwargs):
+    return AgenteIronCondorSPX(usar_cache=False).ejecutar_calculo_completo(datos_mercado=dict(DATOS), **kwargs)
+
+
+def test_ida_y_vuelta(diario):
+    resultado = _resultado(ala=25, periodo='semanal', buffer=15)
+    assert diario.registrar(resultado)
+    diario.vaciar()
+
+    [fila] = diario.consultar(incluir_resultado=True)
+    assert fila['fuente'] == DATOS['fuente_datos']
+    assert (fila['spx'], fila['vix'], fila['ala'], fila['periodo'], fila['buffer']) == (5800.0, 18.0, 25, 'semanal', 15)
+    assert {p: fila[p] for p in ('buy_put', 'sell_put', 'sell_call', 'buy_call')} == \
+        {p: resultado['strikes'][p] for p in ('buy_put', 'sell_put', 'sell_call', 'buy_call')}
+    assert fila['credito_neto'] == pytest.approx(resultado['valoracion']['credito_neto'])
+    assert fila['resultado']['strikes'] == resultado['strikes']
+
+
+def test_cambios_posteriores_del_llamador_no_afectan_la_fila(diario):
+    resultado = _resultado(ala=10)
+    diario.registrar(resultado)
+    # Como hace servidor_api._calcular_lote antes de que el escritor procese la cola
+    resultado.pop('datos_mercado')
+    resultado['strikes']['sell_put'] = 0
+    diario.vaciar()
+
+    [fila] = diario.consultar(incluir_resultado=True)
+    assert fila['spx'] == 5800.0
+    assert fila['sell_put'] != 0
+    assert fila['resultado']['datos_mercado']['fuente_datos'] == DATOS['fuente_datos']
+
+
+def test_strikes_no_enteros(diario):
+    resultado = _resultado(ala=25)
+    resultado['strikes'].update(sell_put=5712.5, buy_put=5687.5)
+    diario.registrar(resultado)
+    diario.vaciar()
+
+    [fila] = diario.consultar()
+    assert (fila['buy_put'], fila['sell_put']) == (5687.5, 5712.5)
+    assert isinstance(fila['sell_call'], int)
+
+
+def test_filtros(diario):
+    for ala in (10, 25, 25):
+        diario.registrar(_resultado(ala=ala))
+    diario.vaciar()
+
+    assert len(diario.consultar(ala=25)) == 2
+    assert len(diario.consultar(ala=25, periodo='mensual')) == 0
+    assert len(diario.consultar(limite=1)) == 1
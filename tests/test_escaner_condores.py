@@ -0,0 +1,62 @@
+"""
+Escáner de condors: la poda de spreads dominados frente a la búsqueda completa
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from cadena_opciones import CadenaOpciones
+from escaner_condores import CRITERIOS, escanear_vencimiento
+from valoracion_black_scholes import valorar_opciones
+
+SPOT = 5800.0
+
+
+def _cadena_sintetica(n_strikes: int = 500, paso: float = 5.0, semilla: int = 0):
+    """
+    Cadena con precios Black-Scholes, sonrisa de volatilidad y bid/ask ruidosos
+    """
+    azar = np.random.default_rng(semilla)
+    vencimiento = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+    strikes = SPOT + paso * (np.arange(n_strikes) - n_strikes // 2)
+    iv = 0.16 + 0.5 * ((strikes - SPOT) / SPOT) ** 2 - 0.2 * (strikes - SPOT) / SPOT
+
+    columnas = {'strike': [], 'vencimiento': [], 'tipo': [], 'bid': [], 'ask': [], 'iv': []}
+    for tipo in ('put', 'call'):
+        medio = valorar_opciones(tipo == 'call', SPOT, strikes, iv, 5 / 252)['precio']
+        mitad_spread = 0.05 + 0.02 * medio * azar.uniform(0.5, 1.5, n_strikes)
+        columnas['strike'].append(strikes)
+        columnas['vencimiento'].append(np.full(n_strikes, vencimiento))
+        columnas['tipo'].append(np.full(n_strikes, tipo))
+        columnas['bid'].append(np.maximum(medio - mitad_spread, 0.0).round(2))
+        columnas['ask'].append((medio + mitad_spread).round(2))
+        columnas['iv'].append(iv)
+
+    return CadenaOpciones({c: np.concatenate(v) for c, v in columnas.items()}), vencimiento
+
+
+@pytest.mark.parametrize('misma_ala', [False, True])
+@pytest.mark.parametrize('criterio', CRITERIOS)
+def test_poda_conserva_el_mejor_condor(criterio, misma_ala):
+    cadena, vencimiento = _cadena_sintetica()
+    opciones = dict(criterio=criterio, top=15, misma_ala=misma_ala, distancia_min=10, ancho_max=50)
+
+    podado = escanear_vencimiento(cadena, vencimiento, SPOT, podar=True, **opciones)
+    completo = escanear_vencimiento(cadena, vencimiento, SPOT, podar=False, **opciones)
+
+    assert podado[0]['puntaje'] == pytest.approx(completo[0]['puntaje'], rel=1e-12)
+    # La poda nunca inventa condors mejores que los de la búsqueda completa
+    assert all(p['puntaje'] <= c['puntaje'] + 1e-12 for p, c in zip(podado, completo))
+    if misma_ala:
+        assert all(c['ancho_put'] == c['ancho_call'] for c in podado)
+
+
+@pytest.mark.parametrize('misma_ala', [False, True])
+def test_por_defecto_busqueda_completa(misma_ala):
+    cadena, vencimiento = _cadena_sintetica()
+    opciones = dict(criterio='valor_esperado', top=15, misma_ala=misma_ala, distancia_min=10)
+
+    assert (escanear_vencimiento(cadena, vencimiento, SPOT, **opciones)
+            == escanear_vencimiento(cadena, vencimiento, SPOT, podar=False, **opciones))
@@ -0,0 +1,41 @@
+"""
+Arranque rápido: los puntos de entrada no importan dependencias pesadas que no usan
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmark_importacion import medir_importacion
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('modulo, permitidas', [
+    ('agente_iron_condor_final', []),
+    ('agente_iron_condor_final_simple', []),
+    ('demo_interactivo', []),
+    ('servidor_api', []),
+    ('backtest_iron_condor', ['numpy']),
+    ('app_iron_condor_web', ['streamlit']),
+])
+def test_importacion_sin_dependencias_pesadas(modulo, permitidas):
+    resultado = medir_importacion(modulo, repeticiones=1, directorio=RAIZ)
+    assert 'error' not in resultado, resultado.get('error')
+    assert resultado['dependencias_pesadas'] == permitidas
+
+
+def test_cli_con_spx_y_vix_no_descarga(tmp_path):
+    codigo = (
+        "import runpy, sys; sys.argv = ['agente', '--spx', '5800', '--vix', '18']; "
+        "runpy.run_path('agente_iron_condor_final.py', run_name='__main__'); "
+        "print('CARGADAS=' + ','.join(m for m in ('yfinance', 'pandas', 'streamlit') if m in sys.modules))"
+    )
+    proceso = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True,
+                             env=dict(os.environ, HOME=str(tmp_path)), timeout=60)
+
+    assert proceso.returncode == 0, proceso.stderr
+    assert 'CÁLCULO COMPLETADO' in proceso.stdout
+    assert 'CARGADAS=\n' in proceso.stdout
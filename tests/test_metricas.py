@@ -0,0 +1,37 @@
+"""
+Métricas: conteo de errores en medir()/medido
+"""
+
+import pytest
+
+import metricas
+
+
+class _ControlDeFlujo(BaseException):
+    """Como RerunException/StopException de Streamlit"""
+
+
+@pytest.fixture(autouse=True)
+def registro_limpio():
+    anterior = metricas.activo()
+    metricas.activar(True)
+    metricas.REGISTRO.reiniciar()
+    yield
+    metricas.activar(anterior)
+    metricas.REGISTRO.reiniciar()
+
+
+def _errores():
+    return sum(v for k, v in metricas.REGISTRO.instantanea().get('contadores', {}).items()
+               if k.startswith('iron_condor_errores_total'))
+
+
+@pytest.mark.parametrize('excepcion, errores', [(ValueError, 1), (_ControlDeFlujo, 0), (KeyboardInterrupt, 0)])
+def test_solo_cuenta_errores(excepcion, errores):
+    @metricas.medido('iron_condor_render_segundos', vista='prueba')
+    def vista():
+        raise excepcion()
+
+    with pytest.raises(excepcion):
+        vista()
+    assert _errores() == errores
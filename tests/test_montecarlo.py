@@ -0,0 +1,52 @@
+"""
+Monte Carlo: crédito y presupuesto de pasos
+"""
+
+import pytest
+
+from montecarlo_iron_condor import resolucion_por_presupuesto, simular_iron_condor
+from valoracion_black_scholes import tiempo_vencimiento, valorar_iron_condor
+
+STRIKES = {'buy_put': 5650, 'sell_put': 5700, 'sell_call': 5900, 'buy_call': 5950}
+
+
+@pytest.mark.parametrize('dias', [1, 5, 21, 252])
+def test_resolucion_respeta_el_presupuesto(dias):
+    pasos_por_dia, trayectorias = resolucion_por_presupuesto(dias, 200_000, 10_000_000)
+    assert 1 <= pasos_por_dia <= 8
+    assert trayectorias * dias * pasos_por_dia <= 10_000_000
+
+
+def test_resolucion_horizonte_corto_sin_recortes():
+    assert resolucion_por_presupuesto(1, 200_000, 10_000_000) == (8, 200_000)
+
+
+def test_credito_desplaza_el_pnl():
+    sin_credito = simular_iron_condor(5800, 18, STRIKES, periodo='semanal', n_trayectorias=20_000, semilla=1)
+    con_credito = simular_iron_condor(5800, 18, STRIKES, periodo='semanal', n_trayectorias=20_000,
+                                      credito=7.5, semilla=1)
+    assert con_credito['pnl_esperado'] == pytest.approx(sin_credito['pnl_esperado'] + 7.5)
+    assert con_credito['prob_ganancia'] >= sin_credito['prob_ganancia']
+
+
+def test_sin_credito_no_hay_ganancia():
+    # Sin prima el mejor caso es P&L 0: un condor vendido no gana nada
+    assert simular_iron_condor(5800, 18, STRIKES, periodo='diario', n_trayectorias=20_000,
+                               semilla=1)['prob_ganancia'] == 0.0
+
+
+def test_credito_black_scholes_es_justo():
+    credito = float(valorar_iron_condor(5800, STRIKES['buy_put'], STRIKES['sell_put'], STRIKES['sell_call'],
+                                        STRIKES['buy_call'], 0.18, tiempo_vencimiento('semanal'))['credito_neto'])
+    r = simular_iron_condor(5800, 18, STRIKES, periodo='semanal', n_trayectorias=200_000,
+                            credito=credito, semilla=2)
+    # Bajo la medida neutral al riesgo el P&L esperado del crédito justo es ~0
+    assert abs(r['pnl_esperado']) < 4 * r['error_pnl_esperado']
+    assert 0 < r['prob_ganancia'] < 1
+
+
+@pytest.mark.parametrize('opciones', [{'n_trayectorias': 0}, {'n_trayectorias': -5},
+                                      {'tamano_bloque': 0}, {'tamano_bloque': -1}])
+def test_tamanos_invalidos(opciones):
+    with pytest.raises(ValueError):
+        simular_iron_condor(5800, 18, STRIKES, periodo='diario', **opciones)
@@ -0,0 +1,55 @@
+"""
+Motor vectorizado: resultados idénticos bit a bit a la versión escalar del agente
+"""
+
+import numpy as np
+import pytest
+
+from agente_iron_condor_final import AgenteIronCondorSPX
+from motor_vectorizado import calcular_strikes_lote
+
+PERIODOS = ['diario', 'semanal', 'mensual', 'anual']
+COLUMNAS_IV = ('iv_final', 'iv_anual', 'iv_periodo')
+COLUMNAS_STRIKES = ('sell_put', 'buy_put', 'sell_call', 'buy_call', 'rango_profit')
+
+
+def _escenarios(n=20_000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    spx = np.round(rng.uniform(3000, 7000, n), 2)
+    # Valores en múltiplos de 5 y de 0.005 para forzar empates de redondeo
+    spx[:n // 4] = np.round(spx[:n // 4] / 5) * 5
+    vix = np.round(rng.uniform(9, 80, n), 2)
+    vix[n // 4:n // 2] = np.round(vix[n // 4:n // 2] * 200) / 200
+    alas = rng.choice([10, 15, 20, 25], n)
+    periodos = rng.choice(PERIODOS, n)
+    buffers = rng.choice([0, 5, 10, 15, 20], n)
+    return spx, vix, alas, periodos, buffers
+
+
+def _mismos_bits(a, b) -> bool:
+    return np.float64(a).tobytes() == np.float64(b).tobytes()
+
+
+def test_lote_identico_al_escalar():
+    agente = AgenteIronCondorSPX(usar_cache=False)
+    spx, vix, alas, periodos, buffers = _escenarios()
+    lote = calcular_strikes_lote(spx, vix, alas, periodos, buffers)
+
+    diferencias = []
+    for i in range(len(spx)):
+        iv = agente.calcular_iv_puntos(float(spx[i]), float(vix[i]), str(periodos[i]), int(buffers[i]))
+        strikes = agente.calcular_strikes(float(spx[i]), iv['iv_final'], int(alas[i]))
+        esperado = {**{c: iv[c] for c in COLUMNAS_IV}, **{c: strikes[c] for c in COLUMNAS_STRIKES}}
+        diferencias += [(i, c) for c, valor in esperado.items() if not _mismos_bits(lote[c][i], valor)]
+    assert diferencias == []
+
+
+@pytest.mark.parametrize('periodo', PERIODOS)
+def test_escalares_y_broadcasting(periodo):
+    agente = AgenteIronCondorSPX(usar_cache=False)
+    lote = calcular_strikes_lote(5812.37, [12.5, 18.2, 35.0], 25, periodo, 10)
+    for i, vix in enumerate([12.5, 18.2, 35.0]):
+        iv = agente.calcular_iv_puntos(5812.37, vix, periodo, 10)
+        strikes = agente.calcular_strikes(5812.37, iv['iv_final'], 25)
+        assert _mismos_bits(lote['iv_final'][i], iv['iv_final'])
+        assert all(_mismos_bits(lote[c][i], strikes[c]) for c in COLUMNAS_STRIKES)
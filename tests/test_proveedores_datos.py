@@ -0,0 +1,120 @@
+"""
+Proveedores de datos: interfaz común, reproducción de históricos y datos sintéticos
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agente_iron_condor_final import AgenteIronCondorSPX
+from proveedores_datos import (ProveedorDatosMercado, ProveedorReplay, ProveedorSintetico,
+                               ProveedorYFinance, crear_proveedor)
+
+
+@pytest.fixture
+def archivo_replay(tmp_path):
+    ruta = tmp_path / 'replay.csv'
+    ruta.write_text("fecha,spx,vix,^VIX9D\n"
+                    "2025-01-02,5868.55,17.93,16.1\n"
+                    "2025-01-03,5723.15,18.22,16.4\n")
+    return str(ruta)
+
+
+def test_replay_avanza_una_fila_por_llamada(archivo_replay):
+    proveedor = ProveedorReplay(archivo_replay)
+    assert proveedor.filas == 2 and proveedor.fechas == ['2025-01-02', '2025-01-03']
+
+    valores = [proveedor.obtener_cierres(['^GSPC', '^VIX']) for _ in range(3)]
+    assert valores[0] == {'^GSPC': 5868.55, '^VIX': 17.93}
+    assert valores[1] == {'^GSPC': 5723.15, '^VIX': 18.22}
+    assert valores[2] == valores[0]  # Cíclico
+    assert proveedor.obtener_cierres(['^VIX9D']) == {'^VIX9D': 16.4}
+
+
+def test_replay_no_ciclico_se_agota(archivo_replay):
+    proveedor = ProveedorReplay(archivo_replay, ciclico=False)
+    proveedor.obtener_cierres(['^GSPC'])
+    proveedor.obtener_cierres(['^GSPC'])
+    with pytest.raises(IndexError):
+        proveedor.obtener_cierres(['^GSPC'])
+    proveedor.reiniciar()
+    assert proveedor.obtener_cierres(['^GSPC']) == {'^GSPC': 5868.55}
+
+
+def test_cotizaciones_informan_errores_por_simbolo(archivo_replay):
+    cotizaciones = ProveedorReplay(archivo_replay).obtener_cotizaciones(['^GSPC', '^VIX3M'])
+    assert set(cotizaciones) == {'^GSPC', '^VIX3M'}
+    assert all('error' in c and 'latencia_ms' in c for c in cotizaciones.values())
+
+
+def test_sintetico_reproducible_con_semilla():
+    uno, otro = ProveedorSintetico(semilla=5), ProveedorSintetico(semilla=5)
+    simbolos = ['^GSPC', '^VIX']
+    assert [uno.obtener_cierres(simbolos) for _ in range(3)] == [otro.obtener_cierres(simbolos) for _ in range(3)]
+
+    cierres = ProveedorSintetico(semilla=1, bases={'^GSPC': 6000.0}, variacion_spx=0.01).obtener_cierres(['^GSPC'])
+    assert 5940 <= cierres['^GSPC'] <= 6060
+
+
+def test_agente_con_replay_no_usa_el_cache(archivo_replay):
+    agente = AgenteIronCondorSPX(proveedor=crear_proveedor('replay', archivo_replay))
+    assert agente.cache is None
+
+    datos = agente.obtener_datos_mercado()
+    assert (datos['spx_valor'], datos['vix_valor']) == (5868.55, 17.93)
+    assert datos['fuente_datos'] == f"Replay ({archivo_replay})" and not datos['desde_cache']
+
+
+def test_crear_proveedor_valida_argumentos():
+    assert isinstance(crear_proveedor('sintetico', semilla=1), ProveedorSintetico)
+    for nombre in ('replay', 'http'):
+        with pytest.raises(ValueError):
+            crear_proveedor(nombre)
+    with pytest.raises(ValueError):
+        crear_proveedor('bloomberg')
+    with pytest.raises(TypeError):
+        ProveedorDatosMercado()
+
+
+class ProveedorDemorado(ProveedorYFinance):
+    """
+    Misma ronda concurrente que Yahoo Finance, con una demora fija por símbolo
+    """
+
+    DEMORAS = {'^GSPC': 0.15, '^VIX': 0.15, '^VIX9D': 0.15, '^VIX3M': 0.6}
+
+    def _descargar_cierre(self, simbolo, timeout):
+        time.sleep(self.DEMORAS[simbolo])
+        if simbolo == '^VIX9D':
+            raise ValueError(f"Sin datos para {simbolo}")
+        return {'valor': 100.0, 'latencia_ms': self.DEMORAS[simbolo] * 1000}
+
+
+@pytest.mark.parametrize('asincrono', [False, True])
+def test_descargas_en_paralelo_con_plazo_comun(asincrono):
+    proveedor = ProveedorDemorado()
+    simbolos = ['^GSPC', '^VIX', '^VIX9D', '^VIX3M']
+
+    inicio = time.perf_counter()
+    if asincrono:
+        cotizaciones = asyncio.run(proveedor.obtener_cotizaciones_async(simbolos, timeout=0.4))
+    else:
+        cotizaciones = proveedor.obtener_cotizaciones(simbolos, timeout=0.4)
+    segundos = time.perf_counter() - inicio
+
+    # En paralelo: el total es la descarga más lenta acotada por el plazo, no la suma
+    assert segundos < 0.55
+    assert cotizaciones['^GSPC']['valor'] == cotizaciones['^VIX']['valor'] == 100.0
+    assert 'Sin datos' in cotizaciones['^VIX9D']['error']
+    assert 'Timeout' in cotizaciones['^VIX3M']['error']
+
+
+def test_snapshot_con_extras_fallidos():
+    agente = AgenteIronCondorSPX(proveedor=ProveedorDemorado(), usar_cache=False)
+    agente.timeout_segundos = 0.4
+    datos = agente.obtener_datos_mercado(tickers_extra=['^VIX9D', '^VIX3M'])
+
+    assert datos['spx_valor'] == 100.0 and datos['extras'] == {}
+    assert set(datos['errores_extras']) == {'^VIX9D', '^VIX3M'}
+    assert set(datos['latencias_ms']) == {'^GSPC', '^VIX', '^VIX9D', '^VIX3M'}
@@ -0,0 +1,70 @@
+"""
+Prueba de estrés: malla SPX × VIX vectorizada igual a valorar cada escenario por separado
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from prueba_estres import VIX_MINIMO, malla_a_json, malla_estres, resumir_malla
+from valoracion_black_scholes import valorar_iron_condor
+
+STRIKES = {'buy_put': 5650, 'sell_put': 5675, 'sell_call': 5925, 'buy_call': 5950}
+PATAS = (5650, 5675, 5925, 5950)
+TIEMPO = 5 / 252
+
+
+def test_ejes_y_escenario_sin_choque():
+    malla = malla_estres(5800, 18.0, STRIKES, TIEMPO, rango_vol=(-6.0, 6.0), puntos_spot=21, puntos_vol=11)
+
+    assert malla['pnl'].shape == (11, 21)
+    assert malla['spot'][0] == pytest.approx(5800 * 0.95) and malla['spot'][-1] == pytest.approx(5800 * 1.05)
+    assert malla['vix'][0] == pytest.approx(12.0) and malla['vix'][-1] == pytest.approx(24.0)
+    # Sin choque ni paso del tiempo el condor vale lo mismo que al venderlo
+    assert malla['pnl'][5, 10] == pytest.approx(0.0, abs=1e-9)
+    assert malla['credito_inicial'] == pytest.approx(
+        float(valorar_iron_condor(5800, *PATAS, 0.18, TIEMPO)['credito_neto']))
+
+
+def test_cada_celda_igual_a_la_valoracion_escalar():
+    malla = malla_estres(5800, 18.0, STRIKES, TIEMPO, puntos_spot=15, puntos_vol=9, dias_transcurridos=2)
+    tiempo_estres = TIEMPO - 2 / 252
+
+    for i, j in [(0, 0), (4, 7), (8, 14), (2, 11)]:
+        recompra = valorar_iron_condor(float(malla['spot'][j]), *PATAS, float(malla['vix'][i]) / 100, tiempo_estres)
+        assert malla['pnl'][i, j] == pytest.approx(malla['credito_inicial'] - float(recompra['credito_neto']))
+
+
+def test_pnl_acotado_por_credito_y_ala():
+    malla = malla_estres(5800, 18.0, STRIKES, TIEMPO, rango_spot=0.1, rango_vol=(-17.5, 40.0),
+                         puntos_spot=41, puntos_vol=41)
+    credito = malla['credito_inicial']
+
+    assert malla['vix'].min() >= VIX_MINIMO
+    assert credito - 25 - 1e-9 <= malla['pnl'].min() and malla['pnl'].max() <= credito + 1e-9
+    # Las colas de la malla quedan en pérdida; el paso del tiempo favorece al vendedor
+    assert malla['pnl'][20, 0] < 0 and malla['pnl'][20, -1] < 0
+    tarde = malla_estres(5800, 18.0, STRIKES, TIEMPO, puntos_spot=21, puntos_vol=21, rango_vol=(-5.0, 5.0),
+                         dias_transcurridos=4)
+    assert tarde['pnl'][10, 10] > 0
+
+
+def test_resumen_y_json():
+    malla = malla_estres(5800, 18.0, STRIKES, TIEMPO, puntos_spot=7, puntos_vol=5)
+    resumen = resumir_malla(malla)
+    assert resumen['pnl_minimo'] == pytest.approx(malla['pnl'].min(), abs=0.005)
+    assert resumen['pnl_maximo'] == pytest.approx(malla['pnl'].max(), abs=0.005)
+    assert resumen['spot_pnl_minimo'] in np.round(malla['spot'], 2)
+
+    contenido = malla_a_json(malla)
+    assert len(contenido['pnl']) == 5 and len(contenido['pnl'][0]) == 7
+    assert contenido['resumen'] == resumen
+
+
+def test_malla_200x200_en_milisegundos():
+    malla_estres(5800, 18.0, STRIKES, TIEMPO)  # Calentamiento
+    inicio = time.perf_counter()
+    malla = malla_estres(5800, 18.0, STRIKES, TIEMPO)
+    assert malla['pnl'].shape == (200, 200)
+    assert time.perf_counter() - inicio < 0.25
@@ -0,0 +1,177 @@
+"""
+Resiliencia: reintentos y cortacircuitos contra el servidor con fallas inyectadas
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from proveedores_datos import ProveedorDatosMercado, ProveedorHTTP
+from resiliencia import Cortacircuitos, PoliticaReintentos, ProveedorResiliente, ServidorFallas
+
+SIMBOLOS = ['^GSPC', '^VIX']
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorFallas(semilla=3)
+    servidor.url = servidor.iniciar()
+    yield servidor
+    servidor.detener()
+
+
+def _resiliente(servidor, intentos=1, umbral_fallos=3, enfriamiento=30.0):
+    return ProveedorResiliente(ProveedorHTTP(servidor.url),
+                               PoliticaReintentos(intentos=intentos, espera_base=0.001, semilla=1),
+                               Cortacircuitos(umbral_fallos=umbral_fallos, enfriamiento=enfriamiento))
+
+
+def _errores(cotizaciones):
+    return {s: c['error'] for s, c in cotizaciones.items() if 'error' in c}
+
+
+def test_reintentos_recuperan_errores_intermitentes(servidor):
+    servidor.tasa_error = 0.5
+    proveedor = _resiliente(servidor, intentos=10)
+
+    for _ in range(20):
+        assert _errores(proveedor.obtener_cotizaciones(SIMBOLOS, timeout=5)) == {}
+    assert servidor.peticiones > 20
+    assert proveedor.circuito.estado == Cortacircuitos.CERRADO
+
+
+def test_reintentos_respetan_el_plazo(servidor):
+    servidor.caido, servidor.latencia = True, 0.05
+    proveedor = ProveedorResiliente(ProveedorHTTP(servidor.url),
+                                    PoliticaReintentos(intentos=50, espera_base=0.05, semilla=1))
+
+    inicio = time.monotonic()
+    assert set(_errores(proveedor.obtener_cotizaciones(SIMBOLOS, timeout=0.3))) == set(SIMBOLOS)
+    assert time.monotonic() - inicio < 0.45
+    assert 1 < servidor.peticiones < 50
+
+
+@pytest.mark.parametrize('asincrono', [False, True])
+def test_circuito_abre_y_rechaza_sin_llamar(servidor, asincrono):
+    servidor.caido = True
+    proveedor = _resiliente(servidor, umbral_fallos=3)
+
+    def obtener():
+        if asincrono:
+            return asyncio.run(proveedor.obtener_cotizaciones_async(SIMBOLOS, timeout=2))
+        return proveedor.obtener_cotizaciones(SIMBOLOS, timeout=2)
+
+    for _ in range(3):
+        assert _errores(obtener())
+    assert proveedor.circuito.estado == Cortacircuitos.ABIERTO
+    assert proveedor.circuito.aperturas == 1
+
+    peticiones = servidor.peticiones
+    rechazo = obtener()
+    assert servidor.peticiones == peticiones
+    assert all(e.startswith("Circuito abierto") for e in _errores(rechazo).values())
+
+
+def test_semiabierto_cierra_con_exito_y_reabre_con_fallo(servidor):
+    servidor.caido = True
+    proveedor = _resiliente(servidor, umbral_fallos=2, enfriamiento=0.1)
+    for _ in range(2):
+        proveedor.obtener_cotizaciones(SIMBOLOS, timeout=2)
+    assert proveedor.circuito.estado == Cortacircuitos.ABIERTO
+
+    # La prueba del semiabierto falla: vuelve a abrirse de inmediato
+    time.sleep(0.15)
+    assert proveedor.circuito.estado == Cortacircuitos.SEMIABIERTO
+    assert _errores(proveedor.obtener_cotizaciones(SIMBOLOS, timeout=2))
+    assert proveedor.circuito.estado == Cortacircuitos.ABIERTO
+    assert proveedor.circuito.aperturas == 2
+
+    # La fuente se recupera: la siguiente prueba cierra el circuito
+    servidor.caido = False
+    time.sleep(0.15)
+    assert _errores(proveedor.obtener_cotizaciones(SIMBOLOS, timeout=2)) == {}
+    assert proveedor.circuito.estado == Cortacircuitos.CERRADO
+
+
+def test_semiabierto_admite_una_sola_prueba():
+    circuito = Cortacircuitos(umbral_fallos=1, enfriamiento=0.05)
+    circuito.registrar_fallo()
+    assert not circuito.permitir()
+    time.sleep(0.06)
+    assert circuito.permitir()
+    assert not circuito.permitir()
+    circuito.liberar_prueba()
+    assert circuito.permitir()
+
+
+class ProveedorParcial(ProveedorDatosMercado):
+    """
+    Publica ^GSPC y ^VIX con 3 ms de latencia propia cada uno; ^VIX1D no existe
+    """
+
+    def __init__(self):
+        self.llamadas = 0
+        self.falla = None
+
+    def obtener_cierres(self, simbolos):
+        raise NotImplementedError
+
+    def obtener_cotizaciones(self, simbolos, timeout=None):
+        self.llamadas += 1
+        if self.falla is not None:
+            raise self.falla
+        cierres = {'^GSPC': 5800.0, '^VIX': 18.0}
+        return {s: ({'valor': cierres[s], 'latencia_ms': 3.0} if s in cierres
+                    else {'error': f"Sin datos para {s}", 'latencia_ms': 3.0}) for s in simbolos}
+
+
+def _parcial(umbral_fallos=5, enfriamiento=30.0):
+    return ProveedorResiliente(ProveedorParcial(), PoliticaReintentos(intentos=3, espera_base=0.001, semilla=1),
+                               Cortacircuitos(umbral_fallos=umbral_fallos, enfriamiento=enfriamiento),
+                               requeridos=SIMBOLOS)
+
+
+@pytest.mark.parametrize('asincrono', [False, True])
+def test_extra_no_publicado_no_abre_el_circuito(asincrono):
+    proveedor = _parcial(umbral_fallos=5)
+    simbolos = SIMBOLOS + ['^VIX1D']
+
+    for _ in range(8):
+        if asincrono:
+            cotizaciones = asyncio.run(proveedor.obtener_cotizaciones_async(simbolos, timeout=2))
+        else:
+            cotizaciones = proveedor.obtener_cotizaciones(simbolos, timeout=2)
+        assert list(_errores(cotizaciones)) == ['^VIX1D']
+        # Cada símbolo conserva su propia latencia
+        assert {s: c['latencia_ms'] for s, c in cotizaciones.items()} == dict.fromkeys(simbolos, 3.0)
+
+    assert proveedor.circuito.estado == Cortacircuitos.CERRADO
+    assert proveedor.proveedor.llamadas == 8  # Sin reintentos del extra
+
+
+def test_solo_extras_fallidos_cuentan_como_fallo_de_la_fuente():
+    proveedor = _parcial(umbral_fallos=2)
+    for _ in range(2):
+        proveedor.obtener_cotizaciones(['^VIX1D'], timeout=2)
+    assert proveedor.circuito.estado == Cortacircuitos.ABIERTO
+    assert proveedor.proveedor.llamadas == 6  # 3 intentos por llamada
+
+
+def test_excepcion_del_proveedor_no_bloquea_el_semiabierto():
+    proveedor = _parcial(umbral_fallos=1, enfriamiento=0.05)
+    proveedor.proveedor.falla = RuntimeError("Fuente rota")
+    with pytest.raises(RuntimeError):
+        proveedor.obtener_cotizaciones(SIMBOLOS, timeout=2)
+    assert proveedor.circuito.estado == Cortacircuitos.ABIERTO
+
+    # La prueba del semiabierto también lanza: se registra como fallo y vuelve a abrirse
+    time.sleep(0.06)
+    with pytest.raises(RuntimeError):
+        proveedor.obtener_cotizaciones(SIMBOLOS, timeout=2)
+    assert proveedor.circuito.aperturas == 2
+
+    proveedor.proveedor.falla = None
+    time.sleep(0.06)
+    assert _errores(proveedor.obtener_cotizaciones(SIMBOLOS, timeout=2)) == {}
+    assert proveedor.circuito.estado == Cortacircuitos.CERRADO
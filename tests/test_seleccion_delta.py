@@ -0,0 +1,67 @@
+"""
+Selección por delta: bisección vectorizada y elección del strike más cercano
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from cadena_opciones import CadenaOpciones
+from seleccion_delta import resolver_strike_delta, seleccionar_por_delta_cadena, seleccionar_por_delta_vix
+from valoracion_black_scholes import valorar_opciones
+
+SEMANA = 5 / 252
+
+
+@pytest.mark.parametrize('es_call', [False, True])
+def test_strike_con_el_delta_objetivo(es_call):
+    objetivos = np.array([0.05, 0.10, 0.16, 0.30, 0.50])
+    strikes = resolver_strike_delta(5800.0, objetivos, 0.18, SEMANA, es_call)
+    deltas = np.abs(valorar_opciones(es_call, 5800.0, strikes, 0.18, SEMANA)['delta'])
+
+    assert deltas == pytest.approx(objetivos, abs=1e-9)
+    # Mayor delta = más cerca del dinero
+    assert np.all(np.diff(strikes) < 0) if es_call else np.all(np.diff(strikes) > 0)
+
+
+def test_vix_elige_el_multiplo_de_5_mas_cercano():
+    seleccion = seleccionar_por_delta_vix(5812.37, 18.0, 0.16, tiempo=SEMANA)
+    for lado, es_call in (('put', False), ('call', True)):
+        strike = seleccion[f'sell_{lado}']
+        assert strike % 5 == 0
+        vecinos = np.array([strike - 5, strike, strike + 5])
+        deltas = np.abs(valorar_opciones(es_call, 5812.37, vecinos, 0.18, SEMANA)['delta'])
+        assert np.argmin(np.abs(deltas - 0.16)) == 1
+    assert seleccion['sell_put'] < 5812.37 < seleccion['sell_call']
+
+
+def test_cadena_usa_su_iv_y_el_respaldo():
+    vencimiento = (datetime.now() + timedelta(days=10)).strftime('%Y-%m-%d')
+    strikes = np.arange(5400, 6205, 5.0)
+    cadena = CadenaOpciones({
+        'strike': np.concatenate([strikes, strikes]),
+        'vencimiento': np.full(2 * strikes.size, vencimiento),
+        'tipo': np.repeat(['put', 'call'], strikes.size),
+        # Las calls no traen IV: usan el respaldo
+        'iv': np.concatenate([np.full(strikes.size, 0.22), np.full(strikes.size, np.nan)])
+    })
+
+    seleccion = seleccionar_por_delta_cadena(cadena, 5800.0, 0.16, vol_respaldo=0.15)[vencimiento]
+    assert seleccion['iv_put'] == 0.22 and seleccion['iv_call'] == 0.15
+    assert abs(abs(seleccion['delta_put']) - 0.16) < 0.01 and abs(seleccion['delta_call'] - 0.16) < 0.01
+
+    with pytest.raises(ValueError):
+        seleccionar_por_delta_cadena(cadena, 5800.0, 0.16)  # Calls sin IV ni respaldo
+
+
+def test_agente_strikes_por_delta():
+    from agente_iron_condor_final import AgenteIronCondorSPX
+
+    agente = AgenteIronCondorSPX(usar_cache=False)
+    strikes = agente.calcular_strikes_delta(5800.0, 18.0, 25, delta_objetivo=0.10, periodo='semanal')
+    assert strikes['buy_put'] == strikes['sell_put'] - 25 and strikes['buy_call'] == strikes['sell_call'] + 25
+    assert abs(strikes['delta_put']) < 0.13 and strikes['delta_call'] < 0.13
+
+    with pytest.raises(ValueError):
+        agente.calcular_strikes_delta(5800.0, 18.0, 25, delta_objetivo=1.5)
@@ -0,0 +1,104 @@
+"""
+Servidor API: los cálculos no bloquean el event loop
+"""
+
+import asyncio
+import json
+import time
+
+from agente_iron_condor_final import AgenteIronCondorSPX
+from proveedores_datos import ProveedorSintetico
+from servidor_api import ServidorIronCondor
+
+
+async def _get(puerto: int, ruta: str, cuerpo=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+    contenido = b'' if cuerpo is None else json.dumps(cuerpo).encode('utf-8')
+    metodo = 'GET' if cuerpo is None else 'POST'
+    writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: prueba\r\nConnection: close\r\n"
+                 f"Content-Length: {len(contenido)}\r\n\r\n".encode('latin-1') + contenido)
+    respuesta = await reader.read()
+    writer.close()
+    cabeceras, _, cuerpo = respuesta.partition(b'\r\n\r\n')
+    return int(cabeceras.split()[1]), json.loads(cuerpo)
+
+
+def _con_servidor(prueba):
+    async def ejecutar():
+        agente = AgenteIronCondorSPX(proveedor=ProveedorSintetico(semilla=1), usar_cache=False)
+        api = ServidorIronCondor(agente)
+        servidor = await api.iniciar(puerto=0)
+        async with servidor:
+            return await prueba(api, servidor.sockets[0].getsockname()[1])
+    return asyncio.run(ejecutar())
+
+
+def test_endpoints_responden():
+    async def prueba(api, puerto):
+        estado, calculo = await _get(puerto, '/calculo?ala=25&periodo=semanal')
+        assert estado == 200 and calculo['parametros']['ala_elegida'] == 25
+        estado, strikes = await _get(puerto, '/strikes?spx=5800&iv_puntos=60&ala=10')
+        assert estado == 200 and strikes['buy_put'] == strikes['sell_put'] - 10
+        estado, iv = await _get(puerto, '/iv_puntos?spx=5800&vix=18&periodo=diario')
+        assert estado == 200 and iv['iv_final'] > 0
+        estado, error = await _get(puerto, '/strikes?spx=5800&iv_puntos=60&ala=abc')
+        assert estado == 400 and 'ala' in error['error']
+    _con_servidor(prueba)
+
+
+def test_calculo_lento_no_bloquea_otras_peticiones():
+    async def prueba(api, puerto):
+        calcular = api.agente.ejecutar_calculo_completo
+
+        def calculo_lento(*args, **kwargs):
+            time.sleep(0.5)
+            return calcular(*args, **kwargs)
+
+        api.agente.ejecutar_calculo_completo = calculo_lento
+        await _get(puerto, '/salud')
+
+        # Cliente y servidor comparten el event loop: si el cálculo lo bloquea, /salud espera
+        inicio = time.perf_counter()
+        lento = asyncio.ensure_future(_get(puerto, '/calculo?ala=25'))
+        await asyncio.sleep(0.05)
+        estado, _ = await _get(puerto, '/salud')
+        assert estado == 200
+        assert time.perf_counter() - inicio < 0.3
+        assert (await lento)[0] == 200
+    _con_servidor(prueba)
+
+
+def test_estres_serializado_en_el_pool():
+    async def prueba(api, puerto):
+        estado, malla = await _get(puerto, '/estres?spx=5800&vix=18&ala=25&puntos=11')
+        assert estado == 200
+        assert len(malla['pnl']) == 11 and len(malla['pnl'][0]) == 11
+        assert malla['resumen']['pnl_minimo'] <= malla['resumen']['pnl_maximo']
+
+        estado, error = await _get(puerto, '/estres?spx=5800&vix=18&puntos=1')
+        assert estado == 400 and 'puntos' in error['error']
+
+        estado, lote = await _get(puerto, '/estres', [{'spx': 5800, 'vix': 18, 'puntos': 5, 'malla': 0},
+                                                      {'spx': 5800, 'vix': 18, 'puntos': 1}])
+        assert estado == 200
+        assert set(lote['resultados'][0]) == {'resumen', 'spx_valor', 'vix_valor', 'strikes'}
+        assert 'error' in lote['resultados'][1]
+    _con_servidor(prueba)
+
+
+def test_perfil_por_peticion_en_el_pool(tmp_path, monkeypatch):
+    import perfilado
+
+    monkeypatch.setitem(perfilado._config, 'directorio', str(tmp_path))
+
+    async def prueba(api, puerto):
+        for ruta in ('/calculo?ala=25&perfil=determinista', '/estres?ala=25&puntos=5&perfil=muestreo'):
+            estado, _ = await _get(puerto, ruta)
+            assert estado == 200
+        estado, _ = await _get(puerto, '/lote?perfil=determinista', [{'ala': 10}, {'ala': 25}])
+        assert estado == 200
+        await _get(puerto, '/calculo?ala=25')
+    _con_servidor(prueba)
+
+    perfiles = sorted(tmp_path.glob('ejecutar_calculo_completo-*.folded'))
+    assert len(perfiles) == 4
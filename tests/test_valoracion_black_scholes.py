@@ -0,0 +1,29 @@
+"""
+Valoración Black-Scholes: unidades de las griegas
+"""
+
+import pytest
+
+from motor_vectorizado import DIAS_TRADING_ANIO
+from valoracion_black_scholes import valorar_iron_condor, valorar_opciones
+
+DIA = 1 / DIAS_TRADING_ANIO
+
+
+@pytest.mark.parametrize('es_call, strike', [(True, 5900.0), (False, 5700.0)])
+def test_theta_por_dia_de_trading(es_call, strike):
+    tiempo = 21 * DIA
+    griegas = valorar_opciones(es_call, 5800.0, strike, 0.18, tiempo, tasa=0.04)
+    # Derivada centrada respecto de 'tiempo' (mismas unidades: años de 252 días)
+    hoy = valorar_opciones(es_call, 5800.0, strike, 0.18, tiempo + DIA / 100, tasa=0.04)['precio']
+    manana = valorar_opciones(es_call, 5800.0, strike, 0.18, tiempo - DIA / 100, tasa=0.04)['precio']
+    assert float(griegas['theta']) == pytest.approx(float(manana - hoy) / (2 / 100), rel=1e-4)
+
+
+def test_theta_del_condor_es_la_erosion_de_un_dia():
+    semana = 5 * DIA
+    hoy = valorar_iron_condor(5800.0, 5650, 5700, 5900, 5950, 0.18, semana)
+    manana = valorar_iron_condor(5800.0, 5650, 5700, 5900, 5950, 0.18, semana - DIA)
+    # Condor vendido: theta positiva, aproximadamente lo que cae el crédito en un día de trading
+    assert float(hoy['theta']) > 0
+    assert float(hoy['theta']) == pytest.approx(float(hoy['credito_neto'] - manana['credito_neto']), rel=0.15)
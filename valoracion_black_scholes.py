@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Valoración Black-Scholes - Iron Condor SPX
+Precio y griegas vectorizadas de las cuatro patas del iron condor: el mismo código
+valora un condor para la GUI o millones de condors para un backtest
+
+Autor: MiniMax Agent
+Fecha: 2026-10-16
+"""
+
+import math
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from motor_vectorizado import DIAS_TRADING_ANIO, dias_horizonte
+
+# Importación robusta de scipy (opcional)
+try:
+    from scipy.special import ndtr as _ndtr
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+PATAS = ('buy_put', 'sell_put', 'sell_call', 'buy_call')
+VOL_MINIMA = 1e-8
+TIEMPO_MINIMO = 1e-8
+
+
+def cdf_normal(x) -> np.ndarray:
+    """
+    Función de distribución normal estándar (vectorizada)
+
+    Sin scipy usa el algoritmo de doble precisión de Hart (West, 2005).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if SCIPY_AVAILABLE:
+        return _ndtr(x)
+
+    absoluto = np.abs(x)
+    exponencial = np.exp(-0.5 * absoluto * absoluto)
+
+    numerador = 3.52624965998911e-02 * absoluto + 0.700383064443688
+    numerador = numerador * absoluto + 6.37396220353165
+    numerador = numerador * absoluto + 33.912866078383
+    numerador = numerador * absoluto + 112.079291497871
+    numerador = numerador * absoluto + 221.213596169931
+    numerador = numerador * absoluto + 220.206867912376
+    denominador = 8.83883476483184e-02 * absoluto + 1.75566716318264
+    denominador = denominador * absoluto + 16.064177579207
+    denominador = denominador * absoluto + 86.7807322029461
+    denominador = denominador * absoluto + 296.564248779674
+    denominador = denominador * absoluto + 637.333633378831
+    denominador = denominador * absoluto + 793.826512519948
+    denominador = denominador * absoluto + 440.413735824752
+    cola_central = exponencial * numerador / denominador
+
+    fraccion = absoluto + 0.65
+    fraccion = absoluto + 4 / fraccion
+    fraccion = absoluto + 3 / fraccion
+    fraccion = absoluto + 2 / fraccion
+    fraccion = absoluto + 1 / fraccion
+    cola_lejana = exponencial / fraccion / 2.506628274631
+
+    cola = np.where(absoluto < 7.07106781186547, cola_central, cola_lejana)
+    cola = np.where(absoluto > 37, 0.0, cola)
+    return np.where(x > 0, 1 - cola, cola)
+
+
+def pdf_normal(x) -> np.ndarray:
+    """
+    Densidad normal estándar (vectorizada)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+
+def valorar_opciones(es_call, spot, strike, vol, tiempo, tasa: float = 0.0,
+                     dividendo: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Precio y griegas Black-Scholes de opciones europeas
+
+    Args:
+        es_call: True para call, False para put (escalar o array)
+        spot: Precio del subyacente
+        strike: Strike de la opción
+        vol: Volatilidad implícita en decimal (ej: 0.185)
+        tiempo: Tiempo al vencimiento en años
+        tasa: Tasa libre de riesgo continua
+        dividendo: Rendimiento por dividendo continuo
+
+    Returns:
+        Dict con 'precio', 'delta', 'gamma', 'theta' (por día de trading, como 'tiempo')
+        y 'vega' (por punto de vol)
+    """
+    es_call, spot, strike, vol, tiempo = np.broadcast_arrays(
+        np.asarray(es_call, dtype=bool),
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.maximum(np.asarray(vol, dtype=np.float64), VOL_MINIMA),
+        np.maximum(np.asarray(tiempo, dtype=np.float64), TIEMPO_MINIMO)
+    )
+
+    raiz_t = np.sqrt(tiempo)
+    vol_raiz_t = vol * raiz_t
+    d1 = (np.log(spot / strike) + (tasa - dividendo + 0.5 * vol * vol) * tiempo) / vol_raiz_t
+    d2 = d1 - vol_raiz_t
+
+    desc_tasa = np.exp(-tasa * tiempo)
+    desc_div = np.exp(-dividendo * tiempo)
+    signo = np.where(es_call, 1.0, -1.0)
+
+    n_d1 = cdf_normal(signo * d1)
+    n_d2 = cdf_normal(signo * d2)
+    densidad = pdf_normal(d1)
+
+    precio = signo * (spot * desc_div * n_d1 - strike * desc_tasa * n_d2)
+    delta = signo * desc_div * n_d1
+    gamma = desc_div * densidad / (spot * vol_raiz_t)
+    vega = spot * desc_div * densidad * raiz_t
+    theta = (-spot * desc_div * densidad * vol / (2 * raiz_t)
+             + signo * (dividendo * spot * desc_div * n_d1 - tasa * strike * desc_tasa * n_d2))
+
+    return {
+        'precio': precio,
+        'delta': delta,
+        'gamma': gamma,
+        'theta': theta / DIAS_TRADING_ANIO,
+        'vega': vega / 100
+    }
+
+
+def valorar_iron_condor(spot, buy_put, sell_put, sell_call, buy_call,
+                        vol: Union[float, np.ndarray, Dict[str, np.ndarray]], tiempo,
+                        tasa: float = 0.0, dividendo: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Valora iron condors cortos (vendidos) con Black-Scholes
+
+    Args:
+        spot: Precio del subyacente (escalar o array)
+        buy_put, sell_put, sell_call, buy_call: Strikes de cada pata
+        vol: Volatilidad en decimal común a las patas, o Dict por pata
+        tiempo: Tiempo al vencimiento en años
+        tasa: Tasa libre de riesgo continua
+        dividendo: Rendimiento por dividendo continuo
+
+    Returns:
+        Dict con crédito neto, riesgo máximo, breakevens y griegas de la posición
+    """
+    strikes = {'buy_put': buy_put, 'sell_put': sell_put, 'sell_call': sell_call, 'buy_call': buy_call}
+    signos = {'buy_put': 1, 'sell_put': -1, 'sell_call': -1, 'buy_call': 1}
+
+    patas = {}
+    for pata in PATAS:
+        vol_pata = vol[pata] if isinstance(vol, dict) else vol
+        patas[pata] = valorar_opciones(pata.endswith('call'), spot, strikes[pata], vol_pata,
+                                       tiempo, tasa, dividendo)
+
+    # Posición: griegas de las patas compradas menos las vendidas
+    griegas = {
+        griega: sum(signos[pata] * patas[pata][griega] for pata in PATAS)
+        for griega in ('delta', 'gamma', 'theta', 'vega')
+    }
+
+    credito = -sum(signos[pata] * patas[pata]['precio'] for pata in PATAS)
+    ancho = np.maximum(np.asarray(sell_put) - np.asarray(buy_put),
+                       np.asarray(buy_call) - np.asarray(sell_call))
+
+    resultado = {
+        'credito_neto': credito,
+        'riesgo_maximo': ancho - credito,
+        'breakeven_inferior': np.asarray(sell_put) - credito,
+        'breakeven_superior': np.asarray(sell_call) + credito,
+        'ratio_credito_riesgo': credito / np.maximum(ancho - credito, 1e-12)
+    }
+    resultado.update(griegas)
+    resultado['precios_patas'] = {pata: patas[pata]['precio'] for pata in PATAS}
+
+    return resultado
+
+
+def tiempo_vencimiento(periodo: Optional[str] = None, fecha_objetivo: Optional[str] = None) -> float:
+    """
+    Tiempo al vencimiento en años según el período o la fecha objetivo
+    """
+    return dias_horizonte(periodo, fecha_objetivo) / DIAS_TRADING_ANIO
+
+
+def valorar_resultado(resultado: Dict, vol: Optional[float] = None, tasa: float = 0.0) -> Dict[str, float]:
+    """
+    Valora el iron condor devuelto por AgenteIronCondorSPX.ejecutar_calculo_completo
+
+    Args:
+        resultado: Resultado del agente
+        vol: Volatilidad implícita en decimal (por defecto VIX / 100)
+        tasa: Tasa libre de riesgo continua
+    """
+    datos = resultado['datos_mercado']
+    strikes = resultado['strikes']
+    return resumir_valoracion(valorar_iron_condor(
+        datos['spx_valor'], strikes['buy_put'], strikes['sell_put'], strikes['sell_call'], strikes['buy_call'],
+        datos['vix_valor'] / 100 if vol is None else vol,
+        tiempo_vencimiento(resultado['parametros']['periodo_temporal'], datos.get('fecha_objetivo')),
+        tasa
+    ))
+
+
+def resumir_valoracion(valoracion: Dict) -> Dict[str, float]:
+    """
+    Convierte la valoración de un solo condor en floats redondeados para mostrar
+    """
+    resumen = {
+        clave: round(float(valor), 4 if clave in ('delta', 'gamma', 'ratio_credito_riesgo') else 2)
+        for clave, valor in valoracion.items() if clave != 'precios_patas'
+    }
+    resumen['precios_patas'] = {pata: round(float(p), 2) for pata, p in valoracion['precios_patas'].items()}
+    return resumen